@@ -2,7 +2,9 @@
 Candidates API Endpoints
 
 This module handles all candidate-related HTTP operations including:
-- Candidate registration for jobs
+- Candidate registration for jobs (with a personalized project variant)
+- Project assessment retrieval per candidate
+- Paginated candidate listing per job
 - CV upload and AI-powered evaluation
 - Candidate report generation
 """
@@ -10,17 +12,19 @@ This module handles all candidate-related HTTP operations including:
 import logging
 import os
 import uuid
-from io import BytesIO
+from typing import List, Optional
 
-import PyPDF2
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models
 from app.api.v1 import schemas
 from app.core.db import get_db
-from app.services import evaluation_service, pdf_service
+from app.core.disconnect import DisconnectGuard
+from app.services import evaluation_service, idempotency_service, pdf_service, project_service
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -36,10 +40,10 @@ router = APIRouter()
     summary="Register a new candidate",
     description="Register a new candidate for a specific job posting."
 )
-def create_candidate_for_job(
+async def create_candidate_for_job(
     job_id: int,
     candidate_create: schemas.CandidateCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Register a new candidate for a specific job.
@@ -56,49 +60,148 @@ def create_candidate_for_job(
         HTTPException 404: If job is not found
         HTTPException 400: If candidate email already exists for this job
     """
-    # Check if the job exists
-    job = db.query(models.Job).filter(models.Job.id == job_id).first()
-    if not job:
+    # Check that the job exists and the email is not yet registered, in one round-trip
+    candidate_exists = exists().where(
+        models.Candidate.email == candidate_create.email,
+        models.Candidate.job_id == job_id
+    )
+    job_check = (await db.execute(
+        select(models.Job.id, candidate_exists).where(models.Job.id == job_id)
+    )).first()
+    if not job_check:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Job with ID {job_id} not found"
         )
-
-    # Check if candidate already exists for this job
-    existing_candidate = db.query(models.Candidate).filter(
-        models.Candidate.email == candidate_create.email,
-        models.Candidate.job_id == job_id
-    ).first()
     
-    if existing_candidate:
+    if job_check[1]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="A candidate with this email is already registered for this job."
         )
 
-    # Create new candidate
+    # Create new candidate and hand it a pre-generated project variant in the same transaction
     try:
         new_candidate = models.Candidate(
             **candidate_create.model_dump(),
             job_id=job_id
         )
         db.add(new_candidate)
-        db.commit()
-        db.refresh(new_candidate)
+        await db.flush()
+        await project_service.assign_project_variant(db, job_id, new_candidate.id)
+        await db.commit()
+        await db.refresh(new_candidate)
         logger.info(f"Created new candidate: {new_candidate.id} for job: {job_id}")
-        return new_candidate
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error creating candidate: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create candidate. Please try again."
         )
 
+    # Replace the variant in the background; registration never waits for generation
+    project_service.schedule_variant_refill(job_id)
+
+    # A new candidate enters the job's rankings
+    await evaluation_service.publish_ranking_change(job_id, new_candidate.id)
+    return new_candidate
+
+@router.get(
+    "/jobs/{job_id}/candidates",
+    response_model=schemas.CandidatePage,
+    response_model_exclude_unset=True,
+    tags=["Candidates"],
+    summary="List and search a job's candidates",
+    description="Cursor-paginated candidate listing for a job (newest first), with skill, "
+                "skills-gap, red-flag, status and score filters evaluated in the database."
+)
+async def list_job_candidates(
+    job_id: int,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    min_score: Optional[float] = Query(None, ge=0, le=100),
+    max_score: Optional[float] = Query(None, ge=0, le=100),
+    skill: List[str] = Query([], description="Only candidates whose CV covers all of these skills"),
+    skills_gap: List[str] = Query([], description="Only candidates missing all of these skills"),
+    has_red_flags: Optional[bool] = Query(None, description="Filter on red flags in submission evaluations"),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to return (name, email, status, match_score, cv_evaluation)"
+    ),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    List the candidates of a job with keyset pagination.
+    
+    Pass the returned ``next_cursor`` as ``cursor`` to fetch the following page.
+    Skill and skills-gap filters match skill names exactly.
+    The full ``cv_evaluation`` is only returned when requested through ``fields``.
+    
+    Raises:
+        HTTPException 404: If job is not found
+        HTTPException 400: If the cursor or a requested field is invalid
+    """
+    selected_fields = (
+        [name.strip() for name in fields.split(",") if name.strip()]
+        if fields else evaluation_service.DEFAULT_CANDIDATE_LIST_FIELDS
+    )
+    try:
+        items, next_cursor = await evaluation_service.list_candidates_for_job(
+            db=db,
+            job_id=job_id,
+            limit=limit,
+            cursor=cursor,
+            status=status_filter,
+            min_score=min_score,
+            max_score=max_score,
+            skills=skill,
+            skills_gaps=skills_gap,
+            has_red_flags=has_red_flags,
+            fields=selected_fields
+        )
+    except ValueError as e:
+        if "not found" in str(e).lower():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.get(
+    "/candidates/{candidate_id}/project",
+    response_model=schemas.ProjectResponse,
+    tags=["Candidates"],
+    summary="Get a candidate's project assessment",
+    description="The personalized project variant assigned at registration, or the job's project."
+)
+async def get_candidate_project(candidate_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """
+    Retrieve the project assessment a candidate submits their phases for.
+    
+    Raises:
+        HTTPException 404: If the candidate is not found or has no project assessment
+    """
+    try:
+        return await project_service.get_candidate_project(db=db, candidate_id=candidate_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
 @router.post("/candidates/{candidate_id}/cv", response_model=schemas.CVEvaluationResponse, tags=["Candidates"])
-async def upload_and_evaluate_cv(candidate_id: uuid.UUID, cv_file: UploadFile = File(...), db: Session = Depends(get_db)):
+async def upload_and_evaluate_cv(
+    candidate_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    cv_file: UploadFile = File(...),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    db: AsyncSession = Depends(get_db)
+):
     """
     Upload a CV (PDF) for a candidate and trigger its evaluation against the job requirements.
+
+    A retry sent with the same ``Idempotency-Key`` header replays the stored evaluation.
+    If the client disconnects first, extraction and evaluation are cancelled unless
+    disabled through ``CANCEL_ON_DISCONNECT``.
     """
     # Validate file type
     if cv_file.content_type != 'application/pdf':
@@ -107,57 +210,68 @@ async def upload_and_evaluate_cv(candidate_id: uuid.UUID, cv_file: UploadFile =
             detail="Invalid file type. Please upload a PDF file."
         )
 
-    # Extract text from PDF
-    cv_text = ""
-    try:
-        pdf_content = await cv_file.read()
-        pdf_reader = PyPDF2.PdfReader(BytesIO(pdf_content))
-        
-        for page in pdf_reader.pages:
-            extracted_text = page.extract_text()
-            if extracted_text:
-                cv_text += extracted_text + "\n"
-                
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
-            detail=f"Failed to read PDF file: {str(e)}"
-        )
-        
-    # Validate extracted content
-    if len(cv_text.strip()) < 100:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, 
-            detail="The PDF seems to be empty or could not be read properly. Please ensure the PDF contains readable text."
-        )
+    pdf_content = await cv_file.read()
+    guard = DisconnectGuard(request, "upload_and_evaluate_cv")
+
+    async def extract_and_evaluate() -> dict:
+        # Extract text from PDF
+        try:
+            # PDF parsing is CPU-bound; keep it off the event loop
+            cv_text = await run_in_threadpool(pdf_service.extract_pdf_text, pdf_content, guard.cancelled)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
+                detail=f"Failed to read PDF file: {str(e)}"
+            )
+            
+        # Validate extracted content
+        if len(cv_text.strip()) < 100:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, 
+                detail="The PDF seems to be empty or could not be read properly. Please ensure the PDF contains readable text."
+            )
+
+        # Evaluate the CV using the evaluation service
+        try:
+            return await evaluation_service.evaluate_candidate_cv(
+                db=db, 
+                candidate_id=candidate_id, 
+                cv_content=cv_text
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
+                detail=f"An error occurred during CV evaluation: {str(e)}"
+            )
 
-    # Evaluate the CV using the evaluation service
     try:
-        evaluation = evaluation_service.evaluate_candidate_cv(
-            db=db, 
-            candidate_id=candidate_id, 
-            cv_content=cv_text
-        )
-        return evaluation
-    except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
-            detail=f"An error occurred during CV evaluation: {str(e)}"
+        evaluation, replayed = await idempotency_service.run_idempotent(
+            db=db,
+            key=idempotency_key,
+            scope=f"POST /candidates/{candidate_id}/cv",
+            payload=pdf_content,
+            work=lambda: guard.run(extract_and_evaluate)
         )
+    except idempotency_service.IdempotencyConflict as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return evaluation
 
 @router.get("/candidates/{candidate_id}/report", tags=["Candidates"])
-def get_candidate_report(candidate_id: uuid.UUID, db: Session = Depends(get_db)):
+async def get_candidate_report(candidate_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
     """
     Generate and download a comprehensive PDF report for a candidate's evaluation.
     """
     try:
         # Retrieve candidate with all evaluation data
-        candidate = evaluation_service.get_candidate_with_evaluations(db=db, candidate_id=candidate_id)
+        candidate = await evaluation_service.get_candidate_with_evaluations(db=db, candidate_id=candidate_id)
         
-        # Generate PDF report
-        pdf_path = pdf_service.create_candidate_report_pdf(candidate)
+        # Generate PDF report (CPU-bound, so off the event loop)
+        pdf_path = await run_in_threadpool(pdf_service.create_candidate_report_pdf, candidate)
         
         # Return the PDF file
         return FileResponse(
@@ -1,26 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator
+import asyncio
 import os
 
-from app.core.db import get_db
+import orjson
+
+from app.core import http_cache, metrics
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal, get_db
+from app.core.disconnect import ClientDisconnected, DisconnectGuard
+from app.core.responses import trusted_response
 from app import models
 from app.api.v1 import schemas
-from app.services import project_service, evaluation_service, pdf_service, openai_service
+from app.services import project_service, evaluation_service, pdf_service, openai_service, ranking_stream
 
 router = APIRouter()
 
 @router.post("/jobs", response_model=schemas.JobResponse, status_code=status.HTTP_201_CREATED, tags=["Jobs"])
-def create_job_and_assessment(job_create: schemas.JobCreate, db: Session = Depends(get_db)):
+async def create_job_and_assessment(job_create: schemas.JobCreate, request: Request, db: AsyncSession = Depends(get_db)):
     """
     Create a new job posting and generate its project-based assessment.
     
     This endpoint processes the job description to extract details and generates
     a multi-phase project assessment for candidate evaluation.
+    If the client disconnects first, the model calls are cancelled and no job is
+    created, unless disabled through ``CANCEL_ON_DISCONNECT``.
     """
+    guard = DisconnectGuard(request, "create_job_and_assessment")
     try:
-        new_job = project_service.create_job_and_assessment(db=db, job_create=job_create)
+        new_job = await guard.run(lambda: project_service.create_job_and_assessment(db=db, job_create=job_create))
         return new_job
+    except ClientDisconnected:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
@@ -30,12 +44,20 @@ def create_job_and_assessment(job_create: schemas.JobCreate, db: Session = Depen
         )
 
 @router.get("/jobs/{job_id}", response_model=schemas.JobResponse, tags=["Jobs"])
-def get_job_details(job_id: int, db: Session = Depends(get_db)):
+async def get_job_details(job_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_db)):
     """
     Retrieve the details for a specific job and its associated project.
+
+    Supports conditional requests (``If-None-Match`` / ``If-Modified-Since``).
     """
     try:
-        job = project_service.get_job_with_project(db=db, job_id=job_id)
+        # Jobs are immutable and cached, so the job itself is fetched once and versioned
+        # by its creation time
+        job = await project_service.get_job_with_project(db=db, job_id=job_id)
+        validators = http_cache.Validators.from_version("job", job_id, job.created_at, last_modified=job.created_at)
+        if validators.matches(request):
+            return validators.not_modified()
+        validators.apply(response)
         return job
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -46,7 +68,7 @@ def get_job_details(job_id: int, db: Session = Depends(get_db)):
         )
 
 @router.get("/jobs/{job_id}/reference-guide", tags=["Jobs"])
-def get_job_reference_guide(job_id: int, db: Session = Depends(get_db)):
+async def get_job_reference_guide(job_id: int, db: AsyncSession = Depends(get_db)):
     """
     Generate and download a PDF reference guide for the job's project assessment.
     
@@ -55,7 +77,7 @@ def get_job_reference_guide(job_id: int, db: Session = Depends(get_db)):
     """
     try:
         # Get job with project data
-        job = project_service.get_job_with_project(db=db, job_id=job_id)
+        job = await project_service.get_job_with_project(db=db, job_id=job_id)
         
         if not job.project:
             raise HTTPException(
@@ -75,7 +97,9 @@ def get_job_reference_guide(job_id: int, db: Session = Depends(get_db)):
         ideal_responses = {}
         
         # Generate PDF reference guide
-        pdf_path = pdf_service.create_reference_guide_pdf(
+        # FPDF rendering is CPU-bound; keep it off the event loop
+        pdf_path = await run_in_threadpool(
+            pdf_service.create_reference_guide_pdf,
             job_title=job.title,
             project_data=project_data,
             ideal_responses=ideal_responses
@@ -103,22 +127,37 @@ def get_job_reference_guide(job_id: int, db: Session = Depends(get_db)):
         )
 
 @router.get("/jobs/{job_id}/rankings", response_model=schemas.RankingResponse, tags=["Jobs"])
-def get_job_candidate_rankings(job_id: int, db: Session = Depends(get_db)):
+async def get_job_candidate_rankings(job_id: int, request: Request, db: AsyncSession = Depends(get_db)):
     """
     Retrieve a ranked list of all candidates for a specific job based on their
     CV evaluations and project submission performances.
+
+    Supports conditional requests (``If-None-Match`` / ``If-Modified-Since``).
     """
     try:
+        # Answer 304 from the rankings' version before computing them
+        version = await evaluation_service.get_rankings_version(db=db, job_id=job_id)
+        validators = None
+        if version is not None:
+            last_modified = max((ts for ts in version[1::2] if ts is not None), default=None)
+            validators = http_cache.Validators.from_version("rankings", job_id, *version, last_modified=last_modified)
+            if validators.matches(request):
+                return validators.not_modified()
+
         # Verify job exists
-        job = project_service.get_job_with_project(db=db, job_id=job_id)
+        job_title = await project_service.get_job_title(db=db, job_id=job_id)
         
         # Get candidate rankings
-        rankings = evaluation_service.rank_candidates_for_job(db=db, job_id=job_id)
+        rankings = await evaluation_service.rank_candidates_for_job(db=db, job_id=job_id)
         
-        return {
-            "job_title": job.title,
-            "rankings": rankings
-        }
+        # Rankings are built with the schema's exact types; skip re-validating them
+        response = trusted_response(
+            {"job_title": job_title, "rankings": rankings},
+            schemas.RankingResponse
+        )
+        if validators is not None:
+            validators.apply(response)
+        return response
         
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -126,4 +165,52 @@ def get_job_candidate_rankings(job_id: int, db: Session = Depends(get_db)):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred while ranking candidates: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.get("/jobs/{job_id}/rankings/stream", response_class=StreamingResponse, tags=["Jobs"])
+async def stream_job_candidate_rankings(job_id: int):
+    """
+    Stream a job's candidate rankings as server-sent events.
+
+    The stream starts with a ``snapshot`` event holding the full rankings. Whenever a
+    CV or submission evaluation changes a score, an ``update`` event carries only the
+    ranking entries that changed (``changed``) and the candidates no longer ranked
+    (``removed``). Entries are keyed by ``candidate_id``. A client too slow to keep up
+    receives a fresh ``snapshot`` instead of the updates it missed.
+
+    The rankings are computed once per job and change, however many streams are open.
+    """
+    # A request-scoped session would stay checked out for the stream's lifetime
+    try:
+        async with AsyncSessionLocal() as db:
+            job_title = await project_service.get_job_title(db=db, job_id=job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    return StreamingResponse(
+        _ranking_events(job_id, job_title),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _ranking_events(job_id: int, job_title: str) -> AsyncIterator[str]:
+    """Yields the SSE frames of one ranking stream until the client disconnects."""
+    async with ranking_stream.watch(job_id) as (rankings, frames):
+        metrics.SSE_CONNECTIONS.labels(stream="rankings").inc()
+        try:
+            yield _sse_frame("snapshot", {"job_title": job_title, "rankings": rankings})
+
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(frames.get(), timeout=settings.SSE_KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event == "snapshot":
+                    data = {"job_title": job_title, **data}
+                yield _sse_frame(event, data)
+        finally:
+            metrics.SSE_CONNECTIONS.labels(stream="rankings").dec()
+
+def _sse_frame(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
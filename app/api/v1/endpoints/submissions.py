@@ -1,31 +1,61 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+from typing import Optional
 import uuid
 
+from app.core import http_cache
+from app.core.disconnect import ClientDisconnected, DisconnectGuard
 from app.core.db import get_db
 from app import models
 from app.api.v1 import schemas
-from app.services import evaluation_service
+from app.services import evaluation_service, idempotency_service
 
 router = APIRouter()
 
 @router.post("/candidates/{candidate_id}/submissions", response_model=schemas.SubmissionEvaluationResponse, status_code=status.HTTP_201_CREATED, tags=["Submissions"])
-def create_submission(candidate_id: uuid.UUID, submission_create: schemas.SubmissionCreate, db: Session = Depends(get_db)):
+async def create_submission(
+    candidate_id: uuid.UUID,
+    submission_create: schemas.SubmissionCreate,
+    request: Request,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    db: AsyncSession = Depends(get_db)
+):
     """
     Submit work for a project phase, trigger an evaluation, and store the result.
     
     This endpoint allows candidates to submit their work for any phase of the project assessment.
     The submission is immediately evaluated using AI and the results are stored in the database.
+    A retry sent with the same ``Idempotency-Key`` header replays the stored evaluation.
+    The evaluation is stored even if the client disconnects, unless ``create_submission``
+    is listed in ``CANCEL_ON_DISCONNECT``.
     """
+    guard = DisconnectGuard(request, "create_submission")
     try:
         # Validate and process the submission through the evaluation service
-        evaluation = evaluation_service.evaluate_and_store_submission(
-            db=db, 
-            candidate_id=candidate_id, 
-            submission_data=submission_create
+        evaluation, replayed = await idempotency_service.run_idempotent(
+            db=db,
+            key=idempotency_key,
+            scope=f"POST /candidates/{candidate_id}/submissions",
+            payload=submission_create.model_dump_json().encode(),
+            work=lambda: guard.run(lambda: evaluation_service.evaluate_and_store_submission(
+                db=db, 
+                candidate_id=candidate_id, 
+                submission_data=submission_create
+            ))
         )
+        if replayed:
+            response.headers["Idempotent-Replayed"] = "true"
         return evaluation
         
+    except idempotency_service.IdempotencyConflict as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    except ClientDisconnected:
+        raise
+
     except ValueError as e:
         # Handle specific business logic errors (candidate not found, phase not found, etc.)
         if "not found" in str(e).lower():
@@ -43,17 +73,27 @@ def create_submission(candidate_id: uuid.UUID, submission_create: schemas.Submis
         )
 
 @router.get("/candidates/{candidate_id}/submissions", response_model=list[schemas.SubmissionEvaluationResponse], tags=["Submissions"])
-def get_candidate_submissions(candidate_id: uuid.UUID, db: Session = Depends(get_db)):
+async def get_candidate_submissions(candidate_id: uuid.UUID, request: Request, response: Response, db: AsyncSession = Depends(get_db)):
     """
     Retrieve all submissions and their evaluations for a specific candidate.
+
+    Supports conditional requests (``If-None-Match`` / ``If-Modified-Since``).
     """
     try:
-        # Get candidate with submissions
-        candidate = evaluation_service.get_candidate_with_evaluations(db=db, candidate_id=candidate_id)
+        # Answer 304 from the evaluations' version before loading them
+        count, last_updated = await evaluation_service.get_submission_evaluations_version(db=db, candidate_id=candidate_id)
+        if count:
+            validators = http_cache.Validators.from_version("submissions", candidate_id, count, last_updated, last_modified=last_updated)
+            if validators.matches(request):
+                return validators.not_modified()
+            validators.apply(response)
+
+        # Get the candidate's submissions (evaluations only, ordered by phase)
+        submissions = await evaluation_service.get_submission_evaluations(db=db, candidate_id=candidate_id)
         
         # Extract evaluations from submissions
         evaluations = []
-        for submission in sorted(candidate.submissions, key=lambda s: s.phase_number):
+        for submission in submissions:
             if submission.evaluation:
                 # Add phase information to the evaluation
                 evaluation_data = submission.evaluation.copy()
@@ -72,16 +112,18 @@ def get_candidate_submissions(candidate_id: uuid.UUID, db: Session = Depends(get
         )
 
 @router.get("/candidates/{candidate_id}/submissions/{phase_number}", response_model=schemas.SubmissionEvaluationResponse, tags=["Submissions"])
-def get_submission_by_phase(candidate_id: uuid.UUID, phase_number: int, db: Session = Depends(get_db)):
+async def get_submission_by_phase(candidate_id: uuid.UUID, phase_number: int, db: AsyncSession = Depends(get_db)):
     """
     Retrieve a specific submission and its evaluation by candidate ID and phase number.
     """
     try:
         # Find the specific submission
-        submission = db.query(models.Submission).filter(
-            models.Submission.candidate_id == candidate_id,
-            models.Submission.phase_number == phase_number
-        ).first()
+        submission = (await db.scalars(
+            select(models.Submission).options(undefer(models.Submission.evaluation)).where(
+                models.Submission.candidate_id == candidate_id,
+                models.Submission.phase_number == phase_number
+            )
+        )).first()
         
         if not submission:
             raise HTTPException(
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import uuid
@@ -15,8 +15,7 @@ class ProjectBase(BaseModel):
 class ProjectResponse(ProjectBase):
     id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # ===================================================================
 #                           Job Schemas
@@ -38,8 +37,7 @@ class JobResponse(JobBase):
     created_at: datetime
     project: Optional[ProjectResponse] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # ===================================================================
 #                        Candidate Schemas
@@ -58,8 +56,21 @@ class CandidateResponse(CandidateBase):
     status: str
     created_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class CandidateListItem(BaseModel):
+    """A candidate in a listing; only the requested fields are present."""
+    id: uuid.UUID
+    created_at: datetime
+    name: Optional[str] = None
+    email: Optional[str] = None
+    status: Optional[str] = None
+    match_score: Optional[float] = None
+    cv_evaluation: Optional[Dict[str, Any]] = None
+
+class CandidatePage(BaseModel):
+    items: List[CandidateListItem]
+    next_cursor: Optional[str] = None
 
 # ===================================================================
 #                       Evaluation Schemas
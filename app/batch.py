@@ -0,0 +1,261 @@
+"""
+Offline Batch Evaluation
+
+Command-line tools for re-scoring candidates through the Azure OpenAI Batch API
+instead of interactive calls, e.g. after a job's requirements change.
+
+The ``rescore`` command streams candidates out of the database and writes one
+``evaluate_cv`` request per line in the Batch API JSONL format. Once the batch
+has completed, the ``ingest`` command reads the downloaded results file and
+writes the evaluations back to ``candidates.cv_evaluation`` in bulk.
+
+The ``screen`` command evaluates a folder of CVs for already registered candidates
+right away, several CVs per model call (see ``evaluate_candidate_cvs_bulk``). Files
+are named after the candidate: ``<candidate-id>.pdf`` or ``<candidate-id>.txt``.
+
+Usage:
+    python -m app.batch rescore --job-id 3 --output rescore_job_3.jsonl
+    python -m app.batch ingest --input rescore_job_3_results.jsonl
+    python -m app.batch screen --job-id 3 --cv-dir cvs/
+"""
+
+import argparse
+import json
+import logging
+import sys
+import uuid
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, load_only
+
+from app import models
+from app.api.v1 import schemas
+from app.core.db import SessionLocal
+from app.services import evaluation_service, pdf_service
+from app.services.json_repair import invalid_fields, repair_json
+from app.services.openai_service import openai_service
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched per round-trip while streaming candidates
+STREAM_CHUNK_SIZE = 500
+
+# Rows written per bulk UPDATE while ingesting results
+INGEST_CHUNK_SIZE = 500
+
+BATCH_ENDPOINT_URL = "/chat/completions"
+
+
+def write_rescore_requests(db: Session, job_id: int, out: TextIO, deployment: Optional[str] = None) -> int:
+    """
+    Writes Batch API requests re-evaluating every candidate with a stored CV for a job.
+
+    Args:
+        db: Database session
+        job_id: ID of the job whose candidates should be re-scored
+        out: Text stream the JSONL lines are written to
+        deployment: Batch deployment name (defaults to the configured deployment)
+
+    Returns:
+        Number of requests written
+
+    Raises:
+        ValueError: If the job is not found
+    """
+    job = db.query(models.Job).filter(models.Job.id == job_id).first()
+    if not job:
+        raise ValueError(f"Job with ID {job_id} not found.")
+
+    candidates = db.scalars(
+        select(models.Candidate).options(
+            load_only(models.Candidate.id, models.Candidate.cv_text)
+        ).where(
+            models.Candidate.job_id == job_id,
+            models.Candidate.cv_text.isnot(None)
+        ).execution_options(yield_per=STREAM_CHUNK_SIZE)
+    )
+
+    count = 0
+    for candidate in candidates:
+        body = openai_service.cv_evaluation_request(
+            cv_text=candidate.cv_text,
+            job_title=job.title,
+            tech_skills=job.tech_skills,
+            soft_skills=job.soft_skills,
+            industry=job.industry
+        )
+        if deployment:
+            body["model"] = deployment
+
+        out.write(json.dumps({
+            "custom_id": str(candidate.id),
+            "method": "POST",
+            "url": BATCH_ENDPOINT_URL,
+            "body": body
+        }) + "\n")
+        count += 1
+
+    return count
+
+
+def parse_batch_results(lines: Iterator[str]) -> Iterator[Tuple[Optional[uuid.UUID], Optional[dict]]]:
+    """
+    Parses Batch API result lines into ``(candidate_id, evaluation)`` pairs.
+
+    Defective JSON is repaired; failed requests and completions that still lack
+    evaluation fields yield ``None`` as the evaluation, and lines that are not a
+    result at all (no JSON or no valid ``custom_id``) yield ``(None, None)``.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            result = json.loads(line)
+            candidate_id = uuid.UUID(result["custom_id"])
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError, AttributeError):
+            logger.warning(f"Skipping malformed results line {line_number}")
+            yield None, None
+            continue
+
+        response = result.get("response") or {}
+        if result.get("error") or response.get("status_code") != 200:
+            yield candidate_id, None
+            continue
+
+        try:
+            content = response["body"]["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            yield candidate_id, None
+            continue
+        evaluation, _ = repair_json(content)
+        if evaluation is None or invalid_fields(schemas.CVEvaluationResponse, evaluation):
+            yield candidate_id, None
+        else:
+            yield candidate_id, evaluation
+
+
+def ingest_results(db: Session, lines: Iterator[str]) -> Tuple[int, int]:
+    """
+    Stores Batch API evaluation results on their candidates using bulk UPDATEs.
+
+    Results for candidates that no longer exist (e.g. deleted between ``rescore``
+    and ``ingest``) are skipped and counted as failed, so one stray line cannot
+    abort the run after earlier chunks were committed.
+
+    Args:
+        db: Database session
+        lines: Iterable of result JSONL lines
+
+    Returns:
+        Tuple of (stored evaluations, failed requests)
+    """
+    stored, failed = 0, 0
+    chunk: List[dict] = []
+
+    def flush() -> int:
+        existing = set(db.scalars(
+            select(models.Candidate.id).where(models.Candidate.id.in_([row["id"] for row in chunk]))
+        ))
+        rows = [row for row in chunk if row["id"] in existing]
+        for row in chunk:
+            if row["id"] not in existing:
+                logger.warning(f"Skipping result for unknown candidate {row['id']}")
+        if rows:
+            db.execute(update(models.Candidate), rows)
+            db.commit()
+        return len(rows)
+
+    for candidate_id, evaluation in parse_batch_results(lines):
+        if evaluation is None:
+            failed += 1
+            if candidate_id is not None:
+                logger.warning(f"No usable evaluation for candidate {candidate_id}")
+            continue
+
+        chunk.append({"id": candidate_id, "cv_evaluation": evaluation})
+        if len(chunk) >= INGEST_CHUNK_SIZE:
+            written = flush()
+            stored, failed = stored + written, failed + len(chunk) - written
+            chunk = []
+
+    if chunk:
+        written = flush()
+        stored, failed = stored + written, failed + len(chunk) - written
+
+    return stored, failed
+
+
+def read_cv_folder(cv_dir: str) -> Dict[uuid.UUID, str]:
+    """
+    Reads the CVs of a ``screen`` run, keyed by the candidate ID in their file name.
+
+    Raises:
+        ValueError: If a file name is not a candidate ID or the folder holds no CVs
+    """
+    cv_contents = {}
+    for path in sorted(Path(cv_dir).iterdir()):
+        if path.suffix.lower() not in (".pdf", ".txt"):
+            continue
+        try:
+            candidate_id = uuid.UUID(path.stem)
+        except ValueError:
+            raise ValueError(f"CV file name {path.name} is not a candidate ID")
+        if path.suffix.lower() == ".pdf":
+            cv_contents[candidate_id] = pdf_service.extract_pdf_text(path.read_bytes())
+        else:
+            cv_contents[candidate_id] = path.read_text(encoding="utf-8")
+    if not cv_contents:
+        raise ValueError(f"No .pdf or .txt CVs found in {cv_dir}")
+    return cv_contents
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point. Returns the process exit code."""
+    parser = argparse.ArgumentParser(prog="python -m app.batch", description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rescore = subparsers.add_parser("rescore", help="Write Batch API requests re-scoring a job's candidates")
+    rescore.add_argument("--job-id", type=int, required=True, help="Job whose candidates are re-scored")
+    rescore.add_argument("--output", default="-", help="Output JSONL file (default: stdout)")
+    rescore.add_argument("--deployment", default=None, help="Batch deployment name (default: configured deployment)")
+
+    ingest = subparsers.add_parser("ingest", help="Store a Batch API results file on the candidates")
+    ingest.add_argument("--input", required=True, help="Results JSONL file downloaded from the Batch API")
+
+    screen = subparsers.add_parser("screen", help="Evaluate a folder of CVs for a job's registered candidates")
+    screen.add_argument("--job-id", type=int, required=True, help="Job the candidates applied for")
+    screen.add_argument("--cv-dir", required=True, help="Folder of <candidate-id>.pdf / .txt CV files")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    db = SessionLocal()
+    try:
+        if args.command == "rescore":
+            out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+            try:
+                count = write_rescore_requests(db, args.job_id, out, deployment=args.deployment)
+            finally:
+                if out is not sys.stdout:
+                    out.close()
+            logger.info(f"Wrote {count} batch requests for job {args.job_id}")
+        elif args.command == "ingest":
+            with open(args.input, encoding="utf-8") as results:
+                stored, failed = ingest_results(db, results)
+            logger.info(f"Stored {stored} evaluations ({failed} failed)")
+        else:
+            evaluations = evaluation_service.evaluate_candidate_cvs_bulk(db, args.job_id, read_cv_folder(args.cv_dir))
+            logger.info(f"Evaluated {len(evaluations)} CVs for job {args.job_id}")
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+    finally:
+        db.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
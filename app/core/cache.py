@@ -0,0 +1,170 @@
+"""
+Read-Through Cache
+
+Small caching layer for data that is read far more often than it changes (e.g. a
+job with its project, which is immutable after creation). Values are stored as
+serialized bytes with a TTL in a pluggable backend:
+
+- ``memory`` (default): bounded per-process LRU with expiry
+- ``redis``: any Redis-compatible server, shared by all workers; needs the optional
+  ``redis`` package and ``CACHE_REDIS_URL``
+- ``none``: caching disabled
+
+Lookups are counted in ``arya_cache_requests_total`` by result (hit / miss), from
+which the hit ratio is derived. Backend errors are logged and treated as misses;
+the cache never fails a request.
+
+Usage:
+    from app.core.cache import Cache
+
+    job_cache = Cache("job")
+    data = await job_cache.get(str(job_id))
+    if data is None:
+        data = ...
+        await job_cache.set(str(job_id), data)
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """Interface of a key/value store with per-entry TTLs."""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class NullCache(CacheBackend):
+    """Backend that stores nothing (``CACHE_BACKEND=none``)."""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return None
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        pass
+
+    async def delete(self, key: str) -> None:
+        pass
+
+
+class MemoryCache(CacheBackend):
+    """Per-process LRU cache; the least recently used entry is evicted when full."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+class RedisCache(CacheBackend):
+    """Backend on a Redis-compatible server, shared by all API workers."""
+
+    def __init__(self, url: str):
+        import redis.asyncio
+        self.client = redis.asyncio.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.client.set(key, value, px=max(1, int(ttl * 1000)))
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(key)
+
+
+def create_backend() -> CacheBackend:
+    """Builds the backend selected by ``CACHE_BACKEND``."""
+    backend_name = settings.CACHE_BACKEND.lower()
+    if backend_name == "memory":
+        return MemoryCache(settings.CACHE_MAX_ENTRIES)
+    if backend_name == "redis":
+        return RedisCache(settings.CACHE_REDIS_URL)
+    if backend_name == "none":
+        return NullCache()
+    raise ValueError(f"Unknown CACHE_BACKEND '{settings.CACHE_BACKEND}' (expected memory, redis or none)")
+
+
+_backend: Optional[CacheBackend] = None
+
+
+def get_backend() -> CacheBackend:
+    """Returns the process-wide backend, creating it on first use."""
+    global _backend
+    if _backend is None:
+        _backend = create_backend()
+    return _backend
+
+
+class Cache:
+    """A namespace in the shared backend, with its own TTL and hit/miss metrics."""
+
+    def __init__(self, name: str, ttl: Optional[float] = None, backend: Optional[CacheBackend] = None):
+        self.name = name
+        self.ttl = ttl if ttl is not None else settings.CACHE_TTL
+        self._backend = backend
+
+    @property
+    def backend(self) -> CacheBackend:
+        return self._backend if self._backend is not None else get_backend()
+
+    def _key(self, key: str) -> str:
+        return f"arya:{self.name}:{key}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Returns the cached value, or None on a miss."""
+        try:
+            value = await self.backend.get(self._key(key))
+        except Exception as e:
+            logger.warning(f"Cache '{self.name}' lookup failed: {e}")
+            value = None
+        metrics.CACHE_REQUESTS.labels(cache=self.name, result="hit" if value is not None else "miss").inc()
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        """Stores a value for the cache's TTL."""
+        try:
+            await self.backend.set(self._key(key), value, self.ttl)
+        except Exception as e:
+            logger.warning(f"Cache '{self.name}' store failed: {e}")
+
+    async def invalidate(self, key: str) -> None:
+        """Drops a cached value; call after writing the data it was built from."""
+        metrics.CACHE_INVALIDATIONS.labels(cache=self.name).inc()
+        try:
+            await self.backend.delete(self._key(key))
+        except Exception as e:
+            logger.warning(f"Cache '{self.name}' invalidation failed: {e}")
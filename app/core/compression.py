@@ -0,0 +1,126 @@
+"""
+Response Compression
+
+ASGI middleware that compresses JSON and text responses with Brotli when the client
+accepts ``br`` (and the optional ``brotli`` package is installed), otherwise with
+gzip. Responses smaller than ``COMPRESSION_MINIMUM_SIZE`` bytes, already-encoded
+bodies, partial and not-modified responses, streamed bodies (e.g. server-sent
+events) and binary media types such as PDFs are passed through unchanged.
+
+Usage:
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+"""
+
+import gzip
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
+
+# Media types worth compressing; anything else (PDFs, images) is sent as is
+COMPRESSIBLE_MEDIA_TYPES = ("application/json", "text/")
+
+# Bodies larger than this are compressed in a worker thread to keep the event loop free
+_THREAD_MINIMUM_SIZE = 256 * 1024
+
+
+def _negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Picks the best supported content coding from an Accept-Encoding header."""
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip())
+
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+class CompressionMiddleware:
+    """Compresses complete (non-streamed) response bodies with Brotli or gzip."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = _negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, passthrough
+
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                # Hold the headers back until the first body chunk shows whether to compress
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body":
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            passthrough = True
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start_message["headers"])
+            if message.get("more_body", False) or not self._should_compress(start_message["status"], headers, body):
+                await send(start_message)
+                await send(message)
+                return
+
+            if len(body) >= _THREAD_MINIMUM_SIZE:
+                body = await run_in_threadpool(self._compress, body, encoding)
+            else:
+                body = self._compress(body, encoding)
+
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _should_compress(self, status_code: int, headers: MutableHeaders, body: bytes) -> bool:
+        if status_code in (204, 206, 304) or "content-encoding" in headers:
+            return False
+        if len(body) < self.minimum_size:
+            return False
+        media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+        return media_type.startswith(COMPRESSIBLE_MEDIA_TYPES)
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
@@ -23,6 +23,27 @@ class Settings(BaseSettings):
         AZURE_OPENAI_API_BASE: Azure OpenAI endpoint URL
         AZURE_OPENAI_API_VERSION: Azure OpenAI API version
         AZURE_OPENAI_DEPLOYMENT_NAME: GPT model deployment name
+        AZURE_OPENAI_DEPLOYMENTS: Optional weighted pool of deployments sharing the load
+        OPENAI_BREAKER_*: Per-deployment circuit breaker of the pool
+        CV_BATCH_*: Token budgets for batched CV evaluation
+        CV_PRESCREEN_MIN_COVERAGE: Skill coverage a CV needs to be evaluated by the LLM
+        CV_CASCADE_*: Fast scoring tier and uncertain band of the CV evaluation cascade
+        OPENAI_*_RETR*: Retry policy for Azure OpenAI calls
+        OPENAI_HEDGE_*: Duplicate requests for slow calls of latency-sensitive methods
+        LLM_TOKEN_BUDGET_*: max_tokens sized from recent completion lengths per method
+        OPENAI_HTTP_*, OPENAI_*_TIMEOUT*: Shared connection pool and per-method timeouts
+        LLM_CASSETTE_*: Record/replay of model responses for reproducing and regression tests
+        LLM_CALL_LOGGING: Structured log line per model call
+        LLM_JSON_SALVAGE: Re-request fields missing from an evaluation response
+        CANCEL_ON_DISCONNECT: Endpoints whose work is cancelled when the client disconnects
+        TRACING_*: OpenTelemetry exporter and sampling configuration
+        DEBUG, DB_*: Debug mode and per-request query profiling
+        PROJECT_VARIANT_*: Opt-in pool of pre-generated personalized projects per job
+        SUBMISSION_RESERVATION_TIMEOUT: Lifetime of an unfinished submission slot
+        IDEMPOTENCY_*: Waiting, takeover and retention of Idempotency-Key records
+        COMPRESSION_*: Size threshold and levels of response compression
+        CACHE_*: Backend, TTL and size of the read-through cache
+        EVENTS_BACKEND, SSE_*, RANKING_STREAM_*: Change events and ranking streams
     """
     
     # Database Configuration
@@ -53,6 +74,354 @@ class Settings(BaseSettings):
         env="AZURE_OPENAI_DEPLOYMENT_NAME",
         description="Azure OpenAI Model Deployment Name"
     )
+    AZURE_OPENAI_DEPLOYMENTS: str = Field(
+        "",
+        env="AZURE_OPENAI_DEPLOYMENTS",
+        description="JSON list of deployments (name, api_base, api_key, deployment, weight) to balance over; empty uses the single deployment above"
+    )
+    OPENAI_BREAKER_FAILURE_THRESHOLD: int = Field(
+        5,
+        env="OPENAI_BREAKER_FAILURE_THRESHOLD",
+        description="Consecutive 429/5xx/connection errors that open a pool deployment's circuit breaker"
+    )
+    OPENAI_BREAKER_RESET_TIMEOUT: float = Field(
+        30.0,
+        env="OPENAI_BREAKER_RESET_TIMEOUT",
+        description="Seconds an open circuit breaker waits before a half-open probe call"
+    )
+
+    # Batched CV Evaluation
+    CV_BATCH_MAX_PROMPT_TOKENS: int = Field(
+        12000,
+        env="CV_BATCH_MAX_PROMPT_TOKENS",
+        description="Estimated prompt token budget for one batched CV evaluation request"
+    )
+    CV_BATCH_MAX_COMPLETION_TOKENS: int = Field(
+        4000,
+        env="CV_BATCH_MAX_COMPLETION_TOKENS",
+        description="max_tokens ceiling for one batched CV evaluation request"
+    )
+    CV_BATCH_TOKENS_PER_RESULT: int = Field(
+        450,
+        env="CV_BATCH_TOKENS_PER_RESULT",
+        description="Completion tokens reserved per candidate in a batched request"
+    )
+    CV_BATCH_MAX_CV_CHARS: int = Field(
+        8000,
+        env="CV_BATCH_MAX_CV_CHARS",
+        description="Characters of compacted CV text sent per candidate in a batch"
+    )
+    CV_PRESCREEN_MIN_COVERAGE: float = Field(
+        0.0,
+        env="CV_PRESCREEN_MIN_COVERAGE",
+        description="CVs mentioning a smaller share of the job's tech skills skip LLM evaluation (0 disables)"
+    )
+
+    # CV Evaluation Cascade
+    CV_CASCADE_FAST_DEPLOYMENT: str = Field(
+        "",
+        env="CV_CASCADE_FAST_DEPLOYMENT",
+        description="Deployment that scores CVs first (match_score only); empty disables the cascade"
+    )
+    CV_CASCADE_FAST_API_BASE: str = Field(
+        "",
+        env="CV_CASCADE_FAST_API_BASE",
+        description="Endpoint URL of the fast deployment; empty uses AZURE_OPENAI_API_BASE"
+    )
+    CV_CASCADE_FAST_API_KEY: str = Field(
+        "",
+        env="CV_CASCADE_FAST_API_KEY",
+        description="API key of the fast endpoint; empty uses AZURE_OPENAI_API_KEY"
+    )
+    CV_CASCADE_UNCERTAIN_MIN: int = Field(
+        40,
+        env="CV_CASCADE_UNCERTAIN_MIN",
+        description="Lowest fast-tier score that is escalated to the full evaluation"
+    )
+    CV_CASCADE_UNCERTAIN_MAX: int = Field(
+        80,
+        env="CV_CASCADE_UNCERTAIN_MAX",
+        description="Highest fast-tier score that is escalated to the full evaluation"
+    )
+
+    # LLM Call Retries & Telemetry
+    OPENAI_MAX_RETRIES: int = Field(
+        2,
+        env="OPENAI_MAX_RETRIES",
+        description="Retries for throttled, failed or disconnected Azure OpenAI calls"
+    )
+    OPENAI_RETRY_BASE_DELAY: float = Field(
+        0.5,
+        env="OPENAI_RETRY_BASE_DELAY",
+        description="Initial exponential backoff delay in seconds"
+    )
+    OPENAI_RETRY_MAX_DELAY: float = Field(
+        8.0,
+        env="OPENAI_RETRY_MAX_DELAY",
+        description="Upper bound for a single retry delay in seconds"
+    )
+    OPENAI_HEDGE_METHODS: str = Field(
+        "",
+        env="OPENAI_HEDGE_METHODS",
+        description="Comma-separated OpenAIService methods whose slow async calls are hedged (e.g. evaluate_submission); empty disables hedging"
+    )
+    OPENAI_HEDGE_PERCENTILE: float = Field(
+        0.95,
+        env="OPENAI_HEDGE_PERCENTILE",
+        description="Percentile of recent latency after which a still-running call is duplicated"
+    )
+    OPENAI_HEDGE_MIN_DELAY: float = Field(
+        2.0,
+        env="OPENAI_HEDGE_MIN_DELAY",
+        description="Minimum seconds before a call is hedged"
+    )
+    OPENAI_HEDGE_MAX_RATE: float = Field(
+        0.05,
+        env="OPENAI_HEDGE_MAX_RATE",
+        description="Maximum share of recent calls per method that may be hedged"
+    )
+    OPENAI_HEDGE_WINDOW: int = Field(
+        200,
+        env="OPENAI_HEDGE_WINDOW",
+        description="Recent calls per method used for the latency percentile and the hedge rate"
+    )
+    LLM_TOKEN_BUDGET_METHODS: str = Field(
+        "extract_job_details,generate_project_dict,evaluate_cv,evaluate_submission",
+        env="LLM_TOKEN_BUDGET_METHODS",
+        description="Comma-separated OpenAIService methods whose max_tokens adapts to recent completion lengths; empty keeps the static budgets"
+    )
+    LLM_TOKEN_BUDGET_PERCENTILE: float = Field(
+        0.99,
+        env="LLM_TOKEN_BUDGET_PERCENTILE",
+        description="Percentile of recent completion_tokens the budget is based on"
+    )
+    LLM_TOKEN_BUDGET_MARGIN: float = Field(
+        0.2,
+        env="LLM_TOKEN_BUDGET_MARGIN",
+        description="Headroom added to the percentile (0.2 = 20%)"
+    )
+    LLM_TOKEN_BUDGET_WINDOW: int = Field(
+        500,
+        env="LLM_TOKEN_BUDGET_WINDOW",
+        description="Recent completions per method the percentile is computed over"
+    )
+    LLM_CALL_LOGGING: bool = Field(
+        False,
+        env="LLM_CALL_LOGGING",
+        description="Emit one structured JSON log line per Azure OpenAI call"
+    )
+    LLM_JSON_SALVAGE: bool = Field(
+        True,
+        env="LLM_JSON_SALVAGE",
+        description="Re-request only the fields missing or invalid in a (repaired) evaluation response instead of failing"
+    )
+
+    # Azure OpenAI HTTP Connections
+    OPENAI_HTTP_MAX_CONNECTIONS: int = Field(
+        100,
+        env="OPENAI_HTTP_MAX_CONNECTIONS",
+        description="Maximum open connections of the shared Azure OpenAI connection pool"
+    )
+    OPENAI_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(
+        20,
+        env="OPENAI_HTTP_MAX_KEEPALIVE_CONNECTIONS",
+        description="Idle connections kept open for reuse"
+    )
+    OPENAI_HTTP_KEEPALIVE_EXPIRY: float = Field(
+        60.0,
+        env="OPENAI_HTTP_KEEPALIVE_EXPIRY",
+        description="Seconds an idle connection is kept open"
+    )
+    OPENAI_HTTP2: bool = Field(
+        False,
+        env="OPENAI_HTTP2",
+        description="Use HTTP/2 for Azure OpenAI calls (needs the h2 package)"
+    )
+    OPENAI_HTTP_WARMUP_CONNECTIONS: int = Field(
+        2,
+        env="OPENAI_HTTP_WARMUP_CONNECTIONS",
+        description="Connections opened to each Azure OpenAI endpoint at startup (0 disables)"
+    )
+    OPENAI_CONNECT_TIMEOUT: float = Field(
+        5.0,
+        env="OPENAI_CONNECT_TIMEOUT",
+        description="Default connect timeout for Azure OpenAI calls in seconds"
+    )
+    OPENAI_READ_TIMEOUT: float = Field(
+        60.0,
+        env="OPENAI_READ_TIMEOUT",
+        description="Default read timeout for Azure OpenAI calls in seconds"
+    )
+    OPENAI_METHOD_TIMEOUTS: str = Field(
+        '{"extract_job_details": {"read": 30}, "score_cv": {"read": 15}, "evaluate_cv": {"read": 90}, "evaluate_submission": {"read": 90}}',
+        env="OPENAI_METHOD_TIMEOUTS",
+        description="JSON object mapping OpenAIService methods to connect/read timeouts that override the defaults"
+    )
+
+    # LLM Record / Replay
+    LLM_CASSETTE_MODE: str = Field(
+        "off",
+        env="LLM_CASSETTE_MODE",
+        description="off, record (store every model response) or replay (serve stored responses instead of calling Azure)"
+    )
+    LLM_CASSETTE_PATH: str = Field(
+        "llm_cassette.sqlite3",
+        env="LLM_CASSETTE_PATH",
+        description="SQLite file holding recorded model responses"
+    )
+    LLM_CASSETTE_LATENCY_SCALE: float = Field(
+        1.0,
+        env="LLM_CASSETTE_LATENCY_SCALE",
+        description="Factor applied to recorded latencies on replay (0 answers immediately)"
+    )
+    LLM_CASSETTE_MATCH: str = Field(
+        "exact",
+        env="LLM_CASSETTE_MATCH",
+        description="Replay lookup: exact (same prompt only) or method (fall back to any recording of the same method)"
+    )
+
+    # Client Disconnects
+    CANCEL_ON_DISCONNECT: str = Field(
+        "upload_and_evaluate_cv,create_job_and_assessment",
+        env="CANCEL_ON_DISCONNECT",
+        description="Comma-separated endpoints whose model calls and PDF extraction are cancelled when the client disconnects"
+    )
+
+    # Tracing
+    TRACING_EXPORTER: str = Field(
+        "none",
+        env="TRACING_EXPORTER",
+        description="Span exporter: none, console or otlp"
+    )
+    TRACING_OTLP_ENDPOINT: str = Field(
+        "http://localhost:4318/v1/traces",
+        env="TRACING_OTLP_ENDPOINT",
+        description="OTLP/HTTP traces endpoint used when TRACING_EXPORTER=otlp"
+    )
+    TRACING_SAMPLE_RATIO: float = Field(
+        1.0,
+        env="TRACING_SAMPLE_RATIO",
+        description="Fraction of new traces that are sampled (0.0-1.0)"
+    )
+
+    # Debugging & Query Profiling
+    DEBUG: bool = Field(
+        False,
+        env="DEBUG",
+        description="Enable debug behaviour (e.g. diagnostic response headers)"
+    )
+    DB_PROFILING: bool = Field(
+        False,
+        env="DB_PROFILING",
+        description="Profile the SQL statements executed by each request"
+    )
+    DB_SLOW_QUERY_MS: float = Field(
+        200.0,
+        env="DB_SLOW_QUERY_MS",
+        description="Statements slower than this (milliseconds) are reported as slow"
+    )
+    DB_N_PLUS_ONE_THRESHOLD: int = Field(
+        5,
+        env="DB_N_PLUS_ONE_THRESHOLD",
+        description="Executions of one statement per request that flag a possible N+1"
+    )
+
+    # Personalized project variants
+    PROJECT_VARIANT_POOL_SIZE: int = Field(
+        0,
+        env="PROJECT_VARIANT_POOL_SIZE",
+        description="Unassigned personalized project variants kept ready per job (opt-in); 0 gives every candidate the job's project"
+    )
+    PROJECT_VARIANT_CONCURRENCY: int = Field(
+        2,
+        env="PROJECT_VARIANT_CONCURRENCY",
+        description="Project variants generated at the same time by this process"
+    )
+    PROJECT_VARIANT_RESUME_DAYS: int = Field(
+        7,
+        env="PROJECT_VARIANT_RESUME_DAYS",
+        description="At startup, refill the pools of jobs created or registering candidates within this many days (0 disables)"
+    )
+
+    # Submissions
+    SUBMISSION_RESERVATION_TIMEOUT: int = Field(
+        600,
+        env="SUBMISSION_RESERVATION_TIMEOUT",
+        description="Seconds after which an unfinished submission reservation can be taken over"
+    )
+
+    # Response compression
+    COMPRESSION_MINIMUM_SIZE: int = Field(
+        1024,
+        env="COMPRESSION_MINIMUM_SIZE",
+        description="Responses smaller than this many bytes are sent uncompressed"
+    )
+    COMPRESSION_GZIP_LEVEL: int = Field(
+        6,
+        env="COMPRESSION_GZIP_LEVEL",
+        description="gzip compression level (1-9)"
+    )
+    COMPRESSION_BROTLI_QUALITY: int = Field(
+        4,
+        env="COMPRESSION_BROTLI_QUALITY",
+        description="Brotli quality (0-11); used when the brotli package is installed"
+    )
+
+    # Read-through cache
+    CACHE_BACKEND: str = Field(
+        "memory",
+        env="CACHE_BACKEND",
+        description="Cache backend: memory (per process), redis or none"
+    )
+    CACHE_REDIS_URL: str = Field(
+        "redis://localhost:6379/0",
+        env="CACHE_REDIS_URL",
+        description="URL of the Redis-compatible server used by the redis backend"
+    )
+    CACHE_TTL: float = Field(
+        300.0,
+        env="CACHE_TTL",
+        description="Seconds a cached entry is served before it is reloaded"
+    )
+    CACHE_MAX_ENTRIES: int = Field(
+        1024,
+        env="CACHE_MAX_ENTRIES",
+        description="Entries kept by the memory backend before least recently used ones are evicted"
+    )
+
+    # Events and server-sent event streams
+    EVENTS_BACKEND: str = Field(
+        "memory",
+        env="EVENTS_BACKEND",
+        description="Event fan-out: memory (single process) or postgres (LISTEN/NOTIFY across workers)"
+    )
+    SSE_KEEPALIVE_INTERVAL: float = Field(
+        15.0,
+        env="SSE_KEEPALIVE_INTERVAL",
+        description="Seconds between keep-alive comments on idle event streams"
+    )
+    RANKING_STREAM_DEBOUNCE: float = Field(
+        0.5,
+        env="RANKING_STREAM_DEBOUNCE",
+        description="Seconds ranking changes are collected before one update is computed and sent"
+    )
+
+    # Idempotency-Key handling
+    IDEMPOTENCY_WAIT_TIMEOUT: float = Field(
+        120.0,
+        env="IDEMPOTENCY_WAIT_TIMEOUT",
+        description="Seconds a duplicate request waits for the in-flight original before answering 409"
+    )
+    IDEMPOTENCY_LOCK_TIMEOUT: int = Field(
+        600,
+        env="IDEMPOTENCY_LOCK_TIMEOUT",
+        description="Seconds after which an unfinished idempotent request can be taken over"
+    )
+    IDEMPOTENCY_TTL: int = Field(
+        86400,
+        env="IDEMPOTENCY_TTL",
+        description="Seconds a completed response is replayed for its Idempotency-Key"
+    )
 
     class Config:
         env_file = ".env"
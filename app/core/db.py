@@ -4,21 +4,32 @@ Database Configuration
 This module sets up the SQLAlchemy database connection and session management.
 Supports both PostgreSQL (production) and SQLite (development).
 
+Two engines share the same database:
+- ``async_engine`` / ``AsyncSessionLocal`` (asyncpg / aiosqlite) serve the API, so
+  request handlers never occupy a threadpool worker while waiting on the database.
+- ``engine`` / ``SessionLocal`` are synchronous, for table creation and CLI tools.
+
 Usage:
     from app.core.db import get_db, Base
     
     # In endpoint
-    def my_endpoint(db: Session = Depends(get_db)):
+    async def my_endpoint(db: AsyncSession = Depends(get_db)):
         ...
 """
 
-from typing import Generator
+from typing import AsyncGenerator
 
 from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.core.profiling import install_query_profiler
+from app.core.tracing import instrument_engine
 
 # Create SQLAlchemy engine
 # SQLite requires special connection args for multi-threading
@@ -33,6 +44,8 @@ engine = create_engine(
     connect_args=_connect_args,
     pool_pre_ping=True,  # Verify connections before use
 )
+instrument_engine(engine)
+install_query_profiler(engine)
 
 # Session factory
 SessionLocal = sessionmaker(
@@ -41,26 +54,62 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+
+def _async_database_url(database_url: str):
+    """Maps the configured (sync) database URL onto its async driver."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    if backend == "postgresql":
+        # asyncpg takes ``ssl`` instead of libpq's ``sslmode``
+        query = dict(url.query)
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        return url.set(drivername="postgresql+asyncpg", query=query)
+    return url
+
+
+# Async engine used by the API
+async_engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL),
+    pool_pre_ping=True,
+)
+instrument_engine(async_engine.sync_engine)
+install_query_profiler(async_engine.sync_engine)
+
+# Async session factory; objects stay usable after commit (no implicit lazy reloads)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Base class for SQLAlchemy models
 Base = declarative_base()
 
 
-def get_db() -> Generator[Session, None, None]:
+def dialect_insert(session: AsyncSession):
+    """
+    Returns the ``insert`` construct of the session's dialect, which supports
+    ``on_conflict_do_nothing`` / ``on_conflict_do_update`` (PostgreSQL and SQLite).
+    """
+    return postgresql_insert if session.bind.dialect.name == "postgresql" else sqlite_insert
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
-    Dependency that provides a database session.
+    Dependency that provides an async database session.
     
     Yields a database session and ensures it's closed after the request.
     
     Yields:
-        Session: SQLAlchemy database session
+        AsyncSession: SQLAlchemy async database session
         
     Example:
         @app.get("/items")
-        def get_items(db: Session = Depends(get_db)):
-            return db.query(Item).all()
+        async def get_items(db: AsyncSession = Depends(get_db)):
+            return (await db.scalars(select(Item))).all()
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""
+Client Disconnect Handling
+
+Long evaluation requests (PDF extraction plus a model call) keep running after the
+client has gone away, spending tokens and a worker slot on a result nobody receives.
+``DisconnectGuard`` runs an endpoint's work while watching the connection and
+cancels the work when the client disconnects first: the model call is abandoned
+and PDF extraction stops at the next page.
+
+Only endpoints listed in ``CANCEL_ON_DISCONNECT`` are cancelled, since some
+results (e.g. a candidate's phase submission) should still be stored when the
+client leaves. Cancelled work is counted in ``arya_cancelled_work_total``.
+
+Usage:
+    guard = DisconnectGuard(request, "upload_and_evaluate_cv")
+    cv_text = await run_in_threadpool(pdf_service.extract_pdf_text, content, guard.cancelled)
+    result = await guard.run(evaluate)
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Awaitable, Callable, TypeVar
+
+from starlette.requests import Request
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Non-standard status (nginx) logged for requests abandoned by the client
+CLIENT_CLOSED_REQUEST = 499
+
+
+class ClientDisconnected(Exception):
+    """Raised when the client disconnected and the endpoint's work was cancelled."""
+
+
+def cancels_on_disconnect(endpoint: str) -> bool:
+    """Whether ``endpoint`` is configured to cancel its work when the client disconnects."""
+    return endpoint in {name.strip() for name in settings.CANCEL_ON_DISCONNECT.split(",")}
+
+
+class DisconnectGuard:
+    """Cancels one request's work when its client disconnects."""
+
+    def __init__(self, request: Request, endpoint: str):
+        self.request = request
+        self.endpoint = endpoint
+        self.enabled = cancels_on_disconnect(endpoint)
+        # Checked by blocking work running in worker threads, which cannot be cancelled
+        self.cancelled = threading.Event()
+
+    async def run(self, work: Callable[[], Awaitable[T]]) -> T:
+        """
+        Runs ``work`` until it finishes or the client disconnects.
+
+        Raises:
+            ClientDisconnected: If the client disconnected before ``work`` finished
+        """
+        if not self.enabled:
+            return await work()
+
+        task = asyncio.ensure_future(work())
+        watcher = asyncio.ensure_future(self._wait_for_disconnect())
+        try:
+            done, _ = await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            if task in done:
+                return task.result()
+        finally:
+            watcher.cancel()
+            if not task.done():
+                self.cancelled.set()
+                task.cancel()
+
+        # Let the work unwind (release pool leases, reservations, ...) before reporting
+        await asyncio.wait({task})
+        if task.cancelled() or task.exception() is not None:
+            metrics.CANCELLED_WORK.labels(endpoint=self.endpoint).inc()
+            logger.info(f"Client disconnected; cancelled {self.endpoint} for {self.request.url.path}")
+            raise ClientDisconnected(f"Client disconnected during {self.endpoint}")
+        # Finished just as the client left; nothing was saved by cancelling
+        return task.result()
+
+    async def _wait_for_disconnect(self) -> None:
+        # The body has been read by now, so the next message is the disconnect. Waiting
+        # on receive (rather than polling is_disconnected) also works behind
+        # BaseHTTPMiddleware, whose wrapped receive cannot be polled.
+        while (await self.request.receive())["type"] != "http.disconnect":
+            pass
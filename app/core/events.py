@@ -0,0 +1,158 @@
+"""
+Event Bus
+
+Lightweight publish/subscribe for change notifications such as "the rankings of
+job 3 changed", consumed by the server-sent event streams.
+
+With ``EVENTS_BACKEND=memory`` (default) events only reach subscribers in the same
+process. With ``EVENTS_BACKEND=postgres`` every event is sent through PostgreSQL
+``NOTIFY`` and each API worker ``LISTEN``s on one dedicated connection, so
+subscribers on all workers receive it.
+
+Usage:
+    from app.core.events import event_bus
+
+    with event_bus.subscribe("rankings:job:3") as queue:
+        message = await queue.get()
+
+    await event_bus.publish("rankings:job:3", {"candidate_id": "..."})
+"""
+
+import asyncio
+import json
+import logging
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Set
+
+from sqlalchemy import func, select
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.db import async_engine
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL channel carrying all events; the topic travels in the payload
+NOTIFY_CHANNEL = "arya_events"
+
+# Undelivered messages kept per subscriber; further messages are dropped
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class PostgresNotifyBridge:
+    """Fans events out to every API worker through PostgreSQL LISTEN/NOTIFY."""
+
+    def __init__(self, dispatch: Callable[[str, dict], None]):
+        self.dispatch = dispatch
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._listen_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def notify(self, topic: str, message: dict) -> None:
+        payload = json.dumps({"topic": topic, "message": message})
+        async with async_engine.begin() as conn:
+            await conn.execute(select(func.pg_notify(NOTIFY_CHANNEL, payload)))
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        try:
+            event = json.loads(payload)
+            self.dispatch(event["topic"], event["message"])
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Ignoring malformed event notification: {e}")
+
+    async def _listen_forever(self) -> None:
+        """Holds a LISTEN connection open, reconnecting with backoff when it drops."""
+        delay = 1.0
+        while True:
+            try:
+                async with async_engine.connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    listener = raw.driver_connection
+                    await listener.add_listener(NOTIFY_CHANNEL, self._on_notification)
+                    logger.info(f"Listening for events on PostgreSQL channel '{NOTIFY_CHANNEL}'")
+                    delay = 1.0
+                    try:
+                        while not listener.is_closed():
+                            await asyncio.sleep(5)
+                    finally:
+                        # The connection goes back to the pool; it must not keep listening
+                        if not listener.is_closed():
+                            await listener.remove_listener(NOTIFY_CHANNEL, self._on_notification)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Event listener connection failed: {e}; reconnecting in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+
+class EventBus:
+    """In-process topic subscriptions, optionally fed by a cross-worker bridge."""
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._bridge: Optional[PostgresNotifyBridge] = None
+
+    async def start(self) -> None:
+        """Connects the cross-worker bridge selected by ``EVENTS_BACKEND``."""
+        backend_name = settings.EVENTS_BACKEND.lower()
+        if backend_name == "postgres":
+            self._bridge = PostgresNotifyBridge(self._dispatch)
+            await self._bridge.start()
+        elif backend_name != "memory":
+            raise ValueError(f"Unknown EVENTS_BACKEND '{settings.EVENTS_BACKEND}' (expected memory or postgres)")
+
+    async def stop(self) -> None:
+        if self._bridge is not None:
+            await self._bridge.stop()
+            self._bridge = None
+
+    @contextmanager
+    def subscribe(self, topic: str) -> Iterator[asyncio.Queue]:
+        """Yields a queue receiving the messages published to ``topic`` until the block exits."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(topic, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[topic]
+
+    async def publish(self, topic: str, message: dict) -> None:
+        """
+        Publishes a JSON-serializable message to every subscriber of ``topic``.
+
+        Publishing never fails the caller: bridge errors are logged and the message
+        is still delivered to subscribers in this process.
+        """
+        metrics.EVENTS_PUBLISHED.labels(topic=topic.split(":", 1)[0]).inc()
+        if self._bridge is not None:
+            try:
+                await self._bridge.notify(topic, message)
+                return
+            except Exception as e:
+                logger.warning(f"Event notification failed, delivering locally only: {e}")
+        self._dispatch(topic, message)
+
+    def _dispatch(self, topic: str, message: dict) -> None:
+        for queue in self._subscribers.get(topic, ()):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.warning(f"Dropping event for a slow subscriber of '{topic}'")
+
+
+event_bus = EventBus()
@@ -0,0 +1,99 @@
+"""
+Conditional Requests
+
+Helpers for ``ETag`` / ``Last-Modified`` validators on read endpoints that clients
+poll. An endpoint derives its validators from a cheap version query (row counts and
+``updated_at`` timestamps), answers ``304 Not Modified`` when the client's copy is
+current, and only otherwise loads and serializes the full payload.
+
+ETags are weak (``W/"..."``): the representation may be served with different
+content codings by the compression middleware.
+
+HTTP dates have one-second resolution, so a Last-Modified value from the current
+second could hide a second change within that second from If-Modified-Since
+clients. As RFC 9110 (8.8.2.2) suggests, such a value is treated as weak and not
+sent; the client revalidates with the ETag alone until the second has passed.
+
+Usage:
+    validators = http_cache.Validators.from_version(count, last_updated)
+    if validators.matches(request):
+        return validators.not_modified()
+    ...
+    validators.apply(response)
+"""
+
+import hashlib
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Clients may keep responses but must revalidate them before every reuse
+CACHE_CONTROL = "no-cache"
+
+
+class Validators:
+    """ETag and Last-Modified values describing one version of a resource."""
+
+    def __init__(self, etag: str, last_modified: Optional[datetime] = None):
+        self.etag = etag
+        self.last_modified = _as_utc(last_modified) if last_modified else None
+
+    @classmethod
+    def from_version(cls, *parts: Any, last_modified: Optional[datetime] = None) -> "Validators":
+        """
+        Builds validators from the values that identify a resource version.
+
+        Args:
+            *parts: Values that change whenever the representation changes
+                (ids, row counts, timestamps)
+            last_modified: Time of the latest change, for the Last-Modified header
+        """
+        digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()[:20]
+        return cls(f'W/"{digest}"', last_modified)
+
+    def matches(self, request: Request) -> bool:
+        """Whether the client's cached copy (If-None-Match / If-Modified-Since) is current."""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2)
+            tags = {_opaque_tag(tag) for tag in if_none_match.split(",")}
+            return "*" in tags or _opaque_tag(self.etag) in tags
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and self.last_modified is not None:
+            try:
+                since = _as_utc(parsedate_to_datetime(if_modified_since))
+            except (TypeError, ValueError):
+                return False
+            # HTTP dates have one-second resolution
+            return self.last_modified.replace(microsecond=0) <= since
+        return False
+
+    def apply(self, response: Response) -> None:
+        """Sets the validator and Cache-Control headers on a response."""
+        response.headers["ETag"] = self.etag
+        if self.last_modified is not None and self.last_modified <= datetime.now(timezone.utc) - timedelta(seconds=1):
+            response.headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        response.headers["Cache-Control"] = CACHE_CONTROL
+
+    def not_modified(self) -> Response:
+        """Builds the empty 304 response for a matching conditional request."""
+        response = Response(status_code=304)
+        self.apply(response)
+        return response
+
+
+def _opaque_tag(tag: str) -> str:
+    """Strips the weakness indicator; If-None-Match uses weak comparison."""
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite returns naive timestamps, stored in UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
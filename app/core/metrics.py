@@ -0,0 +1,187 @@
+"""
+Prometheus Metrics
+
+This module defines the application's Prometheus metrics. All metrics live in the
+default ``prometheus_client`` registry and are exported by the ``/metrics`` endpoint.
+
+Usage:
+    from app.core.metrics import LLM_REQUEST_LATENCY
+    LLM_REQUEST_LATENCY.labels(method="evaluate_cv", outcome="success").observe(1.2)
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# --- LLM calls (OpenAIService) ---
+LLM_REQUEST_LATENCY = Histogram(
+    "arya_llm_request_duration_seconds",
+    "Latency of Azure OpenAI chat completion calls, including retries",
+    ["method", "outcome"],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 12, 16, 24, 32, 48, 64, 96),
+)
+LLM_TOKENS = Counter(
+    "arya_llm_tokens_total",
+    "Tokens consumed by Azure OpenAI calls",
+    ["method", "kind"],
+)
+LLM_COMPLETION_TOKENS = Histogram(
+    "arya_llm_completion_tokens",
+    "Completion tokens per Azure OpenAI call",
+    ["method"],
+    buckets=(50, 100, 200, 300, 400, 600, 800, 1000, 1200, 1500, 2000, 3000, 4000),
+)
+LLM_FINISH_REASONS = Counter(
+    "arya_llm_finish_reasons_total",
+    "Finish reasons reported for Azure OpenAI completions",
+    ["method", "finish_reason"],
+)
+LLM_RETRIES = Counter(
+    "arya_llm_retries_total",
+    "Retried Azure OpenAI calls by error type",
+    ["method", "error"],
+)
+LLM_PARSE_FAILURES = Counter(
+    "arya_llm_parse_failures_total",
+    "Completions whose JSON content could not be decoded",
+    ["method"],
+)
+LLM_PARSE_FALLBACKS = Counter(
+    "arya_llm_parse_fallbacks_total",
+    "Fields filled with a fallback value because regex parsing of a completion failed",
+    ["method", "field"],
+)
+LLM_JSON_OUTCOMES = Counter(
+    "arya_llm_json_outcomes_total",
+    "Evaluation completions that were valid, repaired, salvaged by re-requesting missing fields, or unusable",
+    ["method", "outcome"],
+)
+
+# --- Record / replay (llm_cassette) ---
+LLM_CASSETTE_EVENTS = Counter(
+    "arya_llm_cassette_events_total",
+    "Model responses recorded to, replayed (or substituted) from, or missing in the cassette store",
+    ["method", "event"],
+)
+
+# --- Adaptive completion budgets (token_budget) ---
+LLM_TOKEN_BUDGET = Gauge(
+    "arya_llm_token_budget",
+    "Current max_tokens sent for a method's model calls",
+    ["method"],
+)
+LLM_TOKEN_BUDGET_RAISES = Counter(
+    "arya_llm_token_budget_raises_total",
+    "Budget increases after a completion was cut off at max_tokens",
+    ["method"],
+)
+
+# --- Request hedging (hedging) ---
+LLM_HEDGES = Counter(
+    "arya_llm_hedges_total",
+    "Duplicate requests sent for slow model calls",
+    ["method"],
+)
+LLM_HEDGE_WINS = Counter(
+    "arya_llm_hedge_wins_total",
+    "Hedged calls by the attempt that returned first (primary or hedge)",
+    ["method", "winner"],
+)
+LLM_HEDGES_SUPPRESSED = Counter(
+    "arya_llm_hedges_suppressed_total",
+    "Slow calls not hedged because the hedge rate cap was reached",
+    ["method"],
+)
+
+# --- Deployment pool (deployment_pool) ---
+LLM_DEPLOYMENT_REQUESTS = Counter(
+    "arya_llm_deployment_requests_total",
+    "Calls sent to each pool deployment by outcome (success, error, failure, cancelled)",
+    ["deployment", "outcome"],
+)
+LLM_DEPLOYMENT_OUTSTANDING = Gauge(
+    "arya_llm_deployment_outstanding_requests",
+    "Calls currently in flight on each pool deployment",
+    ["deployment"],
+)
+LLM_DEPLOYMENT_CIRCUIT_STATE = Gauge(
+    "arya_llm_deployment_circuit_state",
+    "Circuit breaker state of each pool deployment (0 closed, 1 half-open, 2 open)",
+    ["deployment"],
+)
+LLM_CIRCUIT_TRANSITIONS = Counter(
+    "arya_llm_circuit_transitions_total",
+    "Circuit breaker state changes of pool deployments",
+    ["deployment", "state"],
+)
+
+# --- CV evaluation cascade (OpenAIService) ---
+CV_CASCADE_ROUTES = Counter(
+    "arya_cv_cascade_routes_total",
+    "CV cascade routing decisions: settled by the fast tier, escalated, or escalated after a fast-tier failure",
+    ["route"],
+)
+CV_CASCADE_TIER_LATENCY = Histogram(
+    "arya_cv_cascade_tier_duration_seconds",
+    "Latency of each CV cascade tier",
+    ["tier"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 12, 16, 24, 32, 48),
+)
+
+# --- CV pre-screening (prescreen_service) ---
+CV_PRESCREEN_DECISIONS = Counter(
+    "arya_cv_prescreen_decisions_total",
+    "CV pre-screen outcomes: sent to LLM evaluation or skipped",
+    ["decision"],
+)
+CV_PRESCREEN_COVERAGE = Histogram(
+    "arya_cv_prescreen_coverage",
+    "Share of a job's technical skills found in a CV by the lexical pre-screen",
+    buckets=(0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0),
+)
+
+# --- Personalized project variants (project_service) ---
+PROJECT_VARIANT_ASSIGNMENTS = Counter(
+    "arya_project_variant_assignments_total",
+    "Registered candidates by the project they received (variant, or the job's project when the pool was empty)",
+    ["source"],
+)
+PROJECT_VARIANTS_GENERATED = Counter(
+    "arya_project_variants_generated_total",
+    "Background project variant generations by outcome",
+    ["outcome"],
+)
+
+# --- Read-through caches (app.core.cache) ---
+CACHE_REQUESTS = Counter(
+    "arya_cache_requests_total",
+    "Cache lookups by result (hit or miss)",
+    ["cache", "result"],
+)
+CACHE_INVALIDATIONS = Counter(
+    "arya_cache_invalidations_total",
+    "Explicit cache invalidations",
+    ["cache"],
+)
+
+# --- Events and streams (app.core.events) ---
+EVENTS_PUBLISHED = Counter(
+    "arya_events_published_total",
+    "Change events published on the event bus",
+    ["topic"],
+)
+SSE_CONNECTIONS = Gauge(
+    "arya_sse_connections",
+    "Open server-sent event streams",
+    ["stream"],
+)
+RANKING_STREAM_COMPUTATIONS = Counter(
+    "arya_ranking_stream_computations_total",
+    "Ranking computations for ranking streams, shared by all viewers of a job",
+    ["kind"],
+)
+
+# --- Client disconnects (app.core.disconnect) ---
+CANCELLED_WORK = Counter(
+    "arya_cancelled_work_total",
+    "Endpoint work (model calls, PDF extraction) cancelled because the client disconnected",
+    ["endpoint"],
+)
@@ -0,0 +1,110 @@
+"""
+Query Profiling
+
+Opt-in, per-request SQL profiler built on SQLAlchemy engine events. While a request
+is being profiled every statement is timed and grouped by its SQL text, which makes
+N+1 patterns (the same parameterized statement issued over and over) and slow
+queries easy to spot.
+
+Enable with ``DB_PROFILING=true``. A summary is logged for each request; with
+``DEBUG=true`` it is also returned in the ``X-DB-Profile`` response header.
+
+Usage:
+    from app.core.profiling import profile_queries
+
+    with profile_queries() as profile:
+        db.query(models.Job).all()
+    print(profile.summary())
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_current_profile: ContextVar[Optional["QueryProfile"]] = ContextVar("query_profile", default=None)
+
+
+class QueryProfile:
+    """Statistics for the SQL statements executed while profiling one unit of work."""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.query_count = 0
+        self.total_time = 0.0
+        self.statement_counts: Dict[str, int] = {}
+        self.slow_queries: List[tuple] = []
+
+    def record(self, statement: str, duration: float) -> None:
+        self.query_count += 1
+        self.total_time += duration
+        self.statement_counts[statement] = self.statement_counts.get(statement, 0) + 1
+        if duration * 1000 >= settings.DB_SLOW_QUERY_MS:
+            self.slow_queries.append((statement, duration))
+
+    @property
+    def duplicate_statements(self) -> Dict[str, int]:
+        """Statements executed more than once, with their execution counts."""
+        return {stmt: count for stmt, count in self.statement_counts.items() if count > 1}
+
+    @property
+    def n_plus_one_suspects(self) -> Dict[str, int]:
+        """Statements repeated often enough to suggest a lazy load inside a loop."""
+        threshold = settings.DB_N_PLUS_ONE_THRESHOLD
+        return {stmt: count for stmt, count in self.statement_counts.items() if count >= threshold}
+
+    def summary(self) -> str:
+        """Compact one-line summary, suitable for a response header."""
+        return (
+            f"queries={self.query_count}; time_ms={self.total_time * 1000:.1f}; "
+            f"duplicates={len(self.duplicate_statements)}; "
+            f"n_plus_one={len(self.n_plus_one_suspects)}; slow={len(self.slow_queries)}"
+        )
+
+    def log(self) -> None:
+        """Logs the summary, plus a warning for every N+1 suspect and slow query."""
+        logger.info(f"DB profile {self.label}: {self.summary()}")
+        for statement, count in self.n_plus_one_suspects.items():
+            logger.warning(f"Possible N+1 in {self.label}: executed {count}x: {_shorten(statement)}")
+        for statement, duration in self.slow_queries:
+            logger.warning(f"Slow query in {self.label} ({duration * 1000:.1f} ms): {_shorten(statement)}")
+
+
+@contextmanager
+def profile_queries(label: str = "") -> Iterator[QueryProfile]:
+    """Profiles every statement executed in the current context until the block exits."""
+    profile = QueryProfile(label)
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+def install_query_profiler(engine: Engine) -> None:
+    """Registers the cursor-execute listeners that feed the active ``QueryProfile``."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        if _current_profile.get() is not None:
+            context._arya_query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+        profile = _current_profile.get()
+        start = getattr(context, "_arya_query_start", None)
+        if profile is not None and start is not None:
+            profile.record(statement, time.perf_counter() - start)
+
+
+def _shorten(statement: str, limit: int = 300) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
@@ -0,0 +1,58 @@
+"""
+JSON Responses
+
+``ORJSONResponse`` renders JSON with orjson and is the application's default
+response class.
+
+``trusted_response`` is a fast path for large payloads the API builds itself (e.g.
+candidate rankings). FastAPI validates every response against the endpoint's
+``response_model`` before serializing it; for data whose types we already
+guarantee that validation is pure overhead, so it is skipped. With ``DEBUG=true``
+the payload is still validated to catch drift from the schema.
+
+Usage:
+    from app.core.responses import trusted_response
+
+    return trusted_response({"job_title": title, "rankings": rankings}, schemas.RankingResponse)
+"""
+
+from functools import lru_cache
+from typing import Any
+
+import orjson
+from pydantic import TypeAdapter
+from starlette.responses import JSONResponse
+
+from app.core.config import settings
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (handles datetimes and UUIDs natively)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@lru_cache(maxsize=None)
+def _adapter(model: Any) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def trusted_response(content: Any, model: Any, status_code: int = 200) -> ORJSONResponse:
+    """
+    Serializes content produced by the API itself without response-model validation.
+
+    Args:
+        content: JSON-compatible payload whose values already have the types ``model`` declares
+        model: The endpoint's response model; only checked when ``DEBUG`` is on
+        status_code: HTTP status code
+
+    Returns:
+        ORJSONResponse with the serialized content
+
+    Raises:
+        pydantic.ValidationError: In debug mode, if the content does not match the model
+    """
+    if settings.DEBUG:
+        _adapter(model).validate_python(content)
+    return ORJSONResponse(content, status_code=status_code)
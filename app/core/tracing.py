@@ -0,0 +1,90 @@
+"""
+Request Tracing
+
+This module configures OpenTelemetry tracing for the API. A request produces one
+root span (created by the HTTP middleware in ``app.main``) with child spans for
+SQL statements, Azure OpenAI calls, PDF text extraction and PDF rendering.
+
+Tracing is disabled unless ``TRACING_EXPORTER`` is set to ``console`` or ``otlp``;
+without a configured provider every span is a no-op.
+
+Usage:
+    from app.core.tracing import tracer
+
+    with tracer.start_as_current_span("pdf.extract_text"):
+        ...
+"""
+
+import time
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+tracer = trace.get_tracer("arya-api")
+
+# SQL text recorded on db spans is truncated to keep exported spans small
+_MAX_STATEMENT_LENGTH = 1000
+
+
+def configure_tracing() -> bool:
+    """
+    Installs the global tracer provider according to the settings.
+
+    Returns:
+        True if tracing was enabled, False if it is switched off
+    """
+    exporter_name = settings.TRACING_EXPORTER.lower()
+    if exporter_name == "none":
+        return False
+
+    if exporter_name == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        exporter = OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+    elif exporter_name == "console":
+        exporter = ConsoleSpanExporter()
+    else:
+        raise ValueError(f"Unknown TRACING_EXPORTER '{settings.TRACING_EXPORTER}' (expected none, console or otlp)")
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": "arya-api"}),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    return True
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Emits one ``db.query`` span per SQL statement executed on the engine."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_query_span(conn, cursor, statement, parameters, context, executemany):
+        span = tracer.start_span("db.query", start_time=time.time_ns())
+        if span.is_recording():
+            span.set_attribute("db.system", engine.dialect.name)
+            span.set_attribute("db.statement", statement[:_MAX_STATEMENT_LENGTH])
+            span.set_attribute("db.executemany", executemany)
+        context._arya_span = span
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _end_query_span(conn, cursor, statement, parameters, context, executemany):
+        span = getattr(context, "_arya_span", None)
+        if span is not None:
+            span.set_attribute("db.rowcount", cursor.rowcount)
+            span.end()
+
+    @event.listens_for(engine, "handle_error")
+    def _fail_query_span(exception_context):
+        context = exception_context.execution_context
+        span = getattr(context, "_arya_span", None) if context is not None else None
+        if span is not None:
+            span.record_exception(exception_context.original_exception)
+            span.set_status(trace.Status(trace.StatusCode.ERROR))
+            span.end()
@@ -10,11 +10,22 @@ Version: 1.0.0
 
 import logging
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from opentelemetry import propagate, trace
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from app.api.v1.endpoints import candidates, jobs, submissions
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
+from app.core.disconnect import CLIENT_CLOSED_REQUEST, ClientDisconnected
 from app.core.db import Base, engine
+from app.core.events import event_bus
+from app.core.profiling import profile_queries
+from app.core.responses import ORJSONResponse
+from app.core.tracing import configure_tracing, tracer
+from app.services import project_service
+from app.services.openai_service import openai_service
 
 # Configure logging
 logging.basicConfig(
@@ -23,6 +34,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+if configure_tracing():
+    logger.info("OpenTelemetry tracing enabled.")
+
 
 def create_tables() -> None:
     """
@@ -59,6 +73,7 @@ ARYA (AI Recruitment & Yield Assessment) revolutionizes hiring through:
         "name": "MIT License",
         "url": "https://opensource.org/licenses/MIT",
     },
+    default_response_class=ORJSONResponse,
 )
 
 # --- CORS Middleware ---
@@ -68,9 +83,64 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified"],
+)
+
+# --- Compression Middleware ---
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
 )
 
 
+# --- Tracing Middleware ---
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """
+    Wrap each request in a root span; DB, LLM and PDF spans nest beneath it.
+    
+    An incoming W3C ``traceparent`` header is honoured so the API joins upstream traces.
+    """
+    with tracer.start_as_current_span(
+        f"{request.method} {request.url.path}",
+        context=propagate.extract(request.headers),
+        kind=trace.SpanKind.SERVER,
+    ) as span:
+        span.set_attribute("http.method", request.method)
+        span.set_attribute("http.target", request.url.path)
+        response = await call_next(request)
+
+        # Name the span after the route template once routing has resolved it
+        route = request.scope.get("route")
+        if route is not None:
+            span.update_name(f"{request.method} {route.path}")
+            span.set_attribute("http.route", route.path)
+        span.set_attribute("http.status_code", response.status_code)
+        return response
+
+
+# --- Query Profiling Middleware ---
+if settings.DB_PROFILING:
+    @app.middleware("http")
+    async def profile_request_queries(request: Request, call_next):
+        """Log per-request SQL statistics (and expose them as a header in debug mode)."""
+        with profile_queries(f"{request.method} {request.url.path}") as profile:
+            response = await call_next(request)
+        profile.log()
+        if settings.DEBUG:
+            response.headers["X-DB-Profile"] = profile.summary()
+        return response
+
+
+# --- Exception Handlers ---
+@app.exception_handler(ClientDisconnected)
+async def client_disconnected_handler(request: Request, exc: ClientDisconnected) -> Response:
+    """Nobody is listening any more; the status only shows up in access logs."""
+    return Response(status_code=CLIENT_CLOSED_REQUEST)
+
+
 # --- Event Handlers ---
 @app.on_event("startup")
 async def on_startup() -> None:
@@ -78,6 +148,17 @@ async def on_startup() -> None:
     logger.info("Starting ARYA API...")
     create_tables()
     logger.info("Database tables created successfully.")
+    await event_bus.start()
+    await openai_service.warm_up()
+    await project_service.resume_variant_refills()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    """Release background resources on shutdown."""
+    await project_service.cancel_variant_refills()
+    await event_bus.stop()
+    await openai_service.aclose()
 
 
 # --- API Routers ---
@@ -113,4 +194,35 @@ async def health_check():
         "status": "healthy",
         "service": "arya-api",
         "version": "1.0.0"
-    }
\ No newline at end of file
+    }
+
+
+@app.get("/health/llm", tags=["Health"])
+async def llm_health_check():
+    """
+    Azure OpenAI deployment health.
+    
+    Returns the circuit breaker state, in-flight calls and call counts of every
+    deployment in the pool (``AZURE_OPENAI_DEPLOYMENTS``), and the current
+    ``max_tokens`` budget of every adaptive method (``LLM_TOKEN_BUDGET_METHODS``).
+    """
+    token_budgets = openai_service.token_budget.status()
+    if openai_service.pool is None:
+        return {"pool": False, "deployments": [], "token_budgets": token_budgets}
+    deployments = openai_service.pool.status()
+    return {
+        "pool": True,
+        "status": "healthy" if any(d["state"] != "open" for d in deployments) else "unavailable",
+        "deployments": deployments,
+        "token_budgets": token_budgets
+    }
+
+
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+def prometheus_metrics() -> Response:
+    """
+    Prometheus scrape endpoint.
+    
+    Exposes LLM call latency, token usage, finish reasons, retries and parse failures.
+    """
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -4,13 +4,17 @@ SQLAlchemy Database Models
 This package contains all database models for the ARYA API:
 - Job: Job postings and requirements
 - Project: AI-generated assessment projects
+- ProjectVariant: Pre-generated personalized projects handed out to candidates
 - Candidate: Job applicants
 - Submission: Candidate project submissions
+- IdempotencyKey: Stored responses of requests sent with an Idempotency-Key
 """
 
 from app.models.candidate import Candidate
 from app.models.job import Job
 from app.models.project import Project
+from app.models.project_variant import ProjectVariant
 from app.models.submission import Submission
+from app.models.idempotency import IdempotencyKey
 
-__all__ = ["Job", "Project", "Candidate", "Submission"]
\ No newline at end of file
+__all__ = ["Job", "Project", "ProjectVariant", "Candidate", "Submission", "IdempotencyKey"]
\ No newline at end of file
@@ -1,23 +1,41 @@
 import uuid
 
-from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.core.db import Base
+from app.models.types import JSONVariant, utc_now
 
 class Candidate(Base):
     __tablename__ = "candidates"
+    __table_args__ = (
+        # Keyset pagination of a job's candidates on (created_at, id)
+        Index("ix_candidates_job_id_created_at_id", "job_id", "created_at", "id"),
+        # JSONB containment queries (e.g. skills_gaps @> ["Kubernetes"]) on PostgreSQL
+        Index(
+            "ix_candidates_cv_evaluation_gin", "cv_evaluation",
+            postgresql_using="gin", postgresql_ops={"cv_evaluation": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
     name = Column(String(255), nullable=False)
     email = Column(String(255), unique=True, index=True, nullable=False)
     status = Column(String(50), default="Applied")  # e.g., Applied, Phase 1 Complete, Rejected
-    cv_evaluation = Column(JSON, nullable=True)  # Stores the CV evaluation result
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Large payloads are deferred: only loaded by queries that undefer them
+    cv_text = deferred(Column(Text, nullable=True))  # Extracted CV text, kept for offline re-scoring
+    cv_evaluation = deferred(Column(JSONVariant, nullable=True))  # Stores the CV evaluation result
+    # Keyset pagination key: set from Python so values are unique to the microsecond on every backend
+    created_at = Column(DateTime(timezone=True), default=utc_now, server_default=func.now())
+    # Bumped on every UPDATE; versions rankings for conditional GETs.
+    # Set from Python so writes within the same second still change the version
+    updated_at = Column(DateTime(timezone=True), default=utc_now, onupdate=utc_now, server_default=func.now())
 
     # Relationships
     job = relationship("Job", back_populates="candidates")
-    submissions = relationship("Submission", back_populates="candidate", cascade="all, delete-orphan")
\ No newline at end of file
+    submissions = relationship("Submission", back_populates="candidate", cascade="all, delete-orphan")
+    # Personalized project; candidates registered while the job's pool was empty use the job's project
+    project_variant = relationship("ProjectVariant", back_populates="candidate", uselist=False)
\ No newline at end of file
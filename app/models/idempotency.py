@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, DateTime, JSON
+from sqlalchemy.orm import deferred
+from sqlalchemy.sql import func
+
+from app.core.db import Base
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    # Keys are scoped to the endpoint and resource they were sent to
+    scope = Column(String(255), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)  # SHA-256 of the request payload
+    status = Column(String(20), nullable=False, default="in_progress")  # in_progress | completed
+    response_body = deferred(Column(JSON, nullable=True))  # Stored once the request completed
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    completed_at = Column(DateTime(timezone=True), nullable=True)
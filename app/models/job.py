@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 from app.core.db import Base
@@ -12,9 +12,10 @@ class Job(Base):
     industry = Column(String(255))
     tech_skills = Column(JSON)  # Stores a list of strings
     soft_skills = Column(JSON)  # Stores a list of strings
-    job_description = Column(Text)
+    job_description = deferred(Column(Text))  # Deferred: only loaded by queries that undefer it
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     project = relationship("Project", back_populates="job", uselist=False, cascade="all, delete-orphan")
-    candidates = relationship("Candidate", back_populates="job", cascade="all, delete-orphan")
\ No newline at end of file
+    candidates = relationship("Candidate", back_populates="job", cascade="all, delete-orphan")
+    project_variants = relationship("ProjectVariant", back_populates="job", cascade="all, delete-orphan")
\ No newline at end of file
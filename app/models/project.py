@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, Text, JSON, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 from app.core.db import Base
 
@@ -10,7 +10,7 @@ class Project(Base):
     job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False, unique=True)
     title = Column(String(255), nullable=False)
     objective = Column(Text)
-    phases = Column(JSON)  # Stores the list of phase dictionaries
+    phases = deferred(Column(JSON))  # Stores the list of phase dictionaries (deferred)
 
     # Relationship
     job = relationship("Job", back_populates="project")
\ No newline at end of file
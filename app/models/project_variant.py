@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, ForeignKey, Index
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.db import Base
+from app.models.types import utc_now
+
+class ProjectVariant(Base):
+    __tablename__ = "project_variants"
+    __table_args__ = (
+        # Finding a job's oldest unassigned variant at candidate registration
+        Index("ix_project_variants_job_id_candidate_id", "job_id", "candidate_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
+    applicant_id = Column(String(16), nullable=False)  # Personalization seed passed to the project prompt
+    # Empty while the variant is being generated: the row reserves its place in the pool
+    title = Column(String(255), nullable=True)
+    objective = Column(Text)
+    phases = deferred(Column(JSON))  # Stores the list of phase dictionaries (deferred)
+    # Set once, atomically, when the variant is handed to a candidate
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id"), nullable=True, unique=True)
+    created_at = Column(DateTime(timezone=True), default=utc_now, server_default=func.now())
+    generated_at = Column(DateTime(timezone=True), nullable=True)  # NULL until the variant can be assigned
+    assigned_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Relationships
+    job = relationship("Job", back_populates="project_variants")
+    candidate = relationship("Candidate", back_populates="project_variant")
@@ -1,20 +1,34 @@
-from sqlalchemy import Column, Integer, Text, DateTime, JSON, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.core.db import Base
+from app.models.types import JSONVariant, utc_now
 
 class Submission(Base):
     __tablename__ = "submissions"
+    __table_args__ = (
+        # One submission per phase; evaluate_and_store_submission reserves the slot with it
+        UniqueConstraint("candidate_id", "phase_number", name="uq_submissions_candidate_id_phase_number"),
+        # JSONB containment queries on evaluation results on PostgreSQL
+        Index(
+            "ix_submissions_evaluation_gin", "evaluation",
+            postgresql_using="gin", postgresql_ops={"evaluation": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id"), nullable=False)
     phase_number = Column(Integer, nullable=False)
-    primary_submission = Column(Text, nullable=False)
-    secondary_submission = Column(Text, nullable=True)
+    # Large payloads are deferred: only loaded by queries that undefer them
+    primary_submission = deferred(Column(Text, nullable=False))
+    secondary_submission = deferred(Column(Text, nullable=True))
     submitted_at = Column(DateTime(timezone=True), server_default=func.now())
-    evaluation = Column(JSON, nullable=True)  # Stores the submission evaluation result
+    evaluation = deferred(Column(JSONVariant, nullable=True))  # Stores the submission evaluation result
+    # Bumped on every UPDATE; versions submission listings and rankings for conditional GETs.
+    # Set from Python so writes within the same second still change the version
+    updated_at = Column(DateTime(timezone=True), default=utc_now, onupdate=utc_now, server_default=func.now())
 
     # Relationship
     candidate = relationship("Candidate", back_populates="submissions")
\ No newline at end of file
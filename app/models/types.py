@@ -0,0 +1,23 @@
+"""
+Shared column types for the SQLAlchemy models.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
+
+# JSON payloads that are filtered in SQL: native JSONB on PostgreSQL (indexable with
+# GIN, supports containment), generic JSON (text) everywhere else
+JSONVariant = JSON().with_variant(JSONB(), "postgresql")
+
+
+def utc_now() -> datetime:
+    """
+    Python-side timestamp default at microsecond precision.
+
+    ``func.now()`` is stored with one-second resolution (and without a fraction) on
+    SQLite, which breaks ordering and comparisons on timestamps written in the same
+    second; columns used as keyset or version keys set their value from Python.
+    """
+    return datetime.now(timezone.utc)
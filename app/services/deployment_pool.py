@@ -0,0 +1,242 @@
+"""
+Azure OpenAI Deployment Pool
+
+Spreads model calls over several Azure OpenAI deployments (possibly on different
+endpoints or regions) configured with ``AZURE_OPENAI_DEPLOYMENTS``, e.g.::
+
+    [{"name": "east", "api_base": "https://east.openai.azure.com/", "weight": 2},
+     {"name": "west", "api_base": "https://west.openai.azure.com/", "api_key": "...",
+      "deployment": "gpt-4o"}]
+
+Omitted keys default to the single-deployment ``AZURE_OPENAI_*`` settings.
+
+Each call goes to the deployment with the fewest outstanding requests relative to
+its weight. Every deployment has a circuit breaker: after
+``OPENAI_BREAKER_FAILURE_THRESHOLD`` consecutive throttling (429), server (5xx) or
+connection errors it opens and receives no traffic for
+``OPENAI_BREAKER_RESET_TIMEOUT`` seconds. It then half-opens: the next call is sent
+there as a probe, which closes the breaker on success and re-opens it on failure.
+
+Usage:
+    pool = DeploymentPool.from_settings()
+    with pool.lease() as deployment:
+        deployment.async_client.chat.completions.create(model=deployment.deployment, ...)
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+import openai
+from openai import AsyncAzureOpenAI, AzureOpenAI
+
+from app.core import metrics
+from app.core.config import settings
+from app.services import openai_http
+
+# Errors that count against a deployment's circuit breaker
+BREAKER_ERRORS = (
+    openai.RateLimitError,
+    openai.InternalServerError,
+    openai.APIConnectionError,
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Values of the arya_llm_deployment_circuit_state gauge
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class DeploymentUnavailableError(Exception):
+    """Raised when every deployment of the pool has an open circuit breaker."""
+
+
+class Deployment:
+    """One Azure OpenAI deployment with its clients, load and breaker state."""
+
+    def __init__(self, name: str, api_base: str, api_key: str, deployment: str, weight: float = 1.0):
+        if weight <= 0:
+            raise ValueError(f"Deployment '{name}' must have a positive weight")
+        self.name = name
+        self.api_base = api_base
+        self.deployment = deployment
+        self.weight = weight
+        self.client = AzureOpenAI(
+            api_key=api_key,
+            api_version=settings.AZURE_OPENAI_API_VERSION,
+            azure_endpoint=api_base,
+            max_retries=0,
+            http_client=openai_http.get_http_client(),
+        )
+        self.async_client = AsyncAzureOpenAI(
+            api_key=api_key,
+            api_version=settings.AZURE_OPENAI_API_VERSION,
+            azure_endpoint=api_base,
+            max_retries=0,
+            http_client=openai_http.get_async_http_client(),
+        )
+
+        self.state = CLOSED
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.requests = 0
+        self.failures = 0
+
+    def status(self) -> dict:
+        return {
+            "name": self.name,
+            "deployment": self.deployment,
+            "weight": self.weight,
+            "state": self.state,
+            "outstanding": self.outstanding,
+            "consecutive_failures": self.consecutive_failures,
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+
+
+class DeploymentPool:
+    """Weighted least-outstanding-requests routing with per-deployment circuit breakers."""
+
+    def __init__(self, deployments: List[Deployment], failure_threshold: int, reset_timeout: float):
+        if not deployments:
+            raise ValueError("A deployment pool needs at least one deployment")
+        self.deployments = deployments
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        # Calls are made from the event loop and from worker threads (sync clients)
+        self._lock = threading.Lock()
+        for deployment in deployments:
+            self._export_state(deployment)
+
+    @classmethod
+    def from_settings(cls) -> Optional["DeploymentPool"]:
+        """Builds the pool from ``AZURE_OPENAI_DEPLOYMENTS``, or returns None when it is not set."""
+        if not settings.AZURE_OPENAI_DEPLOYMENTS.strip():
+            return None
+        try:
+            entries = json.loads(settings.AZURE_OPENAI_DEPLOYMENTS)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"AZURE_OPENAI_DEPLOYMENTS is not valid JSON: {e}")
+        if not isinstance(entries, list):
+            raise ValueError("AZURE_OPENAI_DEPLOYMENTS must be a JSON list of deployments")
+
+        deployments = []
+        for index, entry in enumerate(entries):
+            deployment = entry.get("deployment", settings.AZURE_OPENAI_DEPLOYMENT_NAME)
+            deployments.append(Deployment(
+                name=entry.get("name", f"{deployment}-{index}"),
+                api_base=entry.get("api_base", settings.AZURE_OPENAI_API_BASE),
+                api_key=entry.get("api_key", settings.AZURE_OPENAI_API_KEY),
+                deployment=deployment,
+                weight=float(entry.get("weight", 1.0)),
+            ))
+        return cls(deployments, settings.OPENAI_BREAKER_FAILURE_THRESHOLD, settings.OPENAI_BREAKER_RESET_TIMEOUT)
+
+    @contextmanager
+    def lease(self) -> Iterator[Deployment]:
+        """
+        Reserves a deployment for one call and records the call's outcome.
+
+        Raises:
+            DeploymentUnavailableError: If every circuit breaker is open
+        """
+        deployment, probe = self.acquire()
+        try:
+            yield deployment
+        except BREAKER_ERRORS:
+            self.release(deployment, "failure", probe)
+            raise
+        except Exception:
+            # The deployment answered; the request itself was rejected (e.g. 400)
+            self.release(deployment, "error", probe)
+            raise
+        except BaseException:
+            # Cancellation (e.g. a hedged call that lost) says nothing about the deployment
+            self.release(deployment, "cancelled", probe)
+            raise
+        self.release(deployment, "success", probe)
+
+    def acquire(self) -> Tuple[Deployment, bool]:
+        """
+        Picks the deployment for the next call and counts it as outstanding.
+
+        Returns:
+            The deployment, and whether the call is its half-open probe
+        """
+        with self._lock:
+            now = time.monotonic()
+            chosen = None
+            probe = False
+
+            # An open breaker past its timeout gets the next call as its probe
+            for deployment in self.deployments:
+                if deployment.state == OPEN and now - deployment.opened_at >= self.reset_timeout:
+                    self._set_state(deployment, HALF_OPEN)
+                if deployment.state == HALF_OPEN and not deployment.probe_in_flight:
+                    deployment.probe_in_flight = True
+                    chosen, probe = deployment, True
+                    break
+
+            if chosen is None:
+                available = [deployment for deployment in self.deployments if deployment.state == CLOSED]
+                if not available:
+                    raise DeploymentUnavailableError("All Azure OpenAI deployments have open circuit breakers")
+                # Fewest outstanding calls per unit of weight; ties go to the least used so far
+                chosen = min(available, key=lambda d: (d.outstanding / d.weight, d.requests / d.weight))
+
+            chosen.outstanding += 1
+            chosen.requests += 1
+            metrics.LLM_DEPLOYMENT_OUTSTANDING.labels(deployment=chosen.name).set(chosen.outstanding)
+            return chosen, probe
+
+    def release(self, deployment: Deployment, outcome: str, probe: bool = False) -> None:
+        """
+        Ends a call on ``deployment``.
+
+        Args:
+            outcome: "success", "error" (rejected request), "failure" (counts against
+                the circuit breaker) or "cancelled" (abandoned by the caller)
+            probe: Whether the call was the deployment's half-open probe
+        """
+        with self._lock:
+            deployment.outstanding -= 1
+            metrics.LLM_DEPLOYMENT_OUTSTANDING.labels(deployment=deployment.name).set(deployment.outstanding)
+            metrics.LLM_DEPLOYMENT_REQUESTS.labels(deployment=deployment.name, outcome=outcome).inc()
+
+            if probe:
+                deployment.probe_in_flight = False
+
+            if outcome == "cancelled":
+                # An abandoned probe proves nothing; the next call probes again
+                return
+            if outcome == "failure":
+                deployment.failures += 1
+                deployment.consecutive_failures += 1
+                if probe or (deployment.state == CLOSED and deployment.consecutive_failures >= self.failure_threshold):
+                    deployment.opened_at = time.monotonic()
+                    self._set_state(deployment, OPEN)
+            else:
+                deployment.consecutive_failures = 0
+                if probe:
+                    self._set_state(deployment, CLOSED)
+
+    def status(self) -> List[dict]:
+        """Health and load of every deployment, for the health endpoint."""
+        with self._lock:
+            return [deployment.status() for deployment in self.deployments]
+
+    def _set_state(self, deployment: Deployment, state: str) -> None:
+        if deployment.state != state:
+            deployment.state = state
+            metrics.LLM_CIRCUIT_TRANSITIONS.labels(deployment=deployment.name, state=state).inc()
+        self._export_state(deployment)
+
+    def _export_state(self, deployment: Deployment) -> None:
+        metrics.LLM_DEPLOYMENT_CIRCUIT_STATE.labels(deployment=deployment.name).set(_STATE_VALUES[deployment.state])
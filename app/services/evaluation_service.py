@@ -1,12 +1,28 @@
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, case, cast, delete, func, literal, select, tuple_, type_coerce, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload, undefer
+import asyncio
+import base64
+import binascii
+import json
+import logging
 import uuid
-from typing import List
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
 
+from app.services import prescreen_service
 from app.services.openai_service import openai_service
 from app import models
+from app.core.config import settings
+from app.core.db import dialect_insert
+from app.core.events import event_bus
+from app.models.types import utc_now
 from app.api.v1 import schemas
 
-def evaluate_candidate_cv(db: Session, candidate_id: uuid.UUID, cv_content: str) -> dict:
+logger = logging.getLogger(__name__)
+
+async def evaluate_candidate_cv(db: AsyncSession, candidate_id: uuid.UUID, cv_content: str) -> dict:
     """
     Evaluates a CV against job requirements, saves the result to the candidate, and returns it.
     
@@ -22,37 +38,126 @@ def evaluate_candidate_cv(db: Session, candidate_id: uuid.UUID, cv_content: str)
         ValueError: If candidate is not found
     """
     # 1. Fetch the candidate and their associated job with eager loading
-    candidate = db.query(models.Candidate).options(
-        joinedload(models.Candidate.job)
-    ).filter(models.Candidate.id == candidate_id).first()
+    candidate = (await db.scalars(
+        select(models.Candidate).options(
+            joinedload(models.Candidate.job)
+        ).where(models.Candidate.id == candidate_id)
+    )).first()
     
     if not candidate:
         raise ValueError(f"Candidate with ID {candidate_id} not found.")
 
     job = candidate.job
+
+    # End the read transaction so no pooled connection is held during the LLM call
+    await db.commit()
     
-    # 2. Call OpenAI service to evaluate the CV against job requirements
-    try:
-        cv_evaluation = openai_service.evaluate_cv(
-            cv_text=cv_content,
-            job_title=job.title,
-            tech_skills=job.tech_skills,
-            soft_skills=job.soft_skills,
-            industry=job.industry
-        )
-    except Exception as e:
-        raise ValueError(f"Failed to evaluate CV: {str(e)}")
+    # 2. Pre-screen: CVs covering too few of the job's skills skip the LLM
+    prescreen = prescreen_service.prescreen_cv(cv_content, job.tech_skills, job.soft_skills)
+    if not prescreen.passed:
+        logger.info(f"Candidate {candidate_id} screened out before LLM evaluation (coverage {prescreen.coverage:.2f})")
+        cv_evaluation = prescreen_service.screened_out_evaluation(prescreen)
+    else:
+        # Evaluate through the model cascade (fast score, full evaluation when borderline)
+        try:
+            cv_evaluation = await openai_service.evaluate_cv_cascade_async(
+                cv_text=cv_content,
+                job_title=job.title,
+                tech_skills=job.tech_skills,
+                soft_skills=job.soft_skills,
+                industry=job.industry
+            )
+        except Exception as e:
+            raise ValueError(f"Failed to evaluate CV: {str(e)}")
 
-    # 3. Save the evaluation to the candidate record
+        # The cascade's fast tier returns a score only; keep the pre-screen's skill evidence
+        if cv_evaluation.get("cascade_tier") == "fast":
+            cv_evaluation["skills_coverage"] = prescreen.matched_tech_skills + prescreen.matched_soft_skills
+            cv_evaluation["skills_gaps"] = prescreen.missing_tech_skills
+
+    # 3. Save the evaluation (and the CV text, for later re-scoring) to the candidate record
+    candidate.cv_text = cv_content
     candidate.cv_evaluation = cv_evaluation
-    db.commit()
-    db.refresh(candidate)
+    await db.commit()
+
+    # 4. Notify ranking streams of the new score
+    await publish_ranking_change(job.id, candidate.id)
 
     return cv_evaluation
 
-def evaluate_and_store_submission(db: Session, candidate_id: uuid.UUID, submission_data: schemas.SubmissionCreate) -> dict:
+def evaluate_candidate_cvs_bulk(db: Session, job_id: int, cv_contents: Dict[uuid.UUID, str]) -> Dict[uuid.UUID, dict]:
+    """
+    Evaluates many CVs for the same job with batched LLM calls and saves the results.
+    
+    Synchronous on purpose: bulk screening runs from scripts and CLI tools with
+    ``SessionLocal`` rather than from request handlers.
+    
+    Args:
+        db: Database session
+        job_id: ID of the job the candidates applied for
+        cv_contents: Mapping of candidate UUID to extracted CV text
+        
+    Returns:
+        Mapping of candidate UUID to CV evaluation results
+        
+    Raises:
+        ValueError: If the job or any of the candidates is not found
+    """
+    job = db.query(models.Job).filter(models.Job.id == job_id).first()
+    if not job:
+        raise ValueError(f"Job with ID {job_id} not found.")
+
+    candidates = db.query(models.Candidate).filter(
+        models.Candidate.job_id == job_id,
+        models.Candidate.id.in_(list(cv_contents.keys()))
+    ).all()
+    missing = set(cv_contents) - {candidate.id for candidate in candidates}
+    if missing:
+        raise ValueError(f"Candidates not found for job {job_id}: {', '.join(str(m) for m in missing)}")
+
+    # Pre-screen: CVs below the coverage threshold skip the LLM; the rest are
+    # evaluated best-covered first, so the strongest candidates are scored earliest
+    prescreens = {
+        candidate_id: prescreen_service.prescreen_cv(text, job.tech_skills, job.soft_skills)
+        for candidate_id, text in cv_contents.items()
+    }
+    evaluations = {
+        str(candidate_id): prescreen_service.screened_out_evaluation(result)
+        for candidate_id, result in prescreens.items() if not result.passed
+    }
+    to_evaluate = sorted(
+        (candidate_id for candidate_id, result in prescreens.items() if result.passed),
+        key=lambda candidate_id: prescreens[candidate_id].coverage,
+        reverse=True
+    )
+
+    if to_evaluate:
+        try:
+            evaluations.update(openai_service.evaluate_cv_batch(
+                cvs={str(candidate_id): cv_contents[candidate_id] for candidate_id in to_evaluate},
+                job_title=job.title,
+                tech_skills=job.tech_skills,
+                soft_skills=job.soft_skills,
+                industry=job.industry
+            ))
+        except Exception as e:
+            raise ValueError(f"Failed to evaluate CVs: {str(e)}")
+
+    for candidate in candidates:
+        candidate.cv_text = cv_contents[candidate.id]
+        candidate.cv_evaluation = evaluations[str(candidate.id)]
+    db.commit()
+
+    return {candidate.id: evaluations[str(candidate.id)] for candidate in candidates}
+
+async def evaluate_and_store_submission(db: AsyncSession, candidate_id: uuid.UUID, submission_data: schemas.SubmissionCreate) -> dict:
     """
     Evaluates a project submission, creates a submission record, and returns the evaluation.
+
+    The ``(candidate_id, phase_number)`` slot is reserved with a single INSERT before
+    the LLM call, so a concurrent duplicate submission is rejected without being
+    evaluated. The evaluation and the resulting candidate status are then written
+    in one transaction.
     
     Args:
         db: Database session
@@ -63,20 +168,23 @@ def evaluate_and_store_submission(db: Session, candidate_id: uuid.UUID, submissi
         Dictionary containing the submission evaluation results
         
     Raises:
-        ValueError: If candidate, project, or phase is not found
+        ValueError: If candidate, project, or phase is not found, or the phase was already submitted
     """
-    # 1. Fetch candidate with job and project relationships
-    candidate = db.query(models.Candidate).options(
-        joinedload(models.Candidate.job).joinedload(models.Job.project)
-    ).filter(models.Candidate.id == candidate_id).first()
+    # 1. Fetch candidate with their project variant, job and project relationships
+    candidate = (await db.scalars(
+        select(models.Candidate).options(
+            joinedload(models.Candidate.project_variant).undefer(models.ProjectVariant.phases),
+            joinedload(models.Candidate.job).joinedload(models.Job.project).undefer(models.Project.phases)
+        ).where(models.Candidate.id == candidate_id)
+    )).first()
     
     if not candidate:
         raise ValueError(f"Candidate with ID {candidate_id} not found.")
-    
-    if not candidate.job.project:
-        raise ValueError(f"No project assessment found for candidate {candidate_id}.")
 
-    project = candidate.job.project
+    # Candidates registered while the job's variant pool was empty work on the job's project
+    project = candidate.project_variant or candidate.job.project
+    if not project:
+        raise ValueError(f"No project assessment found for candidate {candidate_id}.")
     
     # 2. Find the specific phase details
     phase_details = next(
@@ -86,13 +194,12 @@ def evaluate_and_store_submission(db: Session, candidate_id: uuid.UUID, submissi
     if not phase_details:
         raise ValueError(f"Phase {submission_data.phase_number} not found in project assessment.")
     
-    # 3. Check if submission already exists for this phase
-    existing_submission = db.query(models.Submission).filter(
-        models.Submission.candidate_id == candidate_id,
-        models.Submission.phase_number == submission_data.phase_number
-    ).first()
-    
-    if existing_submission:
+    # 3. Reserve the phase slot; committing ends the read transaction before the LLM call
+    reserved_at = utc_now()
+    submission_id = await _reserve_submission_slot(db, candidate_id, submission_data, reserved_at)
+    await db.commit()
+
+    if submission_id is None:
         raise ValueError(f"Submission for phase {submission_data.phase_number} already exists for this candidate.")
         
     # 4. Combine primary and secondary submissions
@@ -100,34 +207,101 @@ def evaluate_and_store_submission(db: Session, candidate_id: uuid.UUID, submissi
     if submission_data.secondary_submission:
         combined_submission += f"\n\n# Secondary Submission\n{submission_data.secondary_submission}"
 
-    # 5. Call OpenAI service to evaluate the submission
+    # 5. Call OpenAI service to evaluate the submission, releasing the slot on failure
     try:
-        submission_evaluation = openai_service.evaluate_submission(
+        submission_evaluation = await openai_service.evaluate_submission_async(
             submission=combined_submission,
             phase_details=phase_details
         )
+    except asyncio.CancelledError:
+        # The client went away (see app.core.disconnect); free the slot for a retry
+        await _release_submission_slot(db, submission_id, reserved_at)
+        raise
     except Exception as e:
+        await _release_submission_slot(db, submission_id, reserved_at)
         raise ValueError(f"Failed to evaluate submission: {str(e)}")
 
-    # 6. Create and save the Submission record
-    new_submission = models.Submission(
-        candidate_id=candidate.id,
+    # 6. Store the evaluation and the candidate's new status in one transaction,
+    #    unless the reservation went stale and was taken over meanwhile
+    stored_id = await db.scalar(
+        update(models.Submission).where(
+            *_reservation_held(submission_id, reserved_at)
+        ).values(evaluation=submission_evaluation).returning(models.Submission.id)
+    )
+    if stored_id is None:
+        await db.rollback()
+        raise ValueError(f"Submission for phase {submission_data.phase_number} already exists for this candidate.")
+
+    await db.execute(
+        update(models.Candidate).where(
+            models.Candidate.id == candidate_id
+        ).values(status=_candidate_status_expression(candidate_id))
+    )
+    await db.commit()
+
+    # 7. Notify ranking streams of the new score
+    await publish_ranking_change(candidate.job_id, candidate_id)
+
+    return submission_evaluation
+
+async def _reserve_submission_slot(db: AsyncSession, candidate_id: uuid.UUID, submission_data: schemas.SubmissionCreate, reserved_at: datetime) -> Optional[int]:
+    """
+    Inserts the submission row without an evaluation, claiming its phase slot.
+
+    A conflicting row is only taken over when its evaluation never finished within
+    ``SUBMISSION_RESERVATION_TIMEOUT`` (e.g. the process died during the LLM call).
+    A takeover keeps the row's ID, so ``reserved_at`` (stored as ``submitted_at``)
+    identifies the reservation: only its holder may store or release it.
+    
+    Args:
+        db: Database session
+        candidate_id: UUID of the candidate
+        submission_data: Pydantic schema with submission details
+        reserved_at: Timestamp identifying this reservation
+        
+    Returns:
+        ID of the reserved submission, or None if the phase is already taken
+    """
+    stale_before = datetime.now(timezone.utc) - timedelta(seconds=settings.SUBMISSION_RESERVATION_TIMEOUT)
+
+    statement = dialect_insert(db)(models.Submission).values(
+        candidate_id=candidate_id,
         phase_number=submission_data.phase_number,
         primary_submission=submission_data.primary_submission,
         secondary_submission=submission_data.secondary_submission,
-        evaluation=submission_evaluation
+        submitted_at=reserved_at
     )
-    
-    db.add(new_submission)
-    db.commit()
-    db.refresh(new_submission)
+    statement = statement.on_conflict_do_update(
+        index_elements=[models.Submission.candidate_id, models.Submission.phase_number],
+        set_={
+            "primary_submission": statement.excluded.primary_submission,
+            "secondary_submission": statement.excluded.secondary_submission,
+            "submitted_at": reserved_at,
+            # ON CONFLICT DO UPDATE does not apply the column's Python onupdate
+            "updated_at": utc_now()
+        },
+        where=and_(
+            models.Submission.evaluation.is_(None),
+            models.Submission.submitted_at < stale_before
+        )
+    ).returning(models.Submission.id)
 
-    # 7. Update candidate status based on submission progress
-    _update_candidate_status(db, candidate)
+    return await db.scalar(statement)
 
-    return submission_evaluation
+def _reservation_held(submission_id: int, reserved_at: datetime) -> tuple:
+    """Conditions matching a submission row still reserved by (and only by) ``reserved_at``."""
+    return (
+        models.Submission.id == submission_id,
+        models.Submission.submitted_at == reserved_at,
+        models.Submission.evaluation.is_(None)
+    )
 
-def get_candidate_with_evaluations(db: Session, candidate_id: uuid.UUID) -> models.Candidate:
+async def _release_submission_slot(db: AsyncSession, submission_id: int, reserved_at: datetime) -> None:
+    """Deletes an unfinished reservation, unless another request has taken it over."""
+    await db.execute(delete(models.Submission).where(*_reservation_held(submission_id, reserved_at)))
+    await db.commit()
+
+async def get_candidate_with_evaluations(db: AsyncSession, candidate_id: uuid.UUID) -> models.Candidate:
     """
     Retrieves a candidate with all their evaluation data loaded.
     
@@ -136,53 +310,289 @@ def get_candidate_with_evaluations(db: Session, candidate_id: uuid.UUID) -> mode
         candidate_id: UUID of the candidate
         
     Returns:
-        Candidate model with job, submissions, and evaluations loaded
+        Candidate model with job, CV evaluation and submission evaluations loaded
+        (submission texts stay deferred)
         
     Raises:
         ValueError: If candidate is not found
     """
-    candidate = db.query(models.Candidate).options(
-        joinedload(models.Candidate.job).joinedload(models.Job.project),
-        joinedload(models.Candidate.submissions)
-    ).filter(models.Candidate.id == candidate_id).first()
+    # Submissions are a collection: load them with a separate IN query rather than
+    # joining them into the candidate/job row (avoids row multiplication)
+    candidate = (await db.scalars(
+        select(models.Candidate).options(
+            undefer(models.Candidate.cv_evaluation),
+            joinedload(models.Candidate.job),
+            selectinload(models.Candidate.submissions).undefer(models.Submission.evaluation)
+        ).where(models.Candidate.id == candidate_id)
+    )).first()
     
     if not candidate:
         raise ValueError(f"Candidate with ID {candidate_id} not found.")
     
     return candidate
 
-def rank_candidates_for_job(db: Session, job_id: int) -> List[dict]:
+async def get_submission_evaluations(db: AsyncSession, candidate_id: uuid.UUID) -> List[models.Submission]:
+    """
+    Retrieves a candidate's submissions ordered by phase, loading only what the
+    evaluation listing needs (phase, timestamp and evaluation; not the submission texts).
+    
+    Args:
+        db: Database session
+        candidate_id: UUID of the candidate
+        
+    Returns:
+        List of Submission models
+        
+    Raises:
+        ValueError: If candidate is not found
+    """
+    submissions = (await db.scalars(
+        select(models.Submission).options(
+            load_only(models.Submission.phase_number, models.Submission.submitted_at, models.Submission.evaluation)
+        ).where(
+            models.Submission.candidate_id == candidate_id,
+            models.Submission.evaluation.isnot(None)
+        ).order_by(models.Submission.phase_number)
+    )).all()
+
+    if not submissions:
+        candidate_exists = await db.scalar(select(models.Candidate.id).where(models.Candidate.id == candidate_id))
+        if candidate_exists is None:
+            raise ValueError(f"Candidate with ID {candidate_id} not found.")
+
+    return list(submissions)
+
+async def get_submission_evaluations_version(db: AsyncSession, candidate_id: uuid.UUID) -> Tuple[int, Optional[datetime]]:
+    """
+    Retrieves what versions a candidate's submission evaluations for conditional GETs.
+    
+    Args:
+        db: Database session
+        candidate_id: UUID of the candidate
+        
+    Returns:
+        Tuple of (number of evaluated submissions, latest update time)
+    """
+    count, last_updated = (await db.execute(
+        select(func.count(models.Submission.id), func.max(models.Submission.updated_at)).where(
+            models.Submission.candidate_id == candidate_id,
+            models.Submission.evaluation.isnot(None)
+        )
+    )).one()
+    return count, last_updated
+
+# Columns a candidate listing may return; ``id`` and ``created_at`` are always selected
+# because they form the pagination key
+CANDIDATE_LIST_FIELDS = {
+    "name": models.Candidate.name,
+    "email": models.Candidate.email,
+    "status": models.Candidate.status,
+    "match_score": models.Candidate.cv_evaluation["match_score"].as_float(),
+    "cv_evaluation": models.Candidate.cv_evaluation,
+}
+DEFAULT_CANDIDATE_LIST_FIELDS = ("name", "email", "status", "match_score")
+
+def encode_candidate_cursor(created_at: datetime, candidate_id: uuid.UUID) -> str:
+    """Encodes a ``(created_at, id)`` keyset position as an opaque URL-safe cursor."""
+    raw = json.dumps([created_at.isoformat(), str(candidate_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_candidate_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """
+    Decodes a cursor produced by ``encode_candidate_cursor``.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, candidate_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), uuid.UUID(candidate_id)
+    except (binascii.Error, json.JSONDecodeError, TypeError, ValueError):
+        raise ValueError("Invalid pagination cursor.")
+
+def _json_array_contains(dialect_name: str, column, key: str, value: str):
+    """
+    SQL condition: the JSON array stored under ``key`` contains ``value`` (exact match).
+    
+    On PostgreSQL this is a JSONB containment test (``@>``) served by the GIN index;
+    elsewhere the array is expanded with SQLite's ``json_each``.
+    """
+    if dialect_name == "postgresql":
+        # The column is declared as a JSON variant; coerce to JSONB for the @> operator
+        return type_coerce(column, JSONB).contains({key: [value]})
+    elements = func.json_each(column, f"$.{key}").table_valued("value")
+    return select(elements.c.value).where(elements.c.value == value).exists()
+
+def _json_array_not_empty(dialect_name: str, column, key: str):
+    """SQL condition: the value stored under ``key`` is a non-empty JSON array."""
+    if dialect_name == "postgresql":
+        element = type_coerce(column, JSONB)[key]
+        return and_(func.jsonb_typeof(element) == "array", element != cast(literal("[]"), JSONB))
+    return func.json_array_length(column, f"$.{key}") > 0
+
+async def list_candidates_for_job(
+    db: AsyncSession,
+    job_id: int,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    skills: Sequence[str] = (),
+    skills_gaps: Sequence[str] = (),
+    has_red_flags: Optional[bool] = None,
+    fields: Sequence[str] = DEFAULT_CANDIDATE_LIST_FIELDS,
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Lists (and searches) a job's candidates, newest first, using keyset pagination
+    on ``(created_at, id)``.
+    
+    Only the requested columns are selected, so large ``cv_evaluation`` payloads are
+    never read unless ``fields`` asks for them. Page cost does not depend on how deep
+    into the listing the cursor points. All filters, including those on the JSON
+    evaluation payloads, are evaluated by the database.
+    
+    Args:
+        db: Database session
+        job_id: ID of the job
+        limit: Maximum number of candidates to return
+        cursor: Opaque cursor from a previous page (``None`` for the first page)
+        status: Only candidates with this status
+        min_score: Only candidates whose CV match score is at least this value
+        max_score: Only candidates whose CV match score is at most this value
+        skills: Only candidates whose CV evaluation covers all of these skills
+        skills_gaps: Only candidates whose CV evaluation lists all of these skills as gaps
+        has_red_flags: Only candidates with (True) or without (False) a submission
+            evaluation reporting red flags
+        fields: Columns to return in addition to ``id`` and ``created_at``
+        
+    Returns:
+        Tuple of (candidate dictionaries, cursor for the next page or ``None``)
+        
+    Raises:
+        ValueError: If the job is not found, or a field or the cursor is invalid
+    """
+    unknown = set(fields) - set(CANDIDATE_LIST_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}.")
+
+    candidate = models.Candidate
+    query = select(
+        candidate.id,
+        candidate.created_at,
+        *(CANDIDATE_LIST_FIELDS[name].label(name) for name in fields)
+    ).where(candidate.job_id == job_id)
+
+    if status is not None:
+        query = query.where(candidate.status == status)
+    if min_score is not None:
+        query = query.where(CANDIDATE_LIST_FIELDS["match_score"] >= min_score)
+    if max_score is not None:
+        query = query.where(CANDIDATE_LIST_FIELDS["match_score"] <= max_score)
+    dialect_name = db.bind.dialect.name
+    for skill in skills:
+        query = query.where(_json_array_contains(dialect_name, candidate.cv_evaluation, "skills_coverage", skill))
+    for skill in skills_gaps:
+        query = query.where(_json_array_contains(dialect_name, candidate.cv_evaluation, "skills_gaps", skill))
+    if has_red_flags is not None:
+        flagged = select(models.Submission.id).where(
+            models.Submission.candidate_id == candidate.id,
+            _json_array_not_empty(dialect_name, models.Submission.evaluation, "red_flags")
+        ).exists()
+        query = query.where(flagged if has_red_flags else ~flagged)
+    if cursor is not None:
+        query = query.where(tuple_(candidate.created_at, candidate.id) < decode_candidate_cursor(cursor))
+
+    # Fetch one extra row to learn whether another page exists
+    query = query.order_by(candidate.created_at.desc(), candidate.id.desc()).limit(limit + 1)
+    rows = (await db.execute(query)).mappings().all()
+
+    if not rows and cursor is None:
+        job_exists = await db.scalar(select(models.Job.id).where(models.Job.id == job_id))
+        if job_exists is None:
+            raise ValueError(f"Job with ID {job_id} not found.")
+
+    items = [dict(row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_candidate_cursor(last["created_at"], last["id"])
+    return items, next_cursor
+
+async def get_rankings_version(db: AsyncSession, job_id: int) -> Optional[Tuple[int, Optional[datetime], int, Optional[datetime]]]:
+    """
+    Retrieves what versions a job's rankings for conditional GETs, in one query:
+    the candidate and submission counts and their latest update times.
+    
+    Args:
+        db: Database session
+        job_id: ID of the job
+        
+    Returns:
+        Tuple of (candidate count, latest candidate update, submission count,
+        latest submission update), or None if the job does not exist
+    """
+    job_candidates = models.Candidate.job_id == job_id
+
+    version = (await db.execute(
+        select(
+            select(func.count(models.Candidate.id)).where(job_candidates).scalar_subquery(),
+            select(func.max(models.Candidate.updated_at)).where(job_candidates).scalar_subquery(),
+            select(func.count(models.Submission.id)).join(models.Candidate).where(job_candidates).scalar_subquery(),
+            select(func.max(models.Submission.updated_at)).join(models.Candidate).where(job_candidates).scalar_subquery()
+        ).where(models.Job.id == job_id)
+    )).first()
+    return tuple(version) if version else None
+
+async def rank_candidates_for_job(db: AsyncSession, job_id: int, include_ids: bool = False) -> List[dict]:
     """
     Ranks all candidates for a specific job based on their CV and submission evaluations.
     
     Args:
         db: Database session
         job_id: ID of the job to rank candidates for
+        include_ids: Add each candidate's ID (as a string) under ``candidate_id``
         
     Returns:
         List of candidate ranking dictionaries sorted by final score
     """
-    # Fetch all candidates for the job with their evaluations
-    candidates = db.query(models.Candidate).options(
-        joinedload(models.Candidate.submissions)
-    ).filter(models.Candidate.job_id == job_id).all()
+    # Fetch only the scores, extracted from the JSON evaluations in SQL,
+    # instead of loading the full evaluation payloads
+    candidates = (await db.execute(
+        select(
+            models.Candidate.id,
+            models.Candidate.name,
+            models.Candidate.cv_evaluation["match_score"].as_float().label("cv_score")
+        ).where(
+            models.Candidate.job_id == job_id
+        ).order_by(models.Candidate.created_at, models.Candidate.id)  # Stable ranks for equal scores
+    )).all()
     
     if not candidates:
         return []
+
+    scores_by_candidate: Dict[uuid.UUID, List[float]] = {}
+    submission_rows = await db.execute(
+        select(
+            models.Submission.candidate_id,
+            func.coalesce(models.Submission.evaluation["overall_score"].as_float(), 0)
+        ).join(models.Candidate).where(
+            models.Candidate.job_id == job_id,
+            models.Submission.evaluation.isnot(None)
+        )
+    )
+    for candidate_id, score in submission_rows:
+        scores_by_candidate.setdefault(candidate_id, []).append(score)
     
     rankings = []
     
     for candidate in candidates:
         # Calculate CV score
-        cv_score = 0
-        if candidate.cv_evaluation:
-            cv_score = candidate.cv_evaluation.get('match_score', 0)
+        cv_score = candidate.cv_score or 0
         
         # Calculate average submission score
-        submission_scores = []
-        for submission in candidate.submissions:
-            if submission.evaluation:
-                submission_scores.append(submission.evaluation.get('overall_score', 0))
+        submission_scores = scores_by_candidate.get(candidate.id, [])
         
         avg_submission_score = sum(submission_scores) / len(submission_scores) if submission_scores else 0
         
@@ -204,38 +614,70 @@ def rank_candidates_for_job(db: Session, job_id: int) -> List[dict]:
         else:
             performance_level = "Below expectations - Not recommended"
         
-        rankings.append({
+        # Values carry the exact types of schemas.CandidateRankingDetail, because the
+        # rankings endpoint serializes them without re-validation
+        ranking = {
             "candidate_name": candidate.name,
-            "final_score": round(final_score, 1),
+            "final_score": round(float(final_score), 1),
             "performance_level": performance_level,
-            "cv_score": cv_score,
-            "average_project_score": round(avg_submission_score, 1)
-        })
+            "cv_score": int(cv_score),
+            "average_project_score": round(float(avg_submission_score), 1)
+        }
+        if include_ids:
+            ranking = {"candidate_id": str(candidate.id), **ranking}
+        rankings.append(ranking)
     
     # Sort by final score (descending) and assign ranks
     rankings.sort(key=lambda x: x["final_score"], reverse=True)
-    for i, ranking in enumerate(rankings):
-        ranking["rank"] = i + 1
     
-    return rankings
+    # Rank first, matching the field order of the response schema
+    return [{"rank": i + 1, **ranking} for i, ranking in enumerate(rankings)]
+
+def rankings_topic(job_id: int) -> str:
+    """Event bus topic announcing changes to a job's rankings."""
+    return f"rankings:job:{job_id}"
 
-def _update_candidate_status(db: Session, candidate: models.Candidate) -> None:
+async def publish_ranking_change(job_id: int, candidate_id: uuid.UUID) -> None:
     """
-    Updates candidate status based on their submission progress.
+    Notifies ranking streams that a candidate's scores for a job changed.
     
     Args:
-        db: Database session
-        candidate: Candidate model instance
+        job_id: ID of the job whose rankings changed
+        candidate_id: UUID of the candidate whose scores changed
+    """
+    await event_bus.publish(rankings_topic(job_id), {"candidate_id": str(candidate_id)})
+
+def diff_rankings(previous: Dict[str, dict], current: Dict[str, dict]) -> Tuple[List[dict], List[str]]:
     """
-    submission_count = len(candidate.submissions)
+    Compares two ranking snapshots keyed by candidate ID.
     
-    if submission_count == 0:
-        candidate.status = "Applied"
-    elif submission_count == 1:
-        candidate.status = "Phase 1 Complete"
-    elif submission_count == 2:
-        candidate.status = "Phase 2 Complete"
-    elif submission_count >= 3:
-        candidate.status = "Assessment Complete"
+    Args:
+        previous: Rankings last sent to a client
+        current: Freshly computed rankings
+        
+    Returns:
+        Tuple of (new or changed ranking entries, IDs of candidates no longer ranked)
+    """
+    changed = [ranking for candidate_id, ranking in current.items() if previous.get(candidate_id) != ranking]
+    removed = [candidate_id for candidate_id in previous if candidate_id not in current]
+    return changed, removed
+
+def _candidate_status_expression(candidate_id: uuid.UUID):
+    """
+    Builds the SQL expression for a candidate's status from their evaluated submissions,
+    so the status can be set in the same UPDATE that stores it.
     
-    db.commit()
\ No newline at end of file
+    Args:
+        candidate_id: UUID of the candidate
+    """
+    evaluated_count = select(func.count(models.Submission.id)).where(
+        models.Submission.candidate_id == candidate_id,
+        models.Submission.evaluation.isnot(None)
+    ).scalar_subquery()
+
+    return case(
+        (evaluated_count == 0, "Applied"),
+        (evaluated_count == 1, "Phase 1 Complete"),
+        (evaluated_count == 2, "Phase 2 Complete"),
+        else_="Assessment Complete"
+    )
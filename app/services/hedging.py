@@ -0,0 +1,138 @@
+"""
+Request Hedging
+
+Cuts the latency tail of interactive model calls. For the methods listed in
+``OPENAI_HEDGE_METHODS``, a call still running after the ``OPENAI_HEDGE_PERCENTILE``
+latency of that method's recent successful calls gets a duplicate; the first
+attempt that returns a valid (parsed) result wins and the other is cancelled.
+With a deployment pool the duplicate normally lands on another deployment, since
+the slow call still counts as outstanding on its own.
+
+Hedges are capped at ``OPENAI_HEDGE_MAX_RATE`` of recent calls per method, so a
+general slowdown cannot double the token spend, and are not sent before
+``OPENAI_HEDGE_MIN_DELAY`` seconds or before enough latency samples exist.
+
+Usage:
+    policy = HedgePolicy.from_settings()
+    result = await policy.run("evaluate_submission", attempt)
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Latency samples a method needs before its calls are hedged
+MIN_SAMPLES = 20
+
+
+class HedgePolicy:
+    """Per-method latency windows and hedge budget."""
+
+    def __init__(self, methods, percentile: float, max_rate: float, min_delay: float, window: int):
+        self.methods = set(methods)
+        self.percentile = percentile
+        self.max_rate = max_rate
+        self.min_delay = min_delay
+        self.window = window
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._hedged: Dict[str, Deque[bool]] = {}
+
+    @classmethod
+    def from_settings(cls) -> "HedgePolicy":
+        methods = [method.strip() for method in settings.OPENAI_HEDGE_METHODS.split(",") if method.strip()]
+        return cls(
+            methods,
+            percentile=settings.OPENAI_HEDGE_PERCENTILE,
+            max_rate=settings.OPENAI_HEDGE_MAX_RATE,
+            min_delay=settings.OPENAI_HEDGE_MIN_DELAY,
+            window=settings.OPENAI_HEDGE_WINDOW,
+        )
+
+    def observe(self, method: str, duration: float) -> None:
+        """Records the latency of a successful attempt."""
+        self._latencies.setdefault(method, deque(maxlen=self.window)).append(duration)
+
+    def hedge_delay(self, method: str) -> Optional[float]:
+        """Seconds after which a call is hedged, or None while hedging is off for ``method``."""
+        latencies = self._latencies.get(method)
+        if method not in self.methods or latencies is None or len(latencies) < MIN_SAMPLES:
+            return None
+        ordered = sorted(latencies)
+        return max(self.min_delay, ordered[int(self.percentile * (len(ordered) - 1))])
+
+    def _record_decision(self, method: str, hedged: bool) -> None:
+        self._hedged.setdefault(method, deque(maxlen=self.window)).append(hedged)
+
+    def _within_budget(self, method: str) -> bool:
+        decisions = self._hedged.get(method, ())
+        return (sum(decisions) + 1) / (len(decisions) + 1) <= self.max_rate
+
+    async def run(self, method: str, attempt: Callable[[], Awaitable[T]]) -> T:
+        """
+        Runs ``attempt`` and, when it is slow and the budget allows, a duplicate of it.
+
+        Args:
+            method: Public method name the policy and metrics are keyed on
+            attempt: Makes one complete call, including parsing; raising means the
+                attempt produced no usable result
+
+        Returns:
+            The result of the first attempt to succeed
+
+        Raises:
+            The primary attempt's error when no attempt succeeds
+        """
+        async def timed() -> T:
+            start = time.perf_counter()
+            result = await attempt()
+            self.observe(method, time.perf_counter() - start)
+            return result
+
+        delay = self.hedge_delay(method)
+        if delay is None:
+            return await timed()
+
+        primary = asyncio.ensure_future(timed())
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done:
+                self._record_decision(method, False)
+                return primary.result()
+            if not self._within_budget(method):
+                metrics.LLM_HEDGES_SUPPRESSED.labels(method=method).inc()
+                self._record_decision(method, False)
+                await asyncio.wait(pending)
+                return primary.result()
+
+            self._record_decision(method, True)
+            metrics.LLM_HEDGES.labels(method=method).inc()
+            logger.info(f"Hedging {method} call still running after {delay:.1f}s")
+            hedge = asyncio.ensure_future(timed())
+            pending.add(hedge)
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        metrics.LLM_HEDGE_WINS.labels(method=method, winner="hedge" if task is hedge else "primary").inc()
+                        return task.result()
+            # Both attempts failed
+            return primary.result()
+        finally:
+            # The losing attempt, or everything when the caller itself is cancelled.
+            # Awaiting the cancelled tasks lets them release their connection (and
+            # retrieves their errors) before the winner is handed back.
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
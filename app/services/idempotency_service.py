@@ -0,0 +1,184 @@
+"""
+Idempotency-Key Support
+
+Clients may send an ``Idempotency-Key`` header with requests that trigger an LLM
+evaluation. The first request with a key claims it in the ``idempotency_keys``
+table and stores its response once it succeeds. A retry with the same key then
+either waits for the in-flight original or replays the stored response, instead
+of paying for a second evaluation.
+
+Failed requests release their key, so the client can retry them.
+"""
+
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, null, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.core.config import settings
+from app.core.db import dialect_insert
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks while waiting for an in-flight request with the same key
+_POLL_INTERVAL = 0.5
+
+
+class IdempotencyConflict(Exception):
+    """Raised when a keyed request cannot be processed or replayed."""
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def fingerprint(payload: bytes) -> str:
+    """Returns the SHA-256 hex digest identifying a request payload."""
+    return hashlib.sha256(payload).hexdigest()
+
+
+async def run_idempotent(
+    db: AsyncSession,
+    key: Optional[str],
+    scope: str,
+    payload: bytes,
+    work: Callable[[], Awaitable[Any]]
+) -> Tuple[Any, bool]:
+    """
+    Runs ``work`` at most once per ``(scope, key)`` and stores its JSON result.
+
+    Args:
+        db: Database session
+        key: Value of the Idempotency-Key header; None runs ``work`` unconditionally
+        scope: Endpoint and resource the key applies to, e.g. ``POST /candidates/<id>/cv``
+        payload: Raw request payload, used to detect a key reused for a different request
+        work: Coroutine function producing the response body
+
+    Returns:
+        Tuple of (response body, True if it was replayed from an earlier request)
+
+    Raises:
+        IdempotencyConflict: If the key was used for a different payload (422), or the
+            original request is still running after ``IDEMPOTENCY_WAIT_TIMEOUT`` (409)
+    """
+    if key is None:
+        return await work(), False
+
+    request_fingerprint = fingerprint(payload)
+    replay = await _claim_or_wait(db, key, scope, request_fingerprint)
+    if replay is not None:
+        logger.info(f"Replaying stored response for Idempotency-Key {key!r} on {scope}")
+        return replay, True
+
+    try:
+        result = await work()
+    except Exception:
+        await db.rollback()
+        await db.execute(delete(models.IdempotencyKey).where(
+            models.IdempotencyKey.scope == scope,
+            models.IdempotencyKey.key == key,
+            models.IdempotencyKey.fingerprint == request_fingerprint,
+            models.IdempotencyKey.status == "in_progress"
+        ))
+        await db.commit()
+        raise
+
+    await db.execute(update(models.IdempotencyKey).where(
+        models.IdempotencyKey.scope == scope,
+        models.IdempotencyKey.key == key
+    ).values(status="completed", response_body=result, completed_at=func.now()))
+    await db.commit()
+    return result, False
+
+
+async def _claim_or_wait(db: AsyncSession, key: str, scope: str, request_fingerprint: str) -> Optional[Any]:
+    """
+    Claims the key, or waits for the request that holds it.
+
+    Returns:
+        The stored response body of a completed request, or None once the key is claimed
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+
+    while True:
+        if await _claim(db, key, scope, request_fingerprint):
+            return None
+
+        record = (await db.execute(
+            select(
+                models.IdempotencyKey.fingerprint,
+                models.IdempotencyKey.status,
+                models.IdempotencyKey.response_body
+            ).where(
+                models.IdempotencyKey.scope == scope,
+                models.IdempotencyKey.key == key
+            )
+        )).first()
+        # End the read transaction so no connection is held while waiting
+        await db.commit()
+
+        if record is None:
+            # Released by a failed request in the meantime; try to claim it again
+            continue
+        if record.fingerprint != request_fingerprint:
+            raise IdempotencyConflict(
+                "This Idempotency-Key was already used for a different request.",
+                status_code=422
+            )
+        if record.status == "completed":
+            return record.response_body
+        if loop.time() >= deadline:
+            raise IdempotencyConflict(
+                "A request with this Idempotency-Key is still being processed. Retry later.",
+                status_code=409
+            )
+
+        await asyncio.sleep(_POLL_INTERVAL)
+
+
+async def _claim(db: AsyncSession, key: str, scope: str, request_fingerprint: str) -> bool:
+    """
+    Inserts the key as in progress in one statement. An existing record is only taken
+    over when it was abandoned (in progress past ``IDEMPOTENCY_LOCK_TIMEOUT``) or its
+    stored response expired (older than ``IDEMPOTENCY_TTL``).
+
+    Returns:
+        True if this request now holds the key
+    """
+    now = datetime.now(timezone.utc)
+    abandoned_before = now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT)
+    expired_before = now - timedelta(seconds=settings.IDEMPOTENCY_TTL)
+
+    statement = dialect_insert(db)(models.IdempotencyKey).values(
+        scope=scope,
+        key=key,
+        fingerprint=request_fingerprint,
+        status="in_progress"
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[models.IdempotencyKey.scope, models.IdempotencyKey.key],
+        set_={
+            "fingerprint": statement.excluded.fingerprint,
+            "status": "in_progress",
+            "response_body": null(),
+            "created_at": func.now(),
+            "completed_at": null()
+        },
+        where=or_(
+            and_(
+                models.IdempotencyKey.status == "in_progress",
+                models.IdempotencyKey.created_at < abandoned_before
+            ),
+            models.IdempotencyKey.created_at < expired_before
+        )
+    ).returning(models.IdempotencyKey.key)
+
+    claimed = await db.scalar(statement)
+    await db.commit()
+    return claimed is not None
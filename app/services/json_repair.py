@@ -0,0 +1,147 @@
+"""
+Tolerant JSON Parsing
+
+Recovers JSON objects from model output that ``json.loads`` rejects:
+
+- Markdown code fences and prose around the object
+- Trailing commas before ``}`` / ``]``
+- Truncation (finish_reason ``length``): the text is cut back to the last complete
+  value and the open strings, arrays and objects are closed, so every field that
+  was fully generated survives
+
+Usage:
+    data, repaired = repair_json(response.choices[0].message.content)
+    missing = invalid_fields(schemas.CVEvaluationResponse, data)
+"""
+
+import json
+import re
+from typing import List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+_CODE_FENCE = re.compile(r"```(?:json)?\s*(.*?)\s*(?:```|$)", re.DOTALL | re.IGNORECASE)
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def repair_json(text: str) -> Tuple[Optional[dict], bool]:
+    """
+    Parses a JSON object, repairing common defects when plain parsing fails.
+
+    Args:
+        text: Raw completion content
+
+    Returns:
+        Tuple of (parsed object or None if nothing could be recovered, whether
+        repairs were needed)
+    """
+    if text is None:
+        return None, False
+    try:
+        data = json.loads(text)
+        return (data, False) if isinstance(data, dict) else (None, False)
+    except json.JSONDecodeError:
+        pass
+
+    fenced = _CODE_FENCE.search(text)
+    if fenced:
+        text = fenced.group(1)
+    start = text.find("{")
+    if start < 0:
+        return None, True
+    text = _strip_trailing_commas(text[start:])
+
+    # Complete objects with prose after them
+    try:
+        data, _ = json.JSONDecoder().raw_decode(text)
+        return (data, True) if isinstance(data, dict) else (None, True)
+    except json.JSONDecodeError:
+        pass
+
+    try:
+        data = json.loads(_strip_trailing_commas(_close_truncated(text)))
+    except json.JSONDecodeError:
+        return None, True
+    # An object cut back to nothing recovered nothing
+    return (data, True) if isinstance(data, dict) and data else (None, True)
+
+
+def invalid_fields(model: Type[BaseModel], data: dict) -> List[str]:
+    """Top-level fields of ``data`` that are missing or fail validation against ``model``."""
+    try:
+        model.model_validate(data)
+    except ValidationError as e:
+        return sorted({str(error["loc"][0]) for error in e.errors() if error["loc"]})
+    return []
+
+
+def _strip_trailing_commas(text: str) -> str:
+    """Removes commas directly followed by a closing bracket, outside of strings."""
+    out: List[str] = []
+    in_string = escaped = False
+    for index, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == ",":
+            rest = text[index + 1:].lstrip()
+            if rest[:1] in ("}", "]"):
+                continue
+        out.append(char)
+    return "".join(out)
+
+
+def _close_truncated(text: str) -> str:
+    """
+    Cuts truncated JSON back to its last complete value and closes what is open.
+
+    Cuts are made after an opening bracket, the closing quote of a string value or a
+    closing bracket, or right before a comma; keys and half-written values after that
+    point (including numbers, which may be incomplete) are dropped.
+    """
+    stack: List[str] = []
+    expecting_key: List[bool] = []
+    in_string = escaped = string_is_key = False
+    cut, cut_stack = 0, []
+
+    for index, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+                if not string_is_key:
+                    cut, cut_stack = index + 1, list(stack)
+            continue
+
+        if char == '"':
+            in_string = True
+            string_is_key = bool(stack) and stack[-1] == "{" and expecting_key[-1]
+        elif char in "{[":
+            stack.append(char)
+            expecting_key.append(char == "{")
+            cut, cut_stack = index + 1, list(stack)
+        elif char in "}]":
+            if stack:
+                stack.pop()
+                expecting_key.pop()
+            cut, cut_stack = index + 1, list(stack)
+        elif char == ",":
+            cut, cut_stack = index, list(stack)
+            if stack and stack[-1] == "{":
+                expecting_key[-1] = True
+        elif char == ":":
+            if stack and stack[-1] == "{":
+                expecting_key[-1] = False
+
+    if not in_string and not stack:
+        return text
+    return text[:cut] + "".join(_CLOSERS[opener] for opener in reversed(cut_stack))
@@ -0,0 +1,146 @@
+"""
+LLM Record / Replay
+
+Captures real model responses so performance problems and parsing regressions
+(``generate_project_dict`` regexes, evaluation JSON) can be reproduced without
+calling Azure OpenAI.
+
+- ``LLM_CASSETTE_MODE=record``: every successful completion is stored with its
+  usage and latency, keyed by a hash of the prompt
+- ``LLM_CASSETTE_MODE=replay``: completions are served from the store after the
+  recorded latency times ``LLM_CASSETTE_LATENCY_SCALE`` (0 answers immediately);
+  a prompt that was never recorded raises ``CassetteMissError``, or with
+  ``LLM_CASSETTE_MATCH=method`` gets some recording of the same method (prompts
+  such as ``generate_project_dict`` embed a random applicant id and never repeat)
+
+The store is a single SQLite file (``LLM_CASSETTE_PATH``) with zlib-compressed
+response bodies, so a day of traffic can be copied to one box and replayed
+against a new build with its original latency profile.
+
+The key covers the messages, temperature and response format, but not the
+deployment name or ``max_tokens``, so recordings stay valid when those change.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from openai.types.chat import ChatCompletion
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Request parameters that identify a recorded response
+_KEY_FIELDS = ("messages", "temperature", "response_format")
+
+
+class CassetteMissError(Exception):
+    """Raised in replay mode for a prompt that was never recorded."""
+
+
+def request_key(request: dict) -> str:
+    """Hash identifying a chat completion request in the store."""
+    identity = {field: request.get(field) for field in _KEY_FIELDS}
+    return hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class Cassette:
+    """SQLite-backed store of recorded chat completions."""
+
+    def __init__(self, mode: str, path: str, latency_scale: float = 1.0, match: str = "exact"):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown LLM_CASSETTE_MODE '{mode}' (expected off, record or replay)")
+        if match not in ("exact", "method"):
+            raise ValueError(f"Unknown LLM_CASSETTE_MATCH '{match}' (expected exact or method)")
+        self.mode = mode
+        self.path = path
+        self.latency_scale = latency_scale
+        self.match = match
+        # Used from the event loop and from worker threads (sync calls)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, method TEXT NOT NULL, latency REAL NOT NULL,"
+            " prompt_tokens INTEGER, completion_tokens INTEGER,"
+            " response BLOB NOT NULL, recorded_at TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def from_settings(cls) -> Optional["Cassette"]:
+        """Opens the store selected by ``LLM_CASSETTE_MODE``, or returns None when it is off."""
+        mode = settings.LLM_CASSETTE_MODE.lower()
+        if mode == "off":
+            return None
+        logger.info(f"LLM cassette in {mode} mode ({settings.LLM_CASSETTE_PATH})")
+        return cls(mode, settings.LLM_CASSETTE_PATH, settings.LLM_CASSETTE_LATENCY_SCALE, settings.LLM_CASSETTE_MATCH.lower())
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def record(self, method: str, request: dict, response, latency: float) -> None:
+        """Stores a completion; the latest recording of a prompt wins."""
+        if not isinstance(response, ChatCompletion):
+            return
+        body = zlib.compress(response.model_dump_json().encode())
+        usage = response.usage
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    request_key(request), method, latency,
+                    usage.prompt_tokens if usage else None,
+                    usage.completion_tokens if usage else None,
+                    body, datetime.now(timezone.utc).isoformat(),
+                )
+            )
+            self._conn.commit()
+        metrics.LLM_CASSETTE_EVENTS.labels(method=method, event="recorded").inc()
+
+    def lookup(self, method: str, request: dict) -> Tuple[ChatCompletion, float]:
+        """
+        Returns the recorded completion for a request and the delay to serve it after.
+
+        Raises:
+            CassetteMissError: If the prompt was never recorded (and, with method
+                matching, neither was any prompt of ``method``)
+        """
+        key = request_key(request)
+        event = "replayed"
+        with self._lock:
+            row = self._conn.execute("SELECT response, latency FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None and self.match == "method":
+                # Same prompt -> same substitute, so replays stay deterministic
+                count = self._conn.execute("SELECT COUNT(*) FROM responses WHERE method = ?", (method,)).fetchone()[0]
+                if count:
+                    row = self._conn.execute(
+                        "SELECT response, latency FROM responses WHERE method = ? ORDER BY key LIMIT 1 OFFSET ?",
+                        (method, int(key, 16) % count)
+                    ).fetchone()
+                    event = "substituted"
+        if row is None:
+            metrics.LLM_CASSETTE_EVENTS.labels(method=method, event="miss").inc()
+            raise CassetteMissError(f"No recorded response for this {method} prompt in {self.path}")
+        metrics.LLM_CASSETTE_EVENTS.labels(method=method, event=event).inc()
+        return ChatCompletion.model_validate_json(zlib.decompress(row[0])), row[1] * self.latency_scale
+
+    def replay(self, method: str, request: dict) -> ChatCompletion:
+        response, delay = self.lookup(method, request)
+        time.sleep(delay)
+        return response
+
+    async def replay_async(self, method: str, request: dict) -> ChatCompletion:
+        response, delay = self.lookup(method, request)
+        await asyncio.sleep(delay)
+        return response
@@ -0,0 +1,137 @@
+"""
+Azure OpenAI HTTP Connections
+
+One tuned ``httpx`` connection pool (sync and async) shared by every Azure OpenAI
+client of the process: the main deployment, the cascade's fast tier and the
+deployment pool. Pool size, keep-alive expiry and HTTP/2 come from the
+``OPENAI_HTTP_*`` settings; HTTP/2 needs the optional ``h2`` package and falls
+back to HTTP/1.1 without it.
+
+Timeouts are set per call: ``OPENAI_CONNECT_TIMEOUT`` / ``OPENAI_READ_TIMEOUT``
+apply by default and ``OPENAI_METHOD_TIMEOUTS`` overrides them per
+``OpenAIService`` method, so a slow 1500-token CV evaluation and a quick job
+details extraction do not share one read timeout.
+
+``warm_up`` opens connections to every endpoint at startup, so the first
+requests after a deploy do not pay for the TCP and TLS handshakes.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Dict, Iterable, Optional
+
+import httpx
+import openai
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_http_client: Optional[httpx.Client] = None
+_async_http_client: Optional[httpx.AsyncClient] = None
+_method_timeouts: Optional[Dict[str, httpx.Timeout]] = None
+
+
+def _http2_enabled() -> bool:
+    if not settings.OPENAI_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("OPENAI_HTTP2 is enabled but the 'h2' package is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.OPENAI_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.OPENAI_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.OPENAI_HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+def get_http_client() -> httpx.Client:
+    """Returns the shared sync connection pool, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        _http_client = openai.DefaultHttpxClient(limits=_limits(), timeout=default_timeout(), http2=_http2_enabled())
+    return _http_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Returns the shared async connection pool, creating it on first use."""
+    global _async_http_client
+    if _async_http_client is None:
+        _async_http_client = openai.DefaultAsyncHttpxClient(limits=_limits(), timeout=default_timeout(), http2=_http2_enabled())
+    return _async_http_client
+
+
+def default_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        settings.OPENAI_READ_TIMEOUT,
+        connect=settings.OPENAI_CONNECT_TIMEOUT,
+        read=settings.OPENAI_READ_TIMEOUT,
+    )
+
+
+def timeout_for(method: str) -> httpx.Timeout:
+    """
+    Timeout for one call of an ``OpenAIService`` method.
+
+    ``OPENAI_METHOD_TIMEOUTS`` maps method names to ``{"connect": s, "read": s}``;
+    missing values fall back to ``OPENAI_CONNECT_TIMEOUT`` / ``OPENAI_READ_TIMEOUT``.
+    """
+    global _method_timeouts
+    if _method_timeouts is None:
+        try:
+            overrides = json.loads(settings.OPENAI_METHOD_TIMEOUTS or "{}")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"OPENAI_METHOD_TIMEOUTS is not valid JSON: {e}")
+        _method_timeouts = {
+            name: httpx.Timeout(
+                values.get("read", settings.OPENAI_READ_TIMEOUT),
+                connect=values.get("connect", settings.OPENAI_CONNECT_TIMEOUT),
+                read=values.get("read", settings.OPENAI_READ_TIMEOUT),
+            )
+            for name, values in overrides.items()
+        }
+    return _method_timeouts.get(method) or default_timeout()
+
+
+async def warm_up(endpoints: Iterable[str]) -> None:
+    """
+    Opens ``OPENAI_HTTP_WARMUP_CONNECTIONS`` keep-alive connections to each endpoint.
+
+    Any HTTP response (typically 404 for the endpoint root) leaves an established,
+    reusable connection in the pool; failures are logged and otherwise ignored.
+    """
+    per_endpoint = settings.OPENAI_HTTP_WARMUP_CONNECTIONS
+    if per_endpoint <= 0:
+        return
+    client = get_async_http_client()
+
+    async def open_connection(endpoint: str) -> bool:
+        try:
+            await client.get(endpoint, timeout=httpx.Timeout(settings.OPENAI_CONNECT_TIMEOUT))
+            return True
+        except httpx.HTTPError as e:
+            logger.warning(f"Connection warm-up to {endpoint} failed: {e}")
+            return False
+
+    targets = [endpoint for endpoint in dict.fromkeys(endpoints) if endpoint]
+    # Concurrent requests, so each one needs its own connection
+    results = await asyncio.gather(*(open_connection(endpoint) for endpoint in targets for _ in range(per_endpoint)))
+    logger.info(f"Warmed up {sum(results)} Azure OpenAI connection(s) to {len(targets)} endpoint(s)")
+
+
+async def close() -> None:
+    """Closes the shared connection pools."""
+    global _http_client, _async_http_client
+    if _async_http_client is not None:
+        await _async_http_client.aclose()
+        _async_http_client = None
+    if _http_client is not None:
+        _http_client.close()
+        _http_client = None
@@ -1,9 +1,109 @@
 import re
 import json
+import time
+import asyncio
 import uuid
-from openai import AzureOpenAI
+import logging
+from contextlib import contextmanager
+import openai
+from openai import AsyncAzureOpenAI, AzureOpenAI
 
+from app.api.v1 import schemas
 from app.core.config import settings
+from app.core import metrics
+from app.core.tracing import tracer
+from app.services import openai_http
+from app.services.deployment_pool import DeploymentPool, DeploymentUnavailableError
+from app.services.hedging import HedgePolicy
+from app.services.json_repair import invalid_fields, repair_json
+from app.services.llm_cassette import Cassette
+from app.services.token_budget import TokenBudget
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying: throttling, transient server failures and network issues
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.InternalServerError,
+    openai.APIConnectionError,
+    DeploymentUnavailableError,
+)
+
+# Approximate token cost of the batched prompt without any CV text
+_BATCH_PROMPT_OVERHEAD_TOKENS = 400
+
+# Completion budget per field when re-requesting fields missing from an evaluation
+_SALVAGE_TOKENS_PER_FIELD = 150
+
+
+def _estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return len(text) // 4 + 1
+
+
+def _compact_cv(cv_text: str) -> str:
+    """Collapses PDF-extraction whitespace and truncates the CV to the batch character limit."""
+    compacted = re.sub(r"[ \t]+", " ", cv_text)
+    compacted = re.sub(r"\s*\n\s*", "\n", compacted).strip()
+    return compacted[:settings.CV_BATCH_MAX_CV_CHARS]
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """Backoff before the next retry, honouring a Retry-After header when present."""
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        return min(float(retry_after), settings.OPENAI_RETRY_MAX_DELAY)
+    except (TypeError, ValueError):
+        return min(settings.OPENAI_RETRY_BASE_DELAY * (2 ** attempt), settings.OPENAI_RETRY_MAX_DELAY)
+
+
+def _fast_tier_evaluation(score: int) -> dict:
+    """CV evaluation for a fast-tier score outside the uncertain band (see ``evaluate_cv_cascade_async``)."""
+    return {
+        # The fast tier only estimates the overall match; experience_match stays unset
+        "match_score": score,
+        "skills_coverage": [],
+        "skills_gaps": [],
+        "strengths": [],
+        "development_areas": [],
+        "overall_assessment": (
+            f"Scored {score}/100 by the fast screening model, outside the uncertain band "
+            f"({settings.CV_CASCADE_UNCERTAIN_MIN}-{settings.CV_CASCADE_UNCERTAIN_MAX}), "
+            f"so no detailed evaluation was requested."
+        ),
+        "interview_recommendations": [],
+        "cascade_tier": "fast"
+    }
+
+
+def _salvage_request(request: dict, content: str, fields: list) -> dict:
+    """
+    Follow-up request asking only for the ``fields`` an evaluation lacked.
+
+    The incomplete answer is sent back as the assistant turn, so the model completes
+    the same evaluation instead of starting a new one.
+    """
+    return {
+        **request,
+        "messages": request["messages"] + [
+            {"role": "assistant", "content": content or ""},
+            {
+                "role": "user",
+                "content": "Your JSON response was incomplete. Respond with a JSON object containing "
+                           f"only these fields, in the format requested above: {', '.join(fields)}"
+            },
+        ],
+        "max_tokens": min(request["max_tokens"], _SALVAGE_TOKENS_PER_FIELD * len(fields)),
+    }
+
+
+def _count_fallbacks(**matches) -> None:
+    """Counts regex fields of ``generate_project_dict`` that had no match and fell back to defaults."""
+    for field, match in matches.items():
+        if match is None:
+            metrics.LLM_PARSE_FALLBACKS.labels(method="generate_project_dict", field=field).inc()
+
 
 class OpenAIService:
     """
@@ -14,11 +114,278 @@ class OpenAIService:
             api_key=settings.AZURE_OPENAI_API_KEY,
             api_version=settings.AZURE_OPENAI_API_VERSION,
             azure_endpoint=settings.AZURE_OPENAI_API_BASE,
+            max_retries=0,  # Retries are handled (and counted) by _complete
+            http_client=openai_http.get_http_client(),
+        )
+        self.async_client = AsyncAzureOpenAI(
+            api_key=settings.AZURE_OPENAI_API_KEY,
+            api_version=settings.AZURE_OPENAI_API_VERSION,
+            azure_endpoint=settings.AZURE_OPENAI_API_BASE,
+            max_retries=0,
+            http_client=openai_http.get_async_http_client(),
         )
         self.deployment_name = settings.AZURE_OPENAI_DEPLOYMENT_NAME
 
+        # Optional pool of deployments sharing the main deployment's traffic
+        self.pool = DeploymentPool.from_settings()
+        self.hedge_policy = HedgePolicy.from_settings()
+        # max_tokens sized from recent completion lengths (LLM_TOKEN_BUDGET_*)
+        self.token_budget = TokenBudget.from_settings()
+        # Record/replay store of model responses (LLM_CASSETTE_MODE)
+        self.cassette = Cassette.from_settings()
+
+        # Fast tier of the CV evaluation cascade; shares the main client unless it has its own endpoint
+        self.fast_deployment_name = settings.CV_CASCADE_FAST_DEPLOYMENT
+        self.fast_async_client = None
+        if settings.CV_CASCADE_FAST_API_BASE:
+            self.fast_async_client = AsyncAzureOpenAI(
+                api_key=settings.CV_CASCADE_FAST_API_KEY or settings.AZURE_OPENAI_API_KEY,
+                api_version=settings.AZURE_OPENAI_API_VERSION,
+                azure_endpoint=settings.CV_CASCADE_FAST_API_BASE,
+                max_retries=0,
+                http_client=openai_http.get_async_http_client(),
+            )
+
+    async def warm_up(self) -> None:
+        """Pre-opens keep-alive connections to every configured Azure OpenAI endpoint."""
+        endpoints = [settings.AZURE_OPENAI_API_BASE, settings.CV_CASCADE_FAST_API_BASE]
+        if self.pool is not None:
+            endpoints += [deployment.api_base for deployment in self.pool.deployments]
+        await openai_http.warm_up(endpoints)
+
+    async def aclose(self) -> None:
+        """Closes the shared HTTP connection pools."""
+        await openai_http.close()
+
+    def _complete(self, method: str, **request):
+        """
+        Sends a chat completion request with retries and records per-call telemetry.
+
+        Every model call goes through here so latency, token usage, finish reasons
+        and retries are exported per ``method`` (the public method name). The
+        request's ``max_tokens`` is the ceiling of the method's adaptive budget
+        (see ``app.services.token_budget``).
+        """
+        request = self.token_budget.apply(method, request)
+        with tracer.start_as_current_span(f"llm.{method}") as span:
+            span.set_attribute("llm.deployment", str(request.get("model")))
+            span.set_attribute("llm.max_tokens", request.get("max_tokens") or 0)
+
+            start = time.perf_counter()
+            attempt = 0
+            while True:
+                try:
+                    if self.cassette is not None and self.cassette.replaying:
+                        response = self.cassette.replay(method, request)
+                        break
+                    call_start = time.perf_counter()
+                    with self._lease(request, span) as (client, routed_request):
+                        response = client.chat.completions.create(**routed_request, timeout=openai_http.timeout_for(method))
+                    if self.cassette is not None:
+                        self.cassette.record(method, request, response, time.perf_counter() - call_start)
+                    break
+                except _RETRYABLE_ERRORS as e:
+                    if attempt >= settings.OPENAI_MAX_RETRIES:
+                        self._record_call(method, request, None, time.perf_counter() - start, attempt, type(e).__name__)
+                        raise
+                    metrics.LLM_RETRIES.labels(method=method, error=type(e).__name__).inc()
+                    span.add_event("retry", {"error": type(e).__name__, "attempt": attempt + 1})
+                    time.sleep(_retry_delay(e, attempt))
+                    attempt += 1
+                except Exception as e:
+                    self._record_call(method, request, None, time.perf_counter() - start, attempt, type(e).__name__)
+                    raise
+
+            record = self._record_call(method, request, response, time.perf_counter() - start, attempt, None)
+            for key in ("prompt_tokens", "completion_tokens", "finish_reason", "retries"):
+                if record.get(key) is not None:
+                    span.set_attribute(f"llm.{key}", record[key])
+            return response
+
+    async def _complete_async(self, method: str, client=None, **request):
+        """Async counterpart of ``_complete`` using the non-blocking client (or ``client``)."""
+        request = self.token_budget.apply(method, request)
+        with tracer.start_as_current_span(f"llm.{method}") as span:
+            span.set_attribute("llm.deployment", str(request.get("model")))
+            span.set_attribute("llm.max_tokens", request.get("max_tokens") or 0)
+
+            start = time.perf_counter()
+            attempt = 0
+            while True:
+                try:
+                    if self.cassette is not None and self.cassette.replaying:
+                        response = await self.cassette.replay_async(method, request)
+                        break
+                    call_start = time.perf_counter()
+                    with self._lease(request, span, client, use_async=True) as (leased_client, routed_request):
+                        response = await leased_client.chat.completions.create(
+                            **routed_request, timeout=openai_http.timeout_for(method)
+                        )
+                    if self.cassette is not None:
+                        await asyncio.to_thread(self.cassette.record, method, request, response, time.perf_counter() - call_start)
+                    break
+                except _RETRYABLE_ERRORS as e:
+                    if attempt >= settings.OPENAI_MAX_RETRIES:
+                        self._record_call(method, request, None, time.perf_counter() - start, attempt, type(e).__name__)
+                        raise
+                    metrics.LLM_RETRIES.labels(method=method, error=type(e).__name__).inc()
+                    span.add_event("retry", {"error": type(e).__name__, "attempt": attempt + 1})
+                    await asyncio.sleep(_retry_delay(e, attempt))
+                    attempt += 1
+                except Exception as e:
+                    self._record_call(method, request, None, time.perf_counter() - start, attempt, type(e).__name__)
+                    raise
+
+            record = self._record_call(method, request, response, time.perf_counter() - start, attempt, None)
+            for key in ("prompt_tokens", "completion_tokens", "finish_reason", "retries"):
+                if record.get(key) is not None:
+                    span.set_attribute(f"llm.{key}", record[key])
+            return response
+
+    async def _call_async(self, method: str, parse, **request):
+        """
+        Runs ``_complete_async`` and ``parse`` on the response, hedging slow calls of
+        the methods in ``OPENAI_HEDGE_METHODS`` (see ``app.services.hedging``).
+        """
+        async def attempt():
+            return parse(await self._complete_async(method, **request))
+
+        return await self.hedge_policy.run(method, attempt)
+
+    @contextmanager
+    def _lease(self, request: dict, span, client=None, use_async: bool = False):
+        """
+        Routes one attempt of a model call.
+
+        Calls for the main deployment are spread over the deployment pool when one is
+        configured; other calls go to ``client``, or the default client. Yields the
+        client to use and the request to send with it.
+        """
+        if self.pool is None or client is not None or request.get("model") != self.deployment_name:
+            yield client or (self.async_client if use_async else self.client), request
+            return
+        with self.pool.lease() as deployment:
+            span.set_attribute("llm.pool_deployment", deployment.name)
+            yield deployment.async_client if use_async else deployment.client, {**request, "model": deployment.deployment}
+
+    def _record_call(self, method: str, request: dict, response, duration: float, retries: int, error: str = None) -> dict:
+        """Exports metrics (and optionally a structured log line) for one model call and returns the record."""
+        metrics.LLM_REQUEST_LATENCY.labels(method=method, outcome="error" if error else "success").observe(duration)
+
+        record = {
+            "event": "llm_call",
+            "method": method,
+            "deployment": request.get("model"),
+            "duration_ms": round(duration * 1000, 1),
+            "retries": retries,
+            "max_tokens": request.get("max_tokens"),
+            "error": error,
+        }
+        if response is not None:
+            usage = getattr(response, "usage", None)
+            finish_reason = response.choices[0].finish_reason if response.choices else None
+            metrics.LLM_FINISH_REASONS.labels(method=method, finish_reason=str(finish_reason)).inc()
+            if usage is not None:
+                metrics.LLM_TOKENS.labels(method=method, kind="prompt").inc(usage.prompt_tokens)
+                metrics.LLM_TOKENS.labels(method=method, kind="completion").inc(usage.completion_tokens)
+                metrics.LLM_COMPLETION_TOKENS.labels(method=method).observe(usage.completion_tokens)
+                self.token_budget.observe(method, usage.completion_tokens, finish_reason, request.get("max_tokens"))
+                record.update(prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens)
+            record["finish_reason"] = finish_reason
+
+        if settings.LLM_CALL_LOGGING:
+            logger.info(json.dumps(record))
+        return record
+
+    def _parse_json(self, method: str, response) -> dict:
+        """Decodes a JSON-mode completion, counting decode failures before re-raising."""
+        try:
+            return json.loads(response.choices[0].message.content)
+        except json.JSONDecodeError:
+            metrics.LLM_PARSE_FAILURES.labels(method=method).inc()
+            raise
+
+    def _evaluate(self, method: str, schema, request: dict) -> dict:
+        """
+        Runs an evaluation call and returns its result validated against ``schema``.
+
+        Defective JSON is repaired (see ``app.services.json_repair``) and fields still
+        missing or invalid afterwards are re-requested in one short follow-up call
+        (``LLM_JSON_SALVAGE``). Outcomes are counted in ``arya_llm_json_outcomes_total``.
+
+        Raises:
+            ValueError: If no valid evaluation could be recovered
+        """
+        response = self._complete(method, **request)
+        data, missing, outcome = self._repair_evaluation(method, schema, response)
+        if missing:
+            salvage = self._complete(
+                f"{method}_salvage", **_salvage_request(request, response.choices[0].message.content, missing)
+            )
+            data, outcome = self._merge_salvage(method, schema, data, missing, salvage), "salvaged"
+        return self._validated_evaluation(method, schema, data, outcome)
+
+    async def _evaluate_async(self, method: str, schema, request: dict) -> dict:
+        """Async variant of ``_evaluate``; slow calls are hedged like ``_call_async``."""
+        async def attempt():
+            response = await self._complete_async(method, **request)
+            data, missing, outcome = self._repair_evaluation(method, schema, response)
+            if missing:
+                salvage = await self._complete_async(
+                    f"{method}_salvage", **_salvage_request(request, response.choices[0].message.content, missing)
+                )
+                data, outcome = self._merge_salvage(method, schema, data, missing, salvage), "salvaged"
+            return self._validated_evaluation(method, schema, data, outcome)
+
+        return await self.hedge_policy.run(method, attempt)
+
+    def _repair_evaluation(self, method: str, schema, response) -> tuple:
+        """
+        Decodes an evaluation completion, repairing it when needed.
+
+        Returns:
+            Tuple of (decoded object, fields to re-request, outcome so far)
+        """
+        data, repaired = repair_json(response.choices[0].message.content)
+        if data is None:
+            self._evaluation_failed(method, "the completion contains no JSON object")
+        missing = invalid_fields(schema, data)
+        if missing and not settings.LLM_JSON_SALVAGE:
+            self._evaluation_failed(method, f"missing or invalid fields {', '.join(missing)}")
+        if missing:
+            logger.info(f"{method} response lacks {', '.join(missing)}; re-requesting them")
+        return data, missing, "repaired" if repaired else "valid"
+
+    def _merge_salvage(self, method: str, schema, data: dict, missing: list, response) -> dict:
+        """Adds the re-requested fields to an incomplete evaluation."""
+        fields, _ = repair_json(response.choices[0].message.content)
+        merged = {**data, **{field: fields[field] for field in missing if field in (fields or {})}}
+        still_missing = invalid_fields(schema, merged)
+        if still_missing:
+            self._evaluation_failed(method, f"missing or invalid fields {', '.join(still_missing)} after re-requesting them")
+        return merged
+
+    def _validated_evaluation(self, method: str, schema, data: dict, outcome: str) -> dict:
+        metrics.LLM_JSON_OUTCOMES.labels(method=method, outcome=outcome).inc()
+        # Coerced values (e.g. "85" -> 85) replace the raw ones; extra keys are kept
+        return {**data, **schema.model_validate(data).model_dump()}
+
+    def _evaluation_failed(self, method: str, reason: str) -> None:
+        metrics.LLM_JSON_OUTCOMES.labels(method=method, outcome="failed").inc()
+        metrics.LLM_PARSE_FAILURES.labels(method=method).inc()
+        raise ValueError(f"Unusable {method} response: {reason}")
+
     def extract_job_details(self, job_description: str) -> dict:
         """Extracts structured details from a raw job description string."""
+        response = self._complete("extract_job_details", **self._job_details_request(job_description))
+        return self._parse_job_details(response)
+
+    async def extract_job_details_async(self, job_description: str) -> dict:
+        """Async variant of ``extract_job_details``."""
+        return await self._call_async("extract_job_details", self._parse_job_details, **self._job_details_request(job_description))
+
+    def _job_details_request(self, job_description: str) -> dict:
+        """Builds the chat completion parameters for job detail extraction."""
         prompt = f"""
         Extract the following details from the job description:
 
@@ -37,12 +404,15 @@ class OpenAIService:
         **Soft Skills**: [comma-separated list]
         **Industry**: [industry]
         """
-        response = self.client.chat.completions.create(
-            model=self.deployment_name,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3,
-            max_tokens=400
-        )
+        return {
+            "model": self.deployment_name,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.3,
+            "max_tokens": 400
+        }
+
+    def _parse_job_details(self, response) -> dict:
+        """Parses the markdown-formatted job details completion."""
         response_text = response.choices[0].message.content.strip()
 
         try:
@@ -58,10 +428,26 @@ class OpenAIService:
                 "industry": industry
             }
         except AttributeError:
+            metrics.LLM_PARSE_FALLBACKS.labels(method="extract_job_details", field="all").inc()
             return {}
 
     def generate_project_dict(self, job_title: str, tech_skills: list, soft_skills: list, industry: str, applicant_id: str = None) -> dict:
         """Generates a project-based assessment for a job role."""
+        request = self._project_request(job_title, tech_skills, soft_skills, industry, applicant_id)
+        response = self._complete("generate_project_dict", **request)
+        return self._parse_project(response, job_title, tech_skills)
+
+    async def generate_project_dict_async(self, job_title: str, tech_skills: list, soft_skills: list, industry: str, applicant_id: str = None) -> dict:
+        """Async variant of ``generate_project_dict``."""
+        request = self._project_request(job_title, tech_skills, soft_skills, industry, applicant_id)
+        return await self._call_async(
+            "generate_project_dict",
+            lambda response: self._parse_project(response, job_title, tech_skills),
+            **request
+        )
+
+    def _project_request(self, job_title: str, tech_skills: list, soft_skills: list, industry: str, applicant_id: str = None) -> dict:
+        """Builds the chat completion parameters for project generation."""
         if applicant_id is None:
             applicant_id = str(uuid.uuid4())[:8]
         
@@ -91,16 +477,18 @@ class OpenAIService:
         For Phase 3, ensure Submit has two clear deliverables: a written document/report and an audio presentation.
         """
         
-        response = self.client.chat.completions.create(
-            model=self.deployment_name,
-            messages=[
+        return {
+            "model": self.deployment_name,
+            "messages": [
                 {"role": "system", "content": "You are an expert in designing AI-resistant project-based tasks."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.7,
-            max_tokens=800
-        )
-        
+            "temperature": 0.7,
+            "max_tokens": 800
+        }
+
+    def _parse_project(self, response, job_title: str, tech_skills: list) -> dict:
+        """Parses the markdown-formatted project completion, falling back to defaults per field."""
         response_text = response.choices[0].message.content.strip()
         
         try:
@@ -110,6 +498,7 @@ class OpenAIService:
             
             project_title = project_title_match.group(1).strip() if project_title_match else f"{job_title} Assessment Project"
             objective = objective_match.group(1).strip() if objective_match else f"Evaluate candidate skills for {job_title} role"
+            _count_fallbacks(title=project_title_match, objective=objective_match)
             
             # Extract phases
             phases = []
@@ -128,6 +517,7 @@ class OpenAIService:
                     task = task_match.group(1).strip() if task_match else f"Phase {phase_num} task"
                     submit = submit_match.group(1).strip() if submit_match else f"Phase {phase_num} deliverable"
                     ai_resistant = ai_resistant_match.group(1).strip() if ai_resistant_match else "AI resistance strategy"
+                    _count_fallbacks(task=task_match, submit=submit_match, ai_resistant_tactic=ai_resistant_match)
                     
                     phases.append({
                         "phase": phase_num,
@@ -137,6 +527,7 @@ class OpenAIService:
                     })
                 else:
                     # Fallback phase if parsing fails
+                    _count_fallbacks(phase=None)
                     phases.append({
                         "phase": phase_num,
                         "task": f"Complete phase {phase_num} requirements for {job_title} role",
@@ -152,6 +543,7 @@ class OpenAIService:
             
         except Exception as e:
             # Fallback project structure if parsing completely fails
+            _count_fallbacks(all=None)
             return {
                 "title": f"{job_title} Assessment Project",
                 "objective": f"Comprehensive evaluation of candidate skills for {job_title} position",
@@ -179,6 +571,85 @@ class OpenAIService:
 
     def evaluate_cv(self, cv_text: str, job_title: str, tech_skills: list, soft_skills: list, industry: str) -> dict:
         """Evaluates a candidate's CV against job requirements."""
+        request = self.cv_evaluation_request(cv_text, job_title, tech_skills, soft_skills, industry)
+        return self._evaluate("evaluate_cv", schemas.CVEvaluationResponse, request)
+
+    async def evaluate_cv_async(self, cv_text: str, job_title: str, tech_skills: list, soft_skills: list, industry: str) -> dict:
+        """Async variant of ``evaluate_cv``."""
+        request = self.cv_evaluation_request(cv_text, job_title, tech_skills, soft_skills, industry)
+        return await self._evaluate_async("evaluate_cv", schemas.CVEvaluationResponse, request)
+
+    async def evaluate_cv_cascade_async(self, cv_text: str, job_title: str, tech_skills: list, soft_skills: list, industry: str) -> dict:
+        """
+        Evaluates a CV through the two-tier cascade.
+
+        The fast deployment scores the CV first. Scores outside the uncertain band
+        (``CV_CASCADE_UNCERTAIN_MIN``-``CV_CASCADE_UNCERTAIN_MAX``) are clear enough to
+        keep as they are; the rest, and CVs the fast tier failed on, get the full
+        ``evaluate_cv`` evaluation from the main deployment. Without a configured
+        fast deployment this is ``evaluate_cv_async``.
+
+        Returns:
+            A CV evaluation dictionary; fast-tier results carry ``"cascade_tier": "fast"``,
+            no skill lists and no ``experience_match``
+        """
+        if not self.fast_deployment_name:
+            return await self.evaluate_cv_async(cv_text, job_title, tech_skills, soft_skills, industry)
+
+        start = time.perf_counter()
+        try:
+            score = await self.score_cv_async(cv_text, job_title, tech_skills, soft_skills, industry)
+        except Exception as e:
+            logger.warning(f"Fast CV scoring failed, escalating to the full evaluation: {e}")
+            score = None
+        metrics.CV_CASCADE_TIER_LATENCY.labels(tier="fast").observe(time.perf_counter() - start)
+
+        if score is not None and not settings.CV_CASCADE_UNCERTAIN_MIN <= score <= settings.CV_CASCADE_UNCERTAIN_MAX:
+            metrics.CV_CASCADE_ROUTES.labels(route="fast").inc()
+            return _fast_tier_evaluation(score)
+
+        metrics.CV_CASCADE_ROUTES.labels(route="escalated" if score is not None else "fast_failed").inc()
+        start = time.perf_counter()
+        try:
+            return await self.evaluate_cv_async(cv_text, job_title, tech_skills, soft_skills, industry)
+        finally:
+            metrics.CV_CASCADE_TIER_LATENCY.labels(tier="strong").observe(time.perf_counter() - start)
+
+    async def score_cv_async(self, cv_text: str, job_title: str, tech_skills: list, soft_skills: list, industry: str) -> int:
+        """Scores a CV's overall match (0-100) with the fast cascade deployment."""
+        request = self._cv_score_request(cv_text, job_title, tech_skills, soft_skills, industry)
+        response = await self._complete_async("score_cv", client=self.fast_async_client, **request)
+        score = self._parse_json("score_cv", response)["match_score"]
+        return max(0, min(100, int(round(float(score)))))
+
+    def _cv_score_request(self, cv_text: str, job_title: str, tech_skills: list, soft_skills: list, industry: str) -> dict:
+        prompt = f"""
+        You are an expert HR recruiter. Rate how well this candidate's CV/resume fits a {job_title} position in the {industry} industry.
+
+        **Job Requirements:**
+        - Required Technical Skills: {', '.join(tech_skills)}
+        - Required Soft Skills: {', '.join(soft_skills)}
+
+        **CV/Resume:**
+        {cv_text}
+
+        Respond only with a JSON object: {{"match_score": number from 0 to 100}}
+        """
+
+        return {
+            "model": self.fast_deployment_name,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0,
+            "max_tokens": 20,
+            "response_format": {"type": "json_object"}
+        }
+
+    def cv_evaluation_request(self, cv_text: str, job_title: str, tech_skills: list, soft_skills: list, industry: str) -> dict:
+        """
+        Builds the chat completion parameters used by ``evaluate_cv``.
+
+        Exposed separately so offline batch jobs can serialize the exact same request.
+        """
         prompt = f"""
         You are an expert HR recruiter. Evaluate this candidate's CV/resume for a {job_title} position in the {industry} industry.
 
@@ -216,17 +687,137 @@ class OpenAIService:
         }}
         """
         
-        response = self.client.chat.completions.create(
+        return {
+            "model": self.deployment_name,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.3,
+            "max_tokens": 1500,
+            "response_format": {"type": "json_object"}
+        }
+
+    def evaluate_cv_batch(self, cvs: dict, job_title: str, tech_skills: list, soft_skills: list, industry: str) -> dict:
+        """
+        Evaluates several CVs for the same job, sharing one requirements block per request.
+
+        CVs are compacted and greedily packed into batches that fit the configured prompt
+        and completion token budgets. A batch whose call fails or whose response cannot
+        be parsed, and any candidate it omits or returns an invalid evaluation for
+        (checked against ``CVEvaluationResponse``), falls back to single
+        ``evaluate_cv`` calls.
+
+        Args:
+            cvs: Mapping of candidate key (e.g. candidate ID string) to extracted CV text
+            job_title, tech_skills, soft_skills, industry: Job requirements
+
+        Returns:
+            Mapping of candidate key to CV evaluation dictionary
+        """
+        results = {}
+        for batch in self._pack_cv_batches(cvs):
+            if len(batch) > 1:
+                try:
+                    results.update(self._evaluate_cv_group(batch, cvs, job_title, tech_skills, soft_skills, industry))
+                except (openai.APIError, ValueError, AttributeError, KeyError, TypeError) as e:
+                    logger.warning(f"Batched CV evaluation of {len(batch)} CVs failed, evaluating them one by one: {e}")
+
+            # Fallback: anything the batch did not return gets a dedicated call
+            for key in batch:
+                if key not in results:
+                    results[key] = self.evaluate_cv(cvs[key], job_title, tech_skills, soft_skills, industry)
+
+        return results
+
+    def _pack_cv_batches(self, cvs: dict) -> list:
+        """Groups CV keys into batches that respect the prompt and completion budgets."""
+        max_per_batch = max(1, settings.CV_BATCH_MAX_COMPLETION_TOKENS // settings.CV_BATCH_TOKENS_PER_RESULT)
+        prompt_budget = settings.CV_BATCH_MAX_PROMPT_TOKENS - _BATCH_PROMPT_OVERHEAD_TOKENS
+
+        batches, current, current_tokens = [], [], 0
+        for key, cv_text in cvs.items():
+            cv_tokens = _estimate_tokens(_compact_cv(cv_text))
+            if current and (len(current) >= max_per_batch or current_tokens + cv_tokens > prompt_budget):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(key)
+            current_tokens += cv_tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    def _evaluate_cv_group(self, keys: list, cvs: dict, job_title: str, tech_skills: list, soft_skills: list, industry: str) -> dict:
+        """Sends one batched evaluation request and maps the results back to candidate keys."""
+        # Short labels keep the prompt and the response smaller than full candidate IDs
+        labels = {f"C{i + 1}": key for i, key in enumerate(keys)}
+        cv_blocks = "\n\n".join(
+            f"### Candidate {label}\n{_compact_cv(cvs[key])}" for label, key in labels.items()
+        )
+
+        prompt = f"""
+        You are an expert HR recruiter. Evaluate each of the following {len(keys)} candidates independently for a {job_title} position in the {industry} industry.
+
+        **Job Requirements:**
+        - Position: {job_title}
+        - Industry: {industry}
+        - Required Technical Skills: {', '.join(tech_skills)}
+        - Required Soft Skills: {', '.join(soft_skills)}
+
+        **Candidates:**
+        {cv_blocks}
+
+        For every candidate provide: match_score (0-100), experience_match (0-100), skills_coverage and skills_gaps
+        (required technical skills present/missing), up to 3 strengths, up to 3 development_areas, a 1-2 sentence
+        overall_assessment and up to 3 interview_recommendations.
+
+        Format your response as a JSON object with exactly one entry per candidate:
+        {{
+            "evaluations": [
+                {{
+                    "candidate": "C1",
+                    "match_score": number,
+                    "experience_match": number,
+                    "skills_coverage": [list of strings],
+                    "skills_gaps": [list of strings],
+                    "strengths": [list of strings],
+                    "development_areas": [list of strings],
+                    "overall_assessment": "string",
+                    "interview_recommendations": [list of strings]
+                }}
+            ]
+        }}
+        """
+
+        response = self._complete(
+            "evaluate_cv_batch",
             model=self.deployment_name,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
-            max_tokens=1500,
+            max_tokens=min(
+                settings.CV_BATCH_MAX_COMPLETION_TOKENS,
+                settings.CV_BATCH_TOKENS_PER_RESULT * len(keys) + 100
+            ),
             response_format={"type": "json_object"}
         )
-        return json.loads(response.choices[0].message.content)
+        payload = self._parse_json("evaluate_cv_batch", response)
+
+        results = {}
+        for item in payload["evaluations"]:
+            key = labels.get(item.pop("candidate", None))
+            if key is not None and not invalid_fields(schemas.CVEvaluationResponse, item):
+                results[key] = {**item, **schemas.CVEvaluationResponse.model_validate(item).model_dump()}
+        return results
         
     def evaluate_submission(self, submission: str, phase_details: dict, ideal_response: str = None) -> dict:
         """Evaluates a candidate's submission for a project phase."""
+        request = self._submission_request(submission, phase_details)
+        return self._evaluate("evaluate_submission", schemas.SubmissionEvaluationResponse, request)
+
+    async def evaluate_submission_async(self, submission: str, phase_details: dict, ideal_response: str = None) -> dict:
+        """Async variant of ``evaluate_submission``."""
+        request = self._submission_request(submission, phase_details)
+        return await self._evaluate_async("evaluate_submission", schemas.SubmissionEvaluationResponse, request)
+
+    def _submission_request(self, submission: str, phase_details: dict) -> dict:
+        """Builds the chat completion parameters for submission evaluation."""
         prompt = f"""
         You are an experienced technical recruiter evaluating a job candidate's submission for a project phase.
 
@@ -275,14 +866,13 @@ class OpenAIService:
         }}
         """
         
-        response = self.client.chat.completions.create(
-            model=self.deployment_name,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3,
-            max_tokens=1500,
-            response_format={"type": "json_object"}
-        )
-        return json.loads(response.choices[0].message.content)
+        return {
+            "model": self.deployment_name,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.3,
+            "max_tokens": 1500,
+            "response_format": {"type": "json_object"}
+        }
 
 # Create a single instance of the service to be used by other services
 openai_service = OpenAIService()
\ No newline at end of file
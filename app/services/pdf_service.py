@@ -1,10 +1,41 @@
 import tempfile
 import re
+import threading
+from io import BytesIO
+
+import PyPDF2
 from fpdf import FPDF
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
+from app.core.tracing import tracer
 from app.models.candidate import Candidate
 
+@tracer.start_as_current_span("pdf.extract_text")
+def extract_pdf_text(pdf_content: bytes, cancelled: Optional[threading.Event] = None) -> str:
+    """
+    Extracts the text of every page of a PDF document.
+    
+    Args:
+        pdf_content: Raw bytes of the uploaded PDF file
+        cancelled: Optional event that stops extraction before the next page once set
+        
+    Returns:
+        The concatenated page text, one page per block
+
+    Raises:
+        InterruptedError: If ``cancelled`` was set during extraction
+    """
+    pdf_reader = PyPDF2.PdfReader(BytesIO(pdf_content))
+    
+    text = ""
+    for page in pdf_reader.pages:
+        if cancelled is not None and cancelled.is_set():
+            raise InterruptedError("PDF text extraction cancelled")
+        extracted_text = page.extract_text()
+        if extracted_text:
+            text += extracted_text + "\n"
+    return text
+
 def clean_text_for_pdf(text: str) -> str:
     """
     Clean text to remove characters that aren't supported by standard PDF fonts.
@@ -47,6 +78,7 @@ def clean_text_for_pdf(text: str) -> str:
     
     return text.strip()
 
+@tracer.start_as_current_span("pdf.render_candidate_report")
 def create_candidate_report_pdf(candidate: Candidate) -> str:
     """
     Generates a comprehensive PDF report for a single candidate.
@@ -83,7 +115,9 @@ def create_candidate_report_pdf(candidate: Candidate) -> str:
         
         # Match scores
         pdf.cell(0, 6, f"Overall Match Score: {cv_eval.get('match_score', 'N/A')}/100", 0, 1)
-        pdf.cell(0, 6, f"Experience Match: {cv_eval.get('experience_match', 'N/A')}/100", 0, 1)
+        # Not assessed for CVs scored by the fast screening tier
+        experience_match = cv_eval.get('experience_match')
+        pdf.cell(0, 6, f"Experience Match: {experience_match}/100" if experience_match is not None else "Experience Match: not assessed", 0, 1)
         pdf.ln(3)
         
         # Skills coverage and gaps
@@ -158,6 +192,7 @@ def create_candidate_report_pdf(candidate: Candidate) -> str:
     pdf.output(temp_file.name)
     return temp_file.name
 
+@tracer.start_as_current_span("pdf.render_reference_guide")
 def create_reference_guide_pdf(job_title: str, project_data: dict, ideal_responses: dict = None) -> str:
     """
     Generates a reference guide PDF for the job's project assessment.
@@ -0,0 +1,195 @@
+"""
+CV Pre-Screening
+
+Cheap lexical stage in front of LLM CV evaluation. The job's technical and soft
+skills (plus common aliases, e.g. "k8s" for Kubernetes) are compiled into one
+case-insensitive regular expression, so a CV is scanned in a single pass. The
+share of technical skills found is the CV's coverage. Bulk screening evaluates
+CVs in order of coverage. Setting ``CV_PRESCREEN_MIN_COVERAGE`` above 0 also
+skips the model for CVs below it; they receive a ``screened_out_evaluation``
+instead. The threshold is off by default, since a lexical miss (an unusual
+spelling, a skill the job phrases differently) would amount to a rejection.
+
+Matchers are cached per skill set, so each job's pattern is compiled once.
+"""
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.core import metrics
+from app.core.config import settings
+
+# Alternative spellings of common skills. Every term of a group matches every other
+# term of the group, so "Postgres" in a CV covers a "PostgreSQL" requirement and vice
+# versa. Ambiguous English words ("go", "rest", "node") are left out on purpose.
+SKILL_ALIASES: List[Tuple[str, ...]] = [
+    ("javascript", "js", "ecmascript", "es6"),
+    ("typescript",),
+    ("node.js", "nodejs", "node js"),
+    ("react", "react.js", "reactjs"),
+    ("vue", "vue.js", "vuejs"),
+    ("angular", "angularjs", "angular.js"),
+    ("next.js", "nextjs"),
+    ("python", "python3"),
+    ("golang",),
+    ("c#", "csharp", "c sharp"),
+    ("c++", "cpp"),
+    (".net", "dotnet", "asp.net", ".net core"),
+    ("postgresql", "postgres", "psql"),
+    ("mongodb", "mongo"),
+    ("mysql",),
+    ("sql server", "mssql", "ms sql"),
+    ("kubernetes", "k8s"),
+    ("aws", "amazon web services"),
+    ("gcp", "google cloud", "google cloud platform"),
+    ("azure", "microsoft azure"),
+    ("ci/cd", "ci-cd", "cicd", "continuous integration", "continuous delivery", "continuous deployment"),
+    ("rest api", "rest apis", "restful", "restful api", "restful apis"),
+    ("machine learning", "ml"),
+    ("artificial intelligence", "ai"),
+    ("natural language processing", "nlp"),
+    ("large language models", "llm", "llms"),
+    ("scikit-learn", "sklearn"),
+    ("tensorflow", "tf2"),
+    ("pytorch", "torch"),
+    ("problem solving", "problem-solving"),
+    ("communication", "communication skills"),
+    ("teamwork", "team player", "collaboration"),
+]
+
+_ALIAS_GROUPS: Dict[str, Tuple[str, ...]] = {term: group for group in SKILL_ALIASES for term in group}
+
+_QUALIFIER = re.compile(r"\([^()]*\)")
+_FRAGMENT_SEPARATORS = re.compile(r"[/(]")
+
+
+@dataclass
+class PrescreenResult:
+    """Outcome of matching one CV against a job's skills."""
+    coverage: float
+    matched_tech_skills: List[str] = field(default_factory=list)
+    missing_tech_skills: List[str] = field(default_factory=list)
+    matched_soft_skills: List[str] = field(default_factory=list)
+    passed: bool = True
+
+
+def _normalize(term: str) -> str:
+    return " ".join(term.lower().split())
+
+
+def _skill_terms(skill: str) -> List[str]:
+    """
+    Terms that count as evidence for a skill as written in a job.
+
+    Job skills are free text ("Python (3.x)", "Big Data (Spark", "AWS/GCP"), so
+    closed parenthetical qualifiers are dropped, the rest is split on "/" and "(",
+    and each fragment is expanded with its aliases. Skills that are themselves a
+    known term ("CI/CD") are kept whole.
+    """
+    normalized = _normalize(skill)
+    if normalized in _ALIAS_GROUPS:
+        return list(_ALIAS_GROUPS[normalized])
+
+    terms: List[str] = []
+    for fragment in _FRAGMENT_SEPARATORS.split(_QUALIFIER.sub(" ", normalized)):
+        fragment = _normalize(fragment.strip(" ,;:)-"))
+        if re.search(r"\w", fragment):
+            terms.extend(_ALIAS_GROUPS.get(fragment, (fragment,)))
+    return list(dict.fromkeys(terms)) or [normalized]
+
+
+def _term_pattern(term: str) -> str:
+    # Any run of spaces or hyphens matches the space in multi-word terms
+    return r"[\s\-]+".join(re.escape(word) for word in term.split(" "))
+
+
+class SkillMatcher:
+    """Single compiled pattern finding every skill (and alias) of one job."""
+
+    def __init__(self, tech_skills: Sequence[str], soft_skills: Sequence[str]):
+        self.tech_skills = list(dict.fromkeys(skill for skill in tech_skills if skill and skill.strip()))
+        self.soft_skills = list(dict.fromkeys(skill for skill in soft_skills if skill and skill.strip()))
+
+        # Lower-cased term -> skills it provides evidence for
+        self._skills_by_term: Dict[str, List[str]] = {}
+        for skill in self.tech_skills + self.soft_skills:
+            for term in _skill_terms(skill):
+                self._skills_by_term.setdefault(term, []).append(skill)
+
+        self.pattern: Optional[re.Pattern] = None
+        if self._skills_by_term:
+            # Longest first, so "react native" wins over "react"
+            terms = sorted(self._skills_by_term, key=len, reverse=True)
+            self.pattern = re.compile(
+                r"(?<![\w+#.])(" + "|".join(_term_pattern(term) for term in terms) + r")(?![\w+#])",
+                re.IGNORECASE
+            )
+
+    def match(self, text: str) -> PrescreenResult:
+        """Finds the job's skills in a CV and computes its technical skill coverage."""
+        found = set()
+        if self.pattern is not None:
+            for match in self.pattern.finditer(text):
+                found.update(self._skills_by_term.get(_normalize(match.group(1).replace("-", " ")), ()))
+                found.update(self._skills_by_term.get(_normalize(match.group(1)), ()))
+
+        matched_tech = [skill for skill in self.tech_skills if skill in found]
+        coverage = len(matched_tech) / len(self.tech_skills) if self.tech_skills else 1.0
+        return PrescreenResult(
+            coverage=coverage,
+            matched_tech_skills=matched_tech,
+            missing_tech_skills=[skill for skill in self.tech_skills if skill not in found],
+            matched_soft_skills=[skill for skill in self.soft_skills if skill in found]
+        )
+
+
+@lru_cache(maxsize=256)
+def _get_matcher(tech_skills: Tuple[str, ...], soft_skills: Tuple[str, ...]) -> SkillMatcher:
+    return SkillMatcher(tech_skills, soft_skills)
+
+
+def prescreen_cv(cv_text: str, tech_skills: Optional[Sequence[str]], soft_skills: Optional[Sequence[str]]) -> PrescreenResult:
+    """
+    Matches a CV against a job's skills and decides whether it warrants LLM evaluation.
+
+    Args:
+        cv_text: Extracted CV text
+        tech_skills: The job's technical skills
+        soft_skills: The job's soft skills
+
+    Returns:
+        PrescreenResult; ``passed`` is False when the technical skill coverage is
+        below ``CV_PRESCREEN_MIN_COVERAGE``
+    """
+    matcher = _get_matcher(tuple(tech_skills or ()), tuple(soft_skills or ()))
+    result = matcher.match(cv_text)
+    result.passed = result.coverage >= settings.CV_PRESCREEN_MIN_COVERAGE
+
+    metrics.CV_PRESCREEN_COVERAGE.observe(result.coverage)
+    metrics.CV_PRESCREEN_DECISIONS.labels(decision="evaluate" if result.passed else "skip").inc()
+    return result
+
+
+def screened_out_evaluation(result: PrescreenResult) -> dict:
+    """
+    Builds the CV evaluation stored for a CV that failed the pre-screen, in the
+    shape of an LLM evaluation (see ``schemas.CVEvaluationResponse``).
+    """
+    total = len(result.matched_tech_skills) + len(result.missing_tech_skills)
+    return {
+        "match_score": round(result.coverage * 100),
+        "experience_match": 0,
+        "skills_coverage": result.matched_tech_skills + result.matched_soft_skills,
+        "skills_gaps": result.missing_tech_skills,
+        "strengths": [],
+        "development_areas": [f"No evidence of: {', '.join(result.missing_tech_skills)}"] if result.missing_tech_skills else [],
+        "overall_assessment": (
+            f"Screened out automatically: the CV mentions {len(result.matched_tech_skills)} of the "
+            f"{total} required technical skills, below the pre-screening threshold. "
+            f"It was not evaluated by the AI model."
+        ),
+        "interview_recommendations": [],
+        "prescreened": True
+    }
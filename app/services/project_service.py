@@ -1,11 +1,40 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, undefer
+import asyncio
+import logging
 import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Union
 
+import orjson
+
+from app.core import metrics
+from app.core.cache import Cache
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.models.types import utc_now
 from app.services.openai_service import openai_service
 from app import models
 from app.api.v1 import schemas
 
-def create_job_and_assessment(db: Session, job_create: schemas.JobCreate) -> models.Job:
+logger = logging.getLogger(__name__)
+
+# Jobs and their projects are not modified after creation, so they are served from a
+# read-through cache. Code that changes a job or its project must call invalidate_job.
+job_cache = Cache("job")
+
+# Variants a registration tries to claim before settling for the job's project
+_VARIANT_CLAIM_ATTEMPTS = 3
+
+# Seconds after which a placeholder still being generated is considered abandoned
+_VARIANT_CLAIM_TIMEOUT = 600
+
+# Running pool refills per job; holds the tasks until they finish
+_variant_refills: Dict[int, asyncio.Task] = {}
+_variant_generation_slots: Optional[asyncio.Semaphore] = None
+
+async def create_job_and_assessment(db: AsyncSession, job_create: schemas.JobCreate) -> models.Job:
     """
     Orchestrates the creation of a job and its associated project assessment.
     
@@ -20,7 +49,7 @@ def create_job_and_assessment(db: Session, job_create: schemas.JobCreate) -> mod
         ValueError: If job details cannot be extracted or project generation fails
     """
     # 1. Extract details from the job description using OpenAI
-    extracted_details = openai_service.extract_job_details(job_create.job_description)
+    extracted_details = await openai_service.extract_job_details_async(job_create.job_description)
     if not extracted_details:
         raise ValueError("Could not extract details from job description. Please ensure the description is clear and contains job requirements.")
 
@@ -31,7 +60,7 @@ def create_job_and_assessment(db: Session, job_create: schemas.JobCreate) -> mod
         placeholder_applicant_id = str(uuid.uuid4())[:8]
         
         try:
-            project_data = openai_service.generate_project_dict(
+            project_data = await openai_service.generate_project_dict_async(
                 job_title=extracted_details["title"],
                 tech_skills=extracted_details["tech_skills"],
                 soft_skills=extracted_details["soft_skills"],
@@ -62,26 +91,358 @@ def create_job_and_assessment(db: Session, job_create: schemas.JobCreate) -> mod
 
     # 5. Save to database
     db.add(new_job)
-    db.commit()
-    db.refresh(new_job)
+    await db.commit()
+    await db.refresh(new_job, attribute_names=["created_at", "project"])
+
+    # 6. Prime the cache; the job is typically fetched right after creation
+    await job_cache.set(str(new_job.id), _serialize_job(new_job))
+
+    # 7. Start generating personalized variants for the job's first candidates
+    if project_data:
+        schedule_variant_refill(new_job.id)
     
     return new_job
 
-def get_job_with_project(db: Session, job_id: int) -> models.Job:
+async def get_job_with_project(db: AsyncSession, job_id: int) -> models.Job:
     """
-    Retrieves a job with its associated project data.
+    Retrieves a job with its associated project data, from the job cache if possible.
+
+    Cached jobs are returned as detached instances with every column and the
+    project loaded; they must only be read, never added to a session.
     
     Args:
         db: Database session
         job_id: ID of the job to retrieve
         
     Returns:
-        Job model instance with project relationship loaded
+        Job model instance with project relationship (including phases) loaded
         
     Raises:
         ValueError: If job is not found
     """
-    job = db.query(models.Job).filter(models.Job.id == job_id).first()
+    cached = await job_cache.get(str(job_id))
+    if cached is not None:
+        return _deserialize_job(cached)
+    return await _load_job(db, job_id)
+
+async def _load_job(db: AsyncSession, job_id: int) -> models.Job:
+    """Loads a job with its project from the database and fills the job cache."""
+    job = (await db.scalars(
+        select(models.Job).options(
+            joinedload(models.Job.project).undefer(models.Project.phases),
+            undefer(models.Job.job_description)
+        ).where(models.Job.id == job_id)
+    )).first()
     if not job:
         raise ValueError(f"Job with ID {job_id} not found.")
-    return job
\ No newline at end of file
+
+    await job_cache.set(str(job_id), _serialize_job(job))
+    return job
+
+async def invalidate_job(job_id: int) -> None:
+    """
+    Drops a job (and its project) from the job cache. Must be called after any
+    write to the job or its project.
+    
+    Args:
+        job_id: ID of the changed job
+    """
+    await job_cache.invalidate(str(job_id))
+
+def _serialize_job(job: models.Job) -> bytes:
+    """Serializes a job and its project for the job cache."""
+    project = job.project
+    return orjson.dumps({
+        "id": job.id,
+        "title": job.title,
+        "industry": job.industry,
+        "tech_skills": job.tech_skills,
+        "soft_skills": job.soft_skills,
+        "job_description": job.job_description,
+        "created_at": job.created_at,
+        "project": {
+            "id": project.id,
+            "job_id": project.job_id,
+            "title": project.title,
+            "objective": project.objective,
+            "phases": project.phases
+        } if project else None
+    })
+
+def _deserialize_job(data: bytes) -> models.Job:
+    """Rebuilds a detached job and project from a job cache entry."""
+    values = orjson.loads(data)
+    project = values.pop("project")
+    if values["created_at"] is not None:
+        values["created_at"] = datetime.fromisoformat(values["created_at"])
+    return models.Job(**values, project=models.Project(**project) if project else None)
+
+async def get_job_title(db: AsyncSession, job_id: int) -> str:
+    """
+    Retrieves only the title of a job.
+    
+    Args:
+        db: Database session
+        job_id: ID of the job
+        
+    Returns:
+        The job title
+        
+    Raises:
+        ValueError: If job is not found
+    """
+    cached = await job_cache.get(str(job_id))
+    if cached is not None:
+        return orjson.loads(cached)["title"]
+    return (await _load_job(db, job_id)).title
+
+async def assign_project_variant(db: AsyncSession, job_id: int, candidate_id: uuid.UUID) -> Optional[int]:
+    """
+    Hands the oldest unassigned project variant of a job to a candidate.
+
+    Runs in the caller's transaction, so the assignment is committed or rolled back
+    together with the candidate. The conditional UPDATE makes the claim atomic:
+    concurrent registrations never share a variant, and one that loses the race for
+    a variant moves on to the next.
+    
+    Args:
+        db: Database session
+        job_id: ID of the candidate's job
+        candidate_id: UUID of the (flushed) candidate
+        
+    Returns:
+        ID of the assigned variant, or None if the job's pool is empty
+    """
+    if settings.PROJECT_VARIANT_POOL_SIZE > 0:
+        for _ in range(_VARIANT_CLAIM_ATTEMPTS):
+            variant_id = await db.scalar(
+                select(models.ProjectVariant.id).where(
+                    models.ProjectVariant.job_id == job_id,
+                    models.ProjectVariant.candidate_id.is_(None),
+                    models.ProjectVariant.generated_at.is_not(None)
+                ).order_by(models.ProjectVariant.id).limit(1).with_for_update(skip_locked=True)
+            )
+            if variant_id is None:
+                break
+            assigned_id = await db.scalar(
+                update(models.ProjectVariant).where(
+                    models.ProjectVariant.id == variant_id,
+                    models.ProjectVariant.candidate_id.is_(None),
+                    models.ProjectVariant.generated_at.is_not(None)
+                ).values(candidate_id=candidate_id, assigned_at=func.now()).returning(models.ProjectVariant.id)
+            )
+            if assigned_id is not None:
+                metrics.PROJECT_VARIANT_ASSIGNMENTS.labels(source="variant").inc()
+                return assigned_id
+
+    metrics.PROJECT_VARIANT_ASSIGNMENTS.labels(source="job_project").inc()
+    return None
+
+async def get_candidate_project(db: AsyncSession, candidate_id: uuid.UUID) -> Union[models.ProjectVariant, models.Project]:
+    """
+    Retrieves the project a candidate works on: their personalized variant, or the
+    job's project for candidates registered while the job's pool was empty.
+    
+    Args:
+        db: Database session
+        candidate_id: UUID of the candidate
+        
+    Returns:
+        ProjectVariant or Project instance with its phases loaded
+        
+    Raises:
+        ValueError: If the candidate is not found or has no project assessment
+    """
+    variant = (await db.scalars(
+        select(models.ProjectVariant).options(
+            undefer(models.ProjectVariant.phases)
+        ).where(models.ProjectVariant.candidate_id == candidate_id)
+    )).first()
+    if variant is not None:
+        return variant
+
+    job_id = await db.scalar(select(models.Candidate.job_id).where(models.Candidate.id == candidate_id))
+    if job_id is None:
+        raise ValueError(f"Candidate with ID {candidate_id} not found.")
+    job = await get_job_with_project(db=db, job_id=job_id)
+    if not job.project:
+        raise ValueError(f"No project assessment found for candidate {candidate_id}.")
+    return job.project
+
+def schedule_variant_refill(job_id: int) -> None:
+    """
+    Tops up a job's pool of unassigned project variants to ``PROJECT_VARIANT_POOL_SIZE``
+    in the background. Does nothing while a refill of the job is already running.
+    
+    Args:
+        job_id: ID of the job whose pool is refilled
+    """
+    if settings.PROJECT_VARIANT_POOL_SIZE <= 0 or job_id in _variant_refills:
+        return
+    task = asyncio.create_task(_refill_variants(job_id))
+    _variant_refills[job_id] = task
+    task.add_done_callback(lambda _: _variant_refills.pop(job_id, None))
+
+async def resume_variant_refills() -> None:
+    """
+    Schedules a refill for every recently active job whose pool is below
+    ``PROJECT_VARIANT_POOL_SIZE`` (on startup), so refills cancelled at the last
+    shutdown are picked up again. Only jobs created or registering candidates within
+    ``PROJECT_VARIANT_RESUME_DAYS`` are considered; pools of older jobs are refilled
+    by their next registration.
+    """
+    if settings.PROJECT_VARIANT_POOL_SIZE <= 0 or settings.PROJECT_VARIANT_RESUME_DAYS <= 0:
+        return
+    now = utc_now()
+    active_since = now - timedelta(days=settings.PROJECT_VARIANT_RESUME_DAYS)
+    stale_before = now - timedelta(seconds=_VARIANT_CLAIM_TIMEOUT)
+    async with AsyncSessionLocal() as db:
+        recent_candidate = select(models.Candidate.id).where(
+            models.Candidate.job_id == models.Job.id,
+            models.Candidate.created_at >= active_since
+        ).exists()
+        job_ids = (await db.scalars(
+            select(models.Job.id)
+            .join(models.Project, models.Project.job_id == models.Job.id)
+            .outerjoin(models.ProjectVariant, and_(
+                models.ProjectVariant.job_id == models.Job.id,
+                models.ProjectVariant.candidate_id.is_(None),
+                # Abandoned placeholders do not count; the refill replaces them
+                or_(models.ProjectVariant.generated_at.is_not(None), models.ProjectVariant.created_at >= stale_before)
+            ))
+            .where(or_(models.Job.created_at >= active_since, recent_candidate))
+            .group_by(models.Job.id)
+            .having(func.count(models.ProjectVariant.id) < settings.PROJECT_VARIANT_POOL_SIZE)
+        )).all()
+    if job_ids:
+        logger.info(f"Resuming project variant refills for {len(job_ids)} job(s)")
+    for job_id in job_ids:
+        schedule_variant_refill(job_id)
+
+async def cancel_variant_refills() -> None:
+    """Cancels the running pool refills (on shutdown); variants stored so far are kept."""
+    tasks = list(_variant_refills.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+async def _refill_variants(job_id: int) -> None:
+    try:
+        while True:
+            # Short-lived sessions: no connection is held during generation
+            async with AsyncSessionLocal() as db:
+                job = await get_job_with_project(db=db, job_id=job_id)
+                if not job.project:
+                    return
+                claimed = await _claim_variant_slots(db, job_id)
+            if not claimed:
+                return
+
+            # Registrations during this round did not start a refill, so claim again after it
+            generated = await asyncio.gather(*(
+                _generate_variant(job, variant_id, applicant_id) for variant_id, applicant_id in claimed
+            ))
+            if not any(generated):
+                logger.warning(f"Project variant generation failed for job {job_id}")
+                return
+    except Exception as e:
+        logger.error(f"Project variant refill for job {job_id} failed: {e}")
+
+async def _claim_variant_slots(db: AsyncSession, job_id: int) -> List[Tuple[int, str]]:
+    """
+    Reserves the missing places of a job's pool with placeholder variants.
+
+    Every worker refills pools on its own, so the pool is counted (placeholders
+    included) and topped up under a lock on the job row: concurrent refills of the
+    same job never claim the same places, and only claimed places are generated.
+    Placeholders older than ``_VARIANT_CLAIM_TIMEOUT`` belong to a worker that died
+    mid-generation and are replaced.
+
+    Returns:
+        ID and personalization seed of every placeholder claimed
+    """
+    await db.execute(select(models.Job.id).where(models.Job.id == job_id).with_for_update())
+    await db.execute(delete(models.ProjectVariant).where(
+        models.ProjectVariant.job_id == job_id,
+        models.ProjectVariant.generated_at.is_(None),
+        models.ProjectVariant.created_at < utc_now() - timedelta(seconds=_VARIANT_CLAIM_TIMEOUT)
+    ))
+    missing = settings.PROJECT_VARIANT_POOL_SIZE - await _count_available_variants(db, job_id)
+    placeholders = [
+        models.ProjectVariant(job_id=job_id, applicant_id=str(uuid.uuid4())[:8])
+        for _ in range(max(0, missing))
+    ]
+    db.add_all(placeholders)
+    await db.flush()
+    claimed = [(placeholder.id, placeholder.applicant_id) for placeholder in placeholders]
+    await db.commit()
+    return claimed
+
+async def _generate_variant(job: models.Job, variant_id: int, applicant_id: str) -> bool:
+    """
+    Generates a personalized variant of a job's project into a claimed placeholder.
+
+    The placeholder is deleted when generation fails or is cancelled, freeing its
+    place for the next refill.
+
+    Returns:
+        Whether generation succeeded
+    """
+    global _variant_generation_slots
+    if _variant_generation_slots is None:
+        _variant_generation_slots = asyncio.Semaphore(max(1, settings.PROJECT_VARIANT_CONCURRENCY))
+
+    try:
+        async with _variant_generation_slots:
+            project_data = await openai_service.generate_project_dict_async(
+                job_title=job.title,
+                tech_skills=job.tech_skills,
+                soft_skills=job.soft_skills,
+                industry=job.industry,
+                applicant_id=applicant_id
+            )
+    except asyncio.CancelledError:
+        await _release_placeholder(variant_id)
+        raise
+    except Exception as e:
+        metrics.PROJECT_VARIANTS_GENERATED.labels(outcome="error").inc()
+        logger.warning(f"Project variant generation for job {job.id} failed: {e}")
+        await _release_placeholder(variant_id)
+        return False
+
+    async with AsyncSessionLocal() as db:
+        stored_id = await db.scalar(
+            update(models.ProjectVariant).where(
+                models.ProjectVariant.id == variant_id,
+                models.ProjectVariant.generated_at.is_(None)
+            ).values(
+                title=project_data.get("title", "Assessment Project"),
+                objective=project_data.get("objective", "Complete the multi-phase assessment"),
+                phases=project_data.get("phases", []),
+                generated_at=utc_now()
+            ).returning(models.ProjectVariant.id)
+        )
+        await db.commit()
+    if stored_id is None:
+        # Generation outlived the claim timeout and the placeholder was replaced
+        metrics.PROJECT_VARIANTS_GENERATED.labels(outcome="expired").inc()
+        return True
+    metrics.PROJECT_VARIANTS_GENERATED.labels(outcome="success").inc()
+    return True
+
+async def _release_placeholder(variant_id: int) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(models.ProjectVariant).where(
+            models.ProjectVariant.id == variant_id,
+            models.ProjectVariant.generated_at.is_(None)
+        ))
+        await db.commit()
+
+async def _count_available_variants(db: AsyncSession, job_id: int) -> int:
+    """Number of a job's variants not yet assigned to a candidate, including those being generated."""
+    return await db.scalar(
+        select(func.count()).select_from(models.ProjectVariant).where(
+            models.ProjectVariant.job_id == job_id,
+            models.ProjectVariant.candidate_id.is_(None)
+        )
+    )
@@ -0,0 +1,136 @@
+"""
+Ranking Streams
+
+Shares one ranking computation per job among all open ranking streams. The first
+viewer of a job starts a broadcaster that subscribes to ``rankings_topic(job_id)``,
+takes the initial snapshot and, after every (debounced) change, computes the
+rankings once, diffs them against the previous snapshot and hands the same
+``update`` to every viewer. The broadcaster stops with the job's last viewer.
+
+Usage:
+    async with ranking_stream.watch(job_id) as (rankings, frames):
+        ...  # rankings: current entries; frames: queue of ("update", data) tuples
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.core.events import SUBSCRIBER_QUEUE_SIZE, event_bus
+from app.services import evaluation_service
+
+logger = logging.getLogger(__name__)
+
+
+class RankingBroadcaster:
+    """Snapshot, change subscription and viewer queues of one job's ranking streams."""
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self.rankings: Dict[str, dict] = {}
+        self.viewers: Set[asyncio.Queue] = set()
+        # Open watch() blocks, including those still waiting for the first snapshot
+        self.watchers = 0
+        self.error: Optional[Exception] = None
+        self._ready = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def join(self) -> Tuple[List[dict], asyncio.Queue]:
+        """
+        Adds a viewer and returns the current rankings with the viewer's frame queue.
+
+        The snapshot and the queue are taken together, so the queue receives exactly
+        the updates that follow that snapshot.
+        """
+        await self._ready.wait()
+        if self.error is not None:
+            raise self.error
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.viewers.add(queue)
+        return list(self.rankings.values()), queue
+
+    async def close(self) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        # Subscribe before taking the snapshot so no change in between is missed
+        with event_bus.subscribe(evaluation_service.rankings_topic(self.job_id)) as changes:
+            try:
+                self.rankings = await self._snapshot("snapshot")
+            except Exception as e:
+                self.error = e
+                return
+            finally:
+                self._ready.set()
+
+            while True:
+                await changes.get()
+                # Collect a burst of changes into a single recomputation
+                await asyncio.sleep(settings.RANKING_STREAM_DEBOUNCE)
+                while not changes.empty():
+                    changes.get_nowait()
+
+                try:
+                    current = await self._snapshot("update")
+                except Exception as e:
+                    logger.error(f"Ranking stream update for job {self.job_id} failed: {e}")
+                    continue
+                changed, removed = evaluation_service.diff_rankings(self.rankings, current)
+                self.rankings = current
+                if changed or removed:
+                    self._broadcast(("update", {"changed": changed, "removed": removed}))
+
+    async def _snapshot(self, kind: str) -> Dict[str, dict]:
+        metrics.RANKING_STREAM_COMPUTATIONS.labels(kind=kind).inc()
+        # A short-lived session per computation: no connection is held between events
+        async with AsyncSessionLocal() as db:
+            rankings = await evaluation_service.rank_candidates_for_job(db=db, job_id=self.job_id, include_ids=True)
+        return {ranking["candidate_id"]: ranking for ranking in rankings}
+
+    def _broadcast(self, frame: Tuple[str, dict]) -> None:
+        for queue in self.viewers:
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                # A viewer too slow to take its updates starts over from a full snapshot
+                logger.warning(f"Resynchronizing a slow ranking stream of job {self.job_id}")
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(("snapshot", {"rankings": list(self.rankings.values())}))
+
+
+_broadcasters: Dict[int, RankingBroadcaster] = {}
+
+
+@asynccontextmanager
+async def watch(job_id: int) -> AsyncIterator[Tuple[List[dict], asyncio.Queue]]:
+    """
+    Follows a job's rankings for the duration of the block.
+
+    Yields:
+        The current ranking entries, and a queue of ``(event, data)`` frames with the
+        ``update`` events that follow them (or a ``snapshot`` after an overflow)
+    """
+    broadcaster = _broadcasters.get(job_id)
+    if broadcaster is None or broadcaster.error is not None:
+        broadcaster = _broadcasters[job_id] = RankingBroadcaster(job_id)
+
+    broadcaster.watchers += 1
+    queue = None
+    try:
+        rankings, queue = await broadcaster.join()
+        yield rankings, queue
+    finally:
+        broadcaster.watchers -= 1
+        broadcaster.viewers.discard(queue)
+        if not broadcaster.watchers and _broadcasters.get(job_id) is broadcaster:
+            del _broadcasters[job_id]
+            await broadcaster.close()
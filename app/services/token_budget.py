@@ -0,0 +1,110 @@
+"""
+Adaptive Completion Budgets
+
+Sizes ``max_tokens`` from what each method actually generates. Azure counts the
+requested ``max_tokens`` against the deployment's tokens-per-minute quota when a
+request is admitted, so a fixed 1500-token budget for evaluations that use ~600
+throttles far earlier than the real token usage requires.
+
+For the methods in ``LLM_TOKEN_BUDGET_METHODS``, ``max_tokens`` becomes the
+``LLM_TOKEN_BUDGET_PERCENTILE`` of the method's recent ``completion_tokens`` plus
+``LLM_TOKEN_BUDGET_MARGIN``, never above the method's own static value. A
+completion cut off at the budget (finish_reason ``length``) raises it by
+``LENGTH_GROWTH`` for the next ``MIN_SAMPLES`` calls, while the censored sample
+pushes the percentile up.
+
+Current budgets are exported as ``arya_llm_token_budget`` and listed by
+``GET /health/llm``.
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+from app.core import metrics
+from app.core.config import settings
+
+# Completions a method needs before its budget adapts
+MIN_SAMPLES = 30
+
+# Factor applied to the budget after a completion was cut off
+LENGTH_GROWTH = 1.5
+
+
+class TokenBudget:
+    """Per-method windows of completion sizes and the resulting ``max_tokens``."""
+
+    def __init__(self, methods, percentile: float, margin: float, window: int):
+        self.methods = set(methods)
+        self.percentile = percentile
+        self.margin = margin
+        self.window = window
+        # Sync calls observe from worker threads
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[int]] = {}
+        self._ceilings: Dict[str, int] = {}
+        # method -> (raised budget, calls it still applies to)
+        self._raised: Dict[str, Tuple[int, int]] = {}
+
+    @classmethod
+    def from_settings(cls) -> "TokenBudget":
+        methods = [method.strip() for method in settings.LLM_TOKEN_BUDGET_METHODS.split(",") if method.strip()]
+        return cls(
+            methods,
+            percentile=settings.LLM_TOKEN_BUDGET_PERCENTILE,
+            margin=settings.LLM_TOKEN_BUDGET_MARGIN,
+            window=settings.LLM_TOKEN_BUDGET_WINDOW,
+        )
+
+    def apply(self, method: str, request: dict) -> dict:
+        """Returns ``request`` with ``max_tokens`` set to the method's current budget."""
+        ceiling = request.get("max_tokens")
+        if method not in self.methods or not ceiling:
+            return request
+        with self._lock:
+            self._ceilings[method] = ceiling
+            budget = self._budget(method, ceiling)
+            raised = self._raised.get(method)
+            if raised is not None:
+                budget = max(budget, min(ceiling, raised[0]))
+                if raised[1] <= 1:
+                    del self._raised[method]
+                else:
+                    self._raised[method] = (raised[0], raised[1] - 1)
+        metrics.LLM_TOKEN_BUDGET.labels(method=method).set(budget)
+        return {**request, "max_tokens": budget}
+
+    def observe(self, method: str, completion_tokens: int, finish_reason: str, max_tokens: int) -> None:
+        """Records one completion's size; a ``length`` finish raises the budget."""
+        if method not in self.methods or completion_tokens is None:
+            return
+        with self._lock:
+            self._samples.setdefault(method, deque(maxlen=self.window)).append(completion_tokens)
+            if finish_reason == "length" and max_tokens:
+                self._raised[method] = (math.ceil(max_tokens * LENGTH_GROWTH), MIN_SAMPLES)
+                metrics.LLM_TOKEN_BUDGET_RAISES.labels(method=method).inc()
+
+    def _budget(self, method: str, ceiling: int) -> int:
+        samples = self._samples.get(method)
+        if samples is None or len(samples) < MIN_SAMPLES:
+            return ceiling
+        ordered = sorted(samples)
+        high = ordered[int(self.percentile * (len(ordered) - 1))]
+        return min(ceiling, math.ceil(high * (1 + self.margin)))
+
+    def status(self) -> Dict[str, dict]:
+        """Current budget, static ceiling and sample count of every method seen so far."""
+        with self._lock:
+            return {
+                method: {
+                    "max_tokens": max(
+                        self._budget(method, ceiling),
+                        min(ceiling, self._raised.get(method, (0, 0))[0])
+                    ),
+                    "ceiling": ceiling,
+                    "samples": len(self._samples.get(method, ())),
+                    "raised": method in self._raised,
+                }
+                for method, ceiling in self._ceilings.items()
+            }
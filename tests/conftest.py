@@ -0,0 +1,43 @@
+"""
+Shared test setup.
+
+Tests run offline: settings point at a throw-away SQLite database and a dummy Azure
+OpenAI endpoint, and model calls are served by local stand-ins (see ``stubs``).
+The environment is set before ``app`` is imported, since the engines and clients
+are created at import time.
+"""
+
+import os
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="arya-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+os.environ.setdefault("AZURE_OPENAI_API_KEY", "test-key")
+os.environ.setdefault("AZURE_OPENAI_API_BASE", "https://example.openai.azure.com/")
+os.environ.setdefault("AZURE_OPENAI_API_VERSION", "2024-12-01-preview")
+os.environ.setdefault("AZURE_OPENAI_DEPLOYMENT_NAME", "test-deployment")
+os.environ["OPENAI_HTTP_WARMUP_CONNECTIONS"] = "0"
+
+import pytest
+
+from app import models  # noqa: F401  (registers the tables)
+from app.core import cache
+from app.core.db import Base, SessionLocal, engine
+
+
+@pytest.fixture(autouse=True)
+def database():
+    """Fresh tables and an empty cache for every test."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    cache._backend = None
+    yield
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
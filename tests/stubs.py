@@ -0,0 +1,64 @@
+"""
+Local stand-in for Azure OpenAI.
+
+Serves chat completions through an ``httpx.MockTransport``, so the real openai
+clients (URL building, error mapping, retries) are exercised without a network.
+"""
+
+import asyncio
+import json
+from typing import Callable, List, Tuple, Union
+
+import httpx
+from openai import AsyncAzureOpenAI
+
+# A reply is the completion's content, or an HTTP status code to fail with
+Reply = Union[str, int]
+
+
+class StandInAzureOpenAI:
+    """Answers ``/openai/deployments/<deployment>/chat/completions`` with ``reply``."""
+
+    def __init__(self, reply: Callable[[str, str, dict], Reply], delay: float = 0.0):
+        self.reply = reply
+        self.delay = delay
+        # (endpoint host, deployment, request body) of every request received
+        self.requests: List[Tuple[str, str, dict]] = []
+        # Requests answered, i.e. not abandoned by the client during ``delay``
+        self.answered = 0
+
+    def async_client(self, api_base: str = "https://example.openai.azure.com/") -> AsyncAzureOpenAI:
+        return AsyncAzureOpenAI(
+            api_key="test-key",
+            api_version="2024-12-01-preview",
+            azure_endpoint=api_base,
+            max_retries=0,
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(self._handle)),
+        )
+
+    def deployments(self) -> List[str]:
+        return [deployment for _, deployment, _ in self.requests]
+
+    async def _handle(self, request: httpx.Request) -> httpx.Response:
+        deployment = request.url.path.split("/deployments/")[1].split("/")[0]
+        body = json.loads(request.content)
+        self.requests.append((request.url.host, deployment, body))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+
+        self.answered += 1
+        reply = self.reply(request.url.host, deployment, body)
+        if isinstance(reply, int):
+            return httpx.Response(reply, json={"error": {"code": str(reply), "message": "stand-in failure"}})
+        return httpx.Response(200, json={
+            "id": "chatcmpl-stand-in",
+            "object": "chat.completion",
+            "created": 0,
+            "model": deployment,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": reply},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120},
+        })
@@ -0,0 +1,58 @@
+import uuid
+from pathlib import Path
+
+from app import batch, models
+
+RESULTS = Path(__file__).parent / "fixtures" / "batch_results.jsonl"
+
+KNOWN = [uuid.UUID(f"{digit * 8}-{digit * 4}-{digit * 4}-{digit * 4}-{digit * 12}") for digit in "abde"]
+
+
+def _add_candidates(db):
+    job = models.Job(title="Backend Developer", industry="Tech", tech_skills=["Python", "SQL"], soft_skills=[], job_description="")
+    db.add(job)
+    db.flush()
+    for candidate_id in KNOWN:
+        db.add(models.Candidate(id=candidate_id, job_id=job.id, name="c", email=f"{candidate_id}@example.com"))
+    db.commit()
+
+
+def test_parse_batch_results_repairs_and_flags_unusable_lines():
+    with RESULTS.open(encoding="utf-8") as lines:
+        parsed = list(batch.parse_batch_results(lines))
+
+    assert [candidate_id for candidate_id, _ in parsed] == [
+        KNOWN[0], KNOWN[1], uuid.UUID("cccccccc-cccc-cccc-cccc-cccccccccccc"), KNOWN[2], KNOWN[3], None
+    ]
+    evaluations = [evaluation for _, evaluation in parsed]
+    assert evaluations[0]["match_score"] == 82
+    # Trailing comma repaired
+    assert evaluations[1]["skills_gaps"] == ["SQL"]
+    # Failed request, truncated completion, malformed line
+    assert evaluations[3:] == [None, None, None]
+
+
+def test_ingest_results_skips_unknown_candidates_and_malformed_lines(db):
+    _add_candidates(db)
+
+    with RESULTS.open(encoding="utf-8") as lines:
+        stored, failed = batch.ingest_results(db, lines)
+
+    # Stored: a, b; failed: unknown c, d (500), e (truncated), malformed line
+    assert (stored, failed) == (2, 4)
+    db.expire_all()
+    evaluations = {
+        candidate.id: candidate.cv_evaluation
+        for candidate in db.query(models.Candidate).all()
+    }
+    assert evaluations[KNOWN[0]]["match_score"] == 82
+    assert evaluations[KNOWN[1]]["match_score"] == 64
+    assert evaluations[KNOWN[2]] is None and evaluations[KNOWN[3]] is None
+
+
+def test_ingest_results_rerun_is_idempotent(db):
+    _add_candidates(db)
+
+    for _ in range(2):
+        with RESULTS.open(encoding="utf-8") as lines:
+            assert batch.ingest_results(db, lines) == (2, 4)
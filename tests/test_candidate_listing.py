@@ -0,0 +1,47 @@
+from fastapi.testclient import TestClient
+
+from app import models
+from app.main import app
+
+
+def _add_job_with_candidates(db, count):
+    job = models.Job(title="Backend Developer", industry="Tech", tech_skills=["Python"], soft_skills=[], job_description="")
+    db.add(job)
+    db.flush()
+    # Inserted back to back, i.e. within the same second
+    for i in range(count):
+        db.add(models.Candidate(
+            job_id=job.id,
+            name=f"Candidate {i}",
+            email=f"candidate{i}@example.com",
+            cv_evaluation={"match_score": 50 + i, "skills_coverage": ["Python"], "skills_gaps": []}
+        ))
+    db.commit()
+    return job.id
+
+
+def _page_through(client, url, params):
+    seen, cursor = [], None
+    for _ in range(100):
+        response = client.get(url, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        body = response.json()
+        seen += [item["id"] for item in body["items"]]
+        cursor = body.get("next_cursor")
+        if cursor is None:
+            return seen
+    raise AssertionError("Pagination did not terminate")
+
+
+def test_paging_returns_every_candidate_exactly_once(db):
+    job_id = _add_job_with_candidates(db, 5)
+    expected = {str(candidate.id) for candidate in db.query(models.Candidate).all()}
+
+    with TestClient(app) as client:
+        seen = _page_through(client, f"/api/v1/jobs/{job_id}/candidates", {"limit": 1})
+        assert len(seen) == len(expected)
+        assert set(seen) == expected
+
+        # Search filters page over the same keyset
+        seen = _page_through(client, f"/api/v1/jobs/{job_id}/candidates", {"limit": 2, "skill": "Python", "min_score": 51})
+        assert len(seen) == len(set(seen)) == 4
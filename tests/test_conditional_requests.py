@@ -0,0 +1,66 @@
+from fastapi.testclient import TestClient
+
+from app import models
+from app.core import metrics
+from app.main import app
+
+
+def _add_job_with_candidate(db):
+    job = models.Job(title="Backend Developer", industry="Tech", tech_skills=["Python"], soft_skills=[], job_description="")
+    db.add(job)
+    db.flush()
+    candidate = models.Candidate(job_id=job.id, name="Candidate", email="candidate@example.com")
+    db.add(candidate)
+    db.commit()
+    return job, candidate
+
+
+def test_rankings_etag_changes_on_a_write_within_the_same_second(db):
+    job, candidate = _add_job_with_candidate(db)
+
+    with TestClient(app) as client:
+        first = client.get(f"/api/v1/jobs/{job.id}/rankings")
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+        assert client.get(f"/api/v1/jobs/{job.id}/rankings", headers={"If-None-Match": etag}).status_code == 304
+
+        # CV evaluated right after registration
+        candidate.cv_evaluation = {"match_score": 80}
+        db.commit()
+
+        second = client.get(f"/api/v1/jobs/{job.id}/rankings", headers={"If-None-Match": etag})
+        assert second.status_code == 200
+        assert second.headers["ETag"] != etag
+
+
+def test_last_modified_from_the_current_second_is_not_sent(db):
+    job, _ = _add_job_with_candidate(db)
+
+    with TestClient(app) as client:
+        response = client.get(f"/api/v1/jobs/{job.id}/rankings")
+        assert "ETag" in response.headers
+        assert "Last-Modified" not in response.headers
+
+
+def _job_cache_lookups():
+    return sum(
+        metrics.CACHE_REQUESTS.labels(cache="job", result=result)._value.get()
+        for result in ("hit", "miss")
+    )
+
+
+def test_job_details_read_the_job_cache_once(db):
+    job, _ = _add_job_with_candidate(db)
+
+    with TestClient(app) as client:
+        client.get(f"/api/v1/jobs/{job.id}")
+
+        before = _job_cache_lookups()
+        response = client.get(f"/api/v1/jobs/{job.id}")
+        assert response.status_code == 200
+        assert _job_cache_lookups() - before == 1
+
+        before = _job_cache_lookups()
+        not_modified = client.get(f"/api/v1/jobs/{job.id}", headers={"If-None-Match": response.headers["ETag"]})
+        assert not_modified.status_code == 304
+        assert _job_cache_lookups() - before == 1
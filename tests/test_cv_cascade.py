@@ -0,0 +1,79 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.services.openai_service import OpenAIService
+from tests.stubs import StandInAzureOpenAI
+
+CV_EVALUATION = {
+    "match_score": 64,
+    "experience_match": 60,
+    "skills_coverage": ["Python"],
+    "skills_gaps": ["Kubernetes"],
+    "strengths": ["Backend services"],
+    "development_areas": ["Operations"],
+    "overall_assessment": "Solid backend profile.",
+    "interview_recommendations": ["Deployment experience"],
+}
+
+
+@pytest.fixture(autouse=True)
+def uncertain_band(monkeypatch):
+    monkeypatch.setattr(settings, "CV_CASCADE_UNCERTAIN_MIN", 40)
+    monkeypatch.setattr(settings, "CV_CASCADE_UNCERTAIN_MAX", 70)
+
+
+def _cascade(fast_reply):
+    backend = StandInAzureOpenAI(
+        lambda host, deployment, body: fast_reply if deployment == "fast" else json.dumps(CV_EVALUATION)
+    )
+    service = OpenAIService()
+    service.deployment_name = "strong"
+    service.fast_deployment_name = "fast"
+    # The fast tier shares the main client, as without CV_CASCADE_FAST_API_BASE
+    service.async_client = backend.async_client()
+
+    evaluation = asyncio.run(
+        service.evaluate_cv_cascade_async("Python developer", "Backend Developer", ["Python"], ["Teamwork"], "Tech")
+    )
+    return evaluation, backend.deployments()
+
+
+@pytest.mark.parametrize("score", [12, 91])
+def test_clear_fast_scores_are_kept(score):
+    evaluation, deployments = _cascade(json.dumps({"match_score": score}))
+
+    assert deployments == ["fast"]
+    assert evaluation["match_score"] == score
+    assert evaluation["cascade_tier"] == "fast"
+    # Only the overall match is estimated by the fast tier
+    assert "experience_match" not in evaluation
+
+
+def test_uncertain_fast_scores_are_escalated():
+    evaluation, deployments = _cascade(json.dumps({"match_score": 55}))
+
+    assert deployments == ["fast", "strong"]
+    assert evaluation["match_score"] == CV_EVALUATION["match_score"]
+    assert "cascade_tier" not in evaluation
+
+
+def test_failed_fast_scoring_is_escalated():
+    evaluation, deployments = _cascade("I'd say about fifty-five")
+
+    assert deployments == ["fast", "strong"]
+    assert evaluation["skills_gaps"] == ["Kubernetes"]
+
+
+def test_without_a_fast_deployment_every_cv_gets_the_full_evaluation():
+    backend = StandInAzureOpenAI(lambda host, deployment, body: json.dumps(CV_EVALUATION))
+    service = OpenAIService()
+    service.deployment_name = "strong"
+    service.fast_deployment_name = ""
+    service.async_client = backend.async_client()
+
+    asyncio.run(service.evaluate_cv_cascade_async("Python developer", "Backend Developer", ["Python"], [], "Tech"))
+
+    assert backend.deployments() == ["strong"]
@@ -0,0 +1,137 @@
+import asyncio
+import time
+
+import openai
+import pytest
+
+from app.core.config import settings
+from app.services.deployment_pool import CLOSED, OPEN, Deployment, DeploymentPool, DeploymentUnavailableError
+from app.services.openai_service import OpenAIService
+from tests.stubs import StandInAzureOpenAI
+
+EAST = "https://east.openai.azure.com/"
+WEST = "https://west.openai.azure.com/"
+
+
+@pytest.fixture(autouse=True)
+def no_retries(monkeypatch):
+    monkeypatch.setattr(settings, "OPENAI_MAX_RETRIES", 0)
+
+
+def _service(backend, weights=(1, 1), failure_threshold=2, reset_timeout=60.0):
+    deployments = []
+    for name, api_base, weight in (("east", EAST, weights[0]), ("west", WEST, weights[1])):
+        deployment = Deployment(name=name, api_base=api_base, api_key="test-key", deployment=f"gpt-{name}", weight=weight)
+        deployment.async_client = backend.async_client(api_base)
+        deployments.append(deployment)
+
+    service = OpenAIService()
+    service.pool = DeploymentPool(deployments, failure_threshold=failure_threshold, reset_timeout=reset_timeout)
+    return service
+
+
+def _call(service):
+    return service._complete_async(
+        "evaluate_submission",
+        model=service.deployment_name,
+        messages=[{"role": "user", "content": "ping"}],
+    )
+
+
+def _hosts(backend):
+    return [host.split(".")[0] for host, _, _ in backend.requests]
+
+
+def test_concurrent_calls_are_spread_by_weight():
+    backend = StandInAzureOpenAI(lambda host, deployment, body: "{}", delay=0.02)
+    service = _service(backend, weights=(2, 1))
+
+    async def burst():
+        await asyncio.gather(*(_call(service) for _ in range(30)))
+
+    asyncio.run(burst())
+
+    assert _hosts(backend).count("east") == 20
+    assert _hosts(backend).count("west") == 10
+    # The pool's deployment name replaces the main one
+    assert {deployment for _, deployment, _ in backend.requests} == {"gpt-east", "gpt-west"}
+
+
+def test_throttled_deployment_is_taken_out_of_rotation():
+    backend = StandInAzureOpenAI(lambda host, deployment, body: 429 if host.startswith("west") else "{}")
+    service = _service(backend, failure_threshold=2)
+    west = service.pool.deployments[1]
+
+    async def calls(count):
+        for _ in range(count):
+            try:
+                await _call(service)
+            except openai.RateLimitError:
+                pass
+
+    asyncio.run(calls(4))
+    assert _hosts(backend) == ["east", "west", "east", "west"]
+    assert west.state == OPEN
+
+    asyncio.run(calls(3))
+    assert _hosts(backend)[4:] == ["east", "east", "east"]
+
+
+def test_half_open_probe_closes_the_breaker_on_success():
+    west_healthy = False
+    backend = StandInAzureOpenAI(
+        lambda host, deployment, body: "{}" if west_healthy or host.startswith("east") else 503
+    )
+    service = _service(backend, failure_threshold=1, reset_timeout=0.05)
+    west = service.pool.deployments[1]
+
+    async def call():
+        try:
+            await _call(service)
+        except openai.InternalServerError:
+            pass
+
+    asyncio.run(call())
+    asyncio.run(call())
+    assert west.state == OPEN
+
+    # A failed probe re-opens the breaker
+    time.sleep(0.06)
+    asyncio.run(call())
+    assert _hosts(backend)[-1] == "west"
+    assert west.state == OPEN
+
+    west_healthy = True
+    time.sleep(0.06)
+    asyncio.run(call())
+    assert _hosts(backend)[-1] == "west"
+    assert west.state == CLOSED
+    assert west.consecutive_failures == 0
+
+
+def test_rejected_requests_do_not_open_the_breaker():
+    backend = StandInAzureOpenAI(lambda host, deployment, body: 400)
+    service = _service(backend, failure_threshold=1)
+
+    async def calls():
+        for _ in range(4):
+            with pytest.raises(openai.BadRequestError):
+                await _call(service)
+
+    asyncio.run(calls())
+    assert [deployment.state for deployment in service.pool.deployments] == [CLOSED, CLOSED]
+
+
+def test_all_breakers_open_raises():
+    backend = StandInAzureOpenAI(lambda host, deployment, body: 500)
+    service = _service(backend, failure_threshold=1)
+
+    async def calls():
+        for _ in range(2):
+            with pytest.raises(openai.InternalServerError):
+                await _call(service)
+        with pytest.raises(DeploymentUnavailableError):
+            await _call(service)
+
+    asyncio.run(calls())
+    assert len(backend.requests) == 2
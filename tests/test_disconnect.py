@@ -0,0 +1,98 @@
+import asyncio
+import json
+
+import pytest
+
+from app import models
+from app.core import metrics
+from app.core.disconnect import CLIENT_CLOSED_REQUEST
+from app.main import app
+from app.services.openai_service import openai_service
+from tests.stubs import StandInAzureOpenAI
+
+SUBMISSION_EVALUATION = {
+    "hiring_recommendation": "Recommend", "overall_score": 80, "technical_score": 80,
+    "cultural_fit_score": 80, "problem_solving_score": 80, "communication_score": 80,
+    "technical_strengths": [], "technical_weaknesses": [], "behavioral_strengths": [],
+    "behavioral_weaknesses": [], "red_flags": [], "interview_questions": [], "hiring_manager_summary": "ok",
+}
+
+
+async def _post_and_disconnect(path: str, body: dict, backend: StandInAzureOpenAI) -> int:
+    """
+    Sends a JSON POST straight through the ASGI app and disconnects as soon as the
+    model call reached the backend. Returns the response status.
+    """
+    payload = json.dumps(body).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "client": ("127.0.0.1", 50000), "server": ("testserver", 80),
+        "headers": [(b"host", b"testserver"), (b"content-type", b"application/json"),
+                    (b"content-length", str(len(payload)).encode())],
+    }
+    messages = [{"type": "http.request", "body": payload, "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        while not backend.requests:
+            await asyncio.sleep(0.005)
+        return {"type": "http.disconnect"}
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return next(message["status"] for message in sent if message["type"] == "http.response.start")
+
+
+def _cancelled(endpoint):
+    return metrics.CANCELLED_WORK.labels(endpoint=endpoint)._value.get()
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """Stand-in whose completions take long enough for the client to leave first."""
+    backend = StandInAzureOpenAI(lambda host, deployment, body: json.dumps(SUBMISSION_EVALUATION), delay=0.3)
+    monkeypatch.setattr(openai_service, "async_client", backend.async_client())
+    return backend
+
+
+def test_disconnect_cancels_the_model_call(db, backend):
+    before = _cancelled("create_job_and_assessment")
+
+    status = asyncio.run(_post_and_disconnect(
+        "/api/v1/jobs", {"job_description": "Backend Developer, Python"}, backend
+    ))
+
+    assert status == CLIENT_CLOSED_REQUEST
+    assert len(backend.requests) == 1
+    assert backend.answered == 0
+    assert _cancelled("create_job_and_assessment") - before == 1
+    assert db.query(models.Job).count() == 0
+
+
+def test_endpoints_not_cancelled_on_disconnect_still_store_their_result(db, backend):
+    job = models.Job(title="Backend Developer", industry="Tech", tech_skills=["Python"], soft_skills=[], job_description="")
+    db.add(job)
+    db.flush()
+    db.add(models.Project(job_id=job.id, title="Project", objective="Build it", phases=[{"phase": 1, "task": "Build an API"}]))
+    candidate = models.Candidate(job_id=job.id, name="Candidate", email="candidate@example.com")
+    db.add(candidate)
+    db.commit()
+    before = _cancelled("create_submission")
+
+    status = asyncio.run(_post_and_disconnect(
+        f"/api/v1/candidates/{candidate.id}/submissions",
+        {"phase_number": 1, "primary_submission": "https://github.com/example/solution"},
+        backend
+    ))
+
+    assert status == 201
+    assert backend.answered == 1
+    assert _cancelled("create_submission") == before
+    db.expire_all()
+    assert db.query(models.Submission).one().evaluation["overall_score"] == 80
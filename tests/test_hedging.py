@@ -0,0 +1,54 @@
+import asyncio
+
+from app.services.hedging import MIN_SAMPLES, HedgePolicy
+
+
+def _policy():
+    policy = HedgePolicy(["evaluate_submission"], percentile=0.9, max_rate=1.0, min_delay=0.01, window=100)
+    for _ in range(MIN_SAMPLES):
+        policy.observe("evaluate_submission", 0.01)
+    return policy
+
+
+def test_losing_attempt_is_finished_before_the_winner_is_returned():
+    policy = _policy()
+    calls = []
+    cleaned_up = []
+
+    async def attempt():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            try:
+                await asyncio.sleep(5)
+            finally:
+                # e.g. returning the HTTP connection to the pool
+                await asyncio.sleep(0)
+                cleaned_up.append("primary")
+        return "hedge"
+
+    assert asyncio.run(policy.run("evaluate_submission", attempt)) == "hedge"
+    assert cleaned_up == ["primary"]
+
+
+def test_cancelled_caller_waits_for_its_attempts():
+    policy = _policy()
+    cleaned_up = []
+
+    async def attempt():
+        try:
+            await asyncio.sleep(5)
+        finally:
+            await asyncio.sleep(0)
+            cleaned_up.append(True)
+
+    async def main():
+        call = asyncio.ensure_future(policy.run("evaluate_submission", attempt))
+        await asyncio.sleep(0.05)
+        call.cancel()
+        try:
+            await call
+        except asyncio.CancelledError:
+            pass
+        return list(cleaned_up)
+
+    assert asyncio.run(main()) == [True, True]
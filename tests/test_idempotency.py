@@ -0,0 +1,167 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import models
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.main import app
+from app.services import idempotency_service
+from app.services.openai_service import openai_service
+
+SCOPE = "POST /candidates/c/submissions"
+BODY = b'{"phase_number": 1}'
+
+
+class Work:
+    """Counts runs; a run waits for ``release`` when one is given."""
+
+    def __init__(self, result=None, release=None):
+        self.result = result if result is not None else {"overall_score": 80}
+        self.release = release
+        self.runs = 0
+
+    async def __call__(self):
+        self.runs += 1
+        if self.release is not None:
+            await self.release.wait()
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+async def _run(work, key="key-1", payload=BODY):
+    async with AsyncSessionLocal() as session:
+        return await idempotency_service.run_idempotent(session, key, SCOPE, payload, work)
+
+
+@pytest.fixture(autouse=True)
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(idempotency_service, "_POLL_INTERVAL", 0.01)
+
+
+def test_same_key_and_body_replays_the_stored_response():
+    work = Work()
+
+    assert asyncio.run(_run(work)) == ({"overall_score": 80}, False)
+    assert asyncio.run(_run(work)) == ({"overall_score": 80}, True)
+    assert work.runs == 1
+
+
+def test_same_key_with_a_different_body_is_rejected():
+    asyncio.run(_run(Work()))
+
+    with pytest.raises(idempotency_service.IdempotencyConflict) as e:
+        asyncio.run(_run(Work(), payload=b'{"phase_number": 2}'))
+    assert e.value.status_code == 422
+
+
+def test_concurrent_duplicate_waits_and_replays():
+    async def race():
+        release = asyncio.Event()
+        work = Work(release=release)
+        original = asyncio.ensure_future(_run(work))
+        await asyncio.sleep(0.05)
+        duplicate = asyncio.ensure_future(_run(work))
+        await asyncio.sleep(0.05)
+        assert not duplicate.done()
+        release.set()
+        return await original, await duplicate, work.runs
+
+    original, duplicate, runs = asyncio.run(race())
+
+    assert original == ({"overall_score": 80}, False)
+    assert duplicate == ({"overall_score": 80}, True)
+    assert runs == 1
+
+
+def test_duplicate_gives_up_after_the_wait_timeout(monkeypatch):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_WAIT_TIMEOUT", 0.05)
+
+    async def race():
+        release = asyncio.Event()
+        original = asyncio.ensure_future(_run(Work(release=release)))
+        await asyncio.sleep(0.02)
+        try:
+            with pytest.raises(idempotency_service.IdempotencyConflict) as e:
+                await _run(Work())
+            return e.value.status_code
+        finally:
+            release.set()
+            await original
+
+    assert asyncio.run(race()) == 409
+
+
+def test_failed_request_releases_its_key():
+    with pytest.raises(RuntimeError):
+        asyncio.run(_run(Work(result=RuntimeError("model unavailable"))))
+
+    work = Work()
+    assert asyncio.run(_run(work)) == ({"overall_score": 80}, False)
+    assert work.runs == 1
+
+
+def test_stale_claim_is_taken_over(db):
+    # Claimed by a process that died before finishing
+    db.add(models.IdempotencyKey(
+        scope=SCOPE, key="key-1", fingerprint=idempotency_service.fingerprint(BODY), status="in_progress",
+        created_at=datetime.now(timezone.utc) - timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT + 60)
+    ))
+    db.commit()
+
+    work = Work()
+    assert asyncio.run(_run(work)) == ({"overall_score": 80}, False)
+    assert work.runs == 1
+
+
+def test_fresh_claim_is_not_taken_over(db, monkeypatch):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_WAIT_TIMEOUT", 0.05)
+    db.add(models.IdempotencyKey(
+        scope=SCOPE, key="key-1", fingerprint=idempotency_service.fingerprint(BODY), status="in_progress"
+    ))
+    db.commit()
+
+    work = Work()
+    with pytest.raises(idempotency_service.IdempotencyConflict):
+        asyncio.run(_run(work))
+    assert work.runs == 0
+
+
+def test_submission_retry_is_replayed_over_http(db, monkeypatch):
+    evaluation = {
+        "hiring_recommendation": "Recommend", "overall_score": 80, "technical_score": 80,
+        "cultural_fit_score": 80, "problem_solving_score": 80, "communication_score": 80,
+        "technical_strengths": [], "technical_weaknesses": [], "behavioral_strengths": [],
+        "behavioral_weaknesses": [], "red_flags": [], "interview_questions": [], "hiring_manager_summary": "ok",
+    }
+    calls = []
+
+    async def evaluate(submission, phase_details):
+        calls.append(submission)
+        return evaluation
+
+    monkeypatch.setattr(openai_service, "evaluate_submission_async", evaluate)
+    job = models.Job(title="Backend Developer", industry="Tech", tech_skills=["Python"], soft_skills=[], job_description="")
+    db.add(job)
+    db.flush()
+    db.add(models.Project(job_id=job.id, title="Project", objective="Build it", phases=[{"phase": 1, "task": "Build an API"}]))
+    candidate = models.Candidate(job_id=job.id, name="Candidate", email="candidate@example.com")
+    db.add(candidate)
+    db.commit()
+
+    url = f"/api/v1/candidates/{candidate.id}/submissions"
+    body = {"phase_number": 1, "primary_submission": "https://github.com/example/solution"}
+    with TestClient(app) as client:
+        first = client.post(url, json=body, headers={"Idempotency-Key": "retry-1"})
+        retry = client.post(url, json=body, headers={"Idempotency-Key": "retry-1"})
+        reused = client.post(url, json={**body, "phase_number": 2}, headers={"Idempotency-Key": "retry-1"})
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert reused.status_code == 422
+    assert len(calls) == 1
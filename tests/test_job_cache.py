@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import models
+from app.core.db import AsyncSessionLocal
+from app.main import app
+from app.services import project_service
+
+
+def _add_job(db):
+    job = models.Job(title="Data Engineer", industry="Tech", tech_skills=["SQL"], soft_skills=[], job_description="")
+    db.add(job)
+    db.commit()
+    return job
+
+
+def test_job_title_fills_the_job_cache_on_a_miss(db):
+    job = _add_job(db)
+
+    async def lookups():
+        async with AsyncSessionLocal() as session:
+            title = await project_service.get_job_title(db=session, job_id=job.id)
+        cached = await project_service.job_cache.get(str(job.id))
+        return title, cached
+
+    title, cached = asyncio.run(lookups())
+    assert title == "Data Engineer"
+    assert cached is not None
+
+
+def test_job_title_of_an_unknown_job_raises():
+    async def lookup():
+        async with AsyncSessionLocal() as session:
+            return await project_service.get_job_title(db=session, job_id=404)
+
+    with pytest.raises(ValueError):
+        asyncio.run(lookup())
+
+
+def test_ranking_stream_of_an_unknown_job_is_not_found():
+    with TestClient(app) as client:
+        assert client.get("/api/v1/jobs/404/rankings/stream").status_code == 404
@@ -0,0 +1,103 @@
+import asyncio
+import json
+
+import pytest
+
+from app.api.v1 import schemas
+from app.services.json_repair import invalid_fields, repair_json
+from app.services.openai_service import OpenAIService
+from tests.stubs import StandInAzureOpenAI
+
+CV_EVALUATION = {
+    "match_score": 72,
+    "experience_match": 65,
+    "skills_coverage": ["Python", "SQL"],
+    "skills_gaps": ["Kubernetes"],
+    "strengths": ["API design"],
+    "development_areas": ["Operations", "Cloud cost control"],
+    "overall_assessment": "Strong backend profile.",
+    "interview_recommendations": ["Ask about on-call"],
+}
+
+
+def test_valid_json_is_not_repaired():
+    assert repair_json(json.dumps(CV_EVALUATION)) == (CV_EVALUATION, False)
+
+
+def test_fenced_output():
+    assert repair_json(f"```json\n{json.dumps(CV_EVALUATION)}\n```") == (CV_EVALUATION, True)
+
+
+def test_prose_around_the_object():
+    text = f"Here is the evaluation:\n{json.dumps(CV_EVALUATION)}\nLet me know if you need more."
+    assert repair_json(text) == (CV_EVALUATION, True)
+
+
+def test_trailing_commas():
+    assert repair_json('{"a": [1, 2,], "b": "x, }",}') == ({"a": [1, 2], "b": "x, }"}, True)
+
+
+def test_truncated_mid_string():
+    assert repair_json('{"a": "done", "b": "half-wri') == ({"a": "done"}, True)
+
+
+def test_truncated_mid_array():
+    assert repair_json('{"a": 1, "b": ["x", "y') == ({"a": 1, "b": ["x"]}, True)
+
+
+def test_truncated_number_is_dropped():
+    # "4" may be the start of "45"
+    assert repair_json('{"a": "x", "b": 4') == ({"a": "x"}, True)
+
+
+def test_truncated_nested_object():
+    assert repair_json('```json\n{"a": {"b": [1, {"c": "d"}, {"e": ') == ({"a": {"b": [1, {"c": "d"}, {}]}}, True)
+
+
+@pytest.mark.parametrize("text,expected", [
+    (None, (None, False)),
+    ("[1, 2]", (None, False)),
+    ("I cannot evaluate this CV.", (None, True)),
+    ("Score: {not json at all", (None, True)),
+    ('{"match_score": 7', (None, True)),
+])
+def test_unrecoverable_input(text, expected):
+    assert repair_json(text) == expected
+
+
+def test_invalid_fields_lists_missing_and_mistyped_fields():
+    data = {**CV_EVALUATION, "match_score": "high"}
+    del data["strengths"]
+    assert invalid_fields(schemas.CVEvaluationResponse, data) == ["match_score", "strengths"]
+    assert invalid_fields(schemas.CVEvaluationResponse, CV_EVALUATION) == []
+
+
+def test_truncated_evaluation_re_requests_only_the_missing_fields():
+    complete = json.dumps(CV_EVALUATION)
+    # Cut off in the middle of "Cloud cost control"
+    truncated = complete[:complete.index("Cloud cost") + 5]
+
+    def reply(host, deployment, body):
+        if len(body["messages"]) == 1:
+            return truncated
+        # The salvage answer may repeat fields; only the missing ones are used
+        return json.dumps({"match_score": 1, "overall_assessment": "Salvaged.", "interview_recommendations": []})
+
+    backend = StandInAzureOpenAI(reply)
+    service = OpenAIService()
+    service.async_client = backend.async_client()
+    request = service.cv_evaluation_request("Python developer", "Backend Developer", ["Python"], [], "Tech")
+
+    evaluation = asyncio.run(service._evaluate_async("evaluate_cv", schemas.CVEvaluationResponse, request))
+
+    assert len(backend.requests) == 2
+    salvage = backend.requests[1][2]
+    assert salvage["messages"][-2] == {"role": "assistant", "content": truncated}
+    assert salvage["messages"][-1]["content"].endswith(": interview_recommendations, overall_assessment")
+    assert salvage["max_tokens"] < request["max_tokens"]
+    assert evaluation == {
+        **CV_EVALUATION,
+        "development_areas": ["Operations"],
+        "overall_assessment": "Salvaged.",
+        "interview_recommendations": [],
+    }
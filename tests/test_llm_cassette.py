@@ -0,0 +1,91 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.services.llm_cassette import Cassette, CassetteMissError
+from app.services.openai_service import OpenAIService
+from tests.stubs import StandInAzureOpenAI
+
+CV_EVALUATION = {
+    "match_score": 58,
+    "experience_match": 50,
+    "skills_coverage": ["Python"],
+    "skills_gaps": ["Go"],
+    "strengths": ["Testing"],
+    "development_areas": ["Distributed systems"],
+    "overall_assessment": "Recorded evaluation.",
+    "interview_recommendations": [],
+}
+
+
+def _service(backend, cassette):
+    service = OpenAIService()
+    service.async_client = backend.async_client()
+    service.cassette = cassette
+    return service
+
+
+def _evaluate(service, cv_text="Python developer"):
+    return asyncio.run(service.evaluate_cv_async(cv_text, "Backend Developer", ["Python", "Go"], [], "Tech"))
+
+
+@pytest.fixture
+def recorded(tmp_path):
+    """Path of a cassette holding one evaluate_cv recording made through the stand-in."""
+    path = str(tmp_path / "cassette.sqlite3")
+    backend = StandInAzureOpenAI(lambda host, deployment, body: json.dumps(CV_EVALUATION))
+    assert _evaluate(_service(backend, Cassette("record", path))) == CV_EVALUATION
+    assert len(backend.requests) == 1
+    return path
+
+
+@pytest.fixture
+def unavailable():
+    """Backend that must not be reached during replay."""
+    return StandInAzureOpenAI(lambda host, deployment, body: 503)
+
+
+def test_recorded_response_is_replayed_without_the_backend(recorded, unavailable):
+    service = _service(unavailable, Cassette("replay", recorded, latency_scale=0))
+
+    assert _evaluate(service) == CV_EVALUATION
+    assert unavailable.requests == []
+
+
+def test_unrecorded_prompt_misses_with_exact_matching(recorded, unavailable):
+    service = _service(unavailable, Cassette("replay", recorded, latency_scale=0))
+
+    with pytest.raises(CassetteMissError):
+        _evaluate(service, cv_text="Go developer")
+    assert unavailable.requests == []
+
+
+def test_unrecorded_prompt_gets_a_recording_of_the_same_method(recorded, unavailable):
+    service = _service(unavailable, Cassette("replay", recorded, latency_scale=0, match="method"))
+
+    assert _evaluate(service, cv_text="Go developer") == CV_EVALUATION
+    with pytest.raises(CassetteMissError):
+        asyncio.run(service.score_cv_async("Go developer", "Backend Developer", ["Go"], [], "Tech"))
+    assert unavailable.requests == []
+
+
+def test_replay_waits_the_scaled_recorded_latency(tmp_path):
+    backend = StandInAzureOpenAI(lambda host, deployment, body: json.dumps(CV_EVALUATION))
+    service = _service(backend, None)
+    request = service.cv_evaluation_request("Python developer", "Backend Developer", ["Python"], [], "Tech")
+    response = asyncio.run(service._complete_async("evaluate_cv", **request))
+
+    path = str(tmp_path / "latency.sqlite3")
+    Cassette("record", path).record("evaluate_cv", request, response, latency=0.2)
+
+    cassette = Cassette("replay", path, latency_scale=0.5)
+    replayed, delay = cassette.lookup("evaluate_cv", request)
+    assert replayed == response
+    assert delay == pytest.approx(0.1)
+
+    start = time.perf_counter()
+    asyncio.run(cassette.replay_async("evaluate_cv", request))
+    assert time.perf_counter() - start >= 0.1
+    assert Cassette("replay", path, latency_scale=0).lookup("evaluate_cv", request)[1] == 0
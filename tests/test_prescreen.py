@@ -0,0 +1,49 @@
+import pytest
+
+from app.core.config import settings
+from app.services import prescreen_service
+
+BACKEND_CV = """
+Jane Doe - Senior Software Engineer
+Built data pipelines in Python 3.11 on Apache Spark and Kafka, deployed to AWS with
+Terraform. Designed RESTful services backed by Postgres; set up CI-CD with GitHub
+Actions and k8s. Mentored three engineers, strong team player.
+"""
+
+# (job tech skills, soft skills, skills the CV above provides evidence for)
+JOBS = [
+    (["Python (3.x)", "Big Data (Spark", "PostgreSQL"], ["Teamwork"], ["Python (3.x)", "Big Data (Spark", "PostgreSQL"]),
+    (["AWS/GCP", "Kubernetes (EKS or GKE)", "CI/CD"], [], ["AWS/GCP", "Kubernetes (EKS or GKE)", "CI/CD"]),
+    (["REST API", "Kafka / RabbitMQ", "Terraform (IaC)"], [], ["REST API", "Kafka / RabbitMQ", "Terraform (IaC)"]),
+    (["Java (Spring Boot)", "Python"], [], ["Python"]),
+]
+
+
+@pytest.mark.parametrize("tech_skills,soft_skills,expected", JOBS)
+def test_free_text_job_skills_match_a_realistic_cv(tech_skills, soft_skills, expected):
+    result = prescreen_service.prescreen_cv(BACKEND_CV, tech_skills, soft_skills)
+
+    assert result.matched_tech_skills == expected
+    assert result.coverage == len(expected) / len(tech_skills)
+    assert result.passed
+
+
+def test_skill_terms_drop_qualifiers_and_empty_fragments():
+    assert prescreen_service._skill_terms("Python (3.x)") == ["python", "python3"]
+    assert prescreen_service._skill_terms("Big Data (Spark") == ["big data", "spark"]
+    assert prescreen_service._skill_terms("CI/CD")[0] == "ci/cd"
+    assert prescreen_service._skill_terms("Go (") == ["go"]
+
+
+def test_threshold_is_disabled_by_default():
+    result = prescreen_service.prescreen_cv("Accountant with ten years of audit experience.", ["Python", "SQL"], [])
+
+    assert result.coverage == 0
+    assert result.passed
+
+
+def test_threshold_screens_out_cvs_without_any_skill(monkeypatch):
+    monkeypatch.setattr(settings, "CV_PRESCREEN_MIN_COVERAGE", 0.01)
+
+    assert not prescreen_service.prescreen_cv("Accountant with ten years of audit experience.", ["Python", "SQL"], []).passed
+    assert prescreen_service.prescreen_cv(BACKEND_CV, ["Python (3.x)", "Scala"], []).passed
@@ -0,0 +1,138 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from app import models
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.models.types import utc_now
+from app.services import project_service
+from app.services.openai_service import openai_service
+
+PROJECT = {"title": "Variant", "objective": "Build it", "phases": []}
+
+
+def _add_job(db, with_project=True):
+    job = models.Job(title="Backend Developer", industry="Tech", tech_skills=["Python"], soft_skills=[], job_description="")
+    db.add(job)
+    db.flush()
+    if with_project:
+        db.add(models.Project(job_id=job.id, title="Project", objective="Build it", phases=[]))
+    db.commit()
+    return job
+
+
+def _available(db, job_id):
+    db.expire_all()
+    return db.query(models.ProjectVariant).filter_by(job_id=job_id, candidate_id=None).count()
+
+
+def test_pool_is_disabled_by_default(db):
+    job = _add_job(db)
+    assert settings.PROJECT_VARIANT_POOL_SIZE == 0
+
+    project_service.schedule_variant_refill(job.id)
+    assert not project_service._variant_refills
+
+
+def _ready(db, job_id):
+    db.expire_all()
+    return db.query(models.ProjectVariant).filter(
+        models.ProjectVariant.job_id == job_id,
+        models.ProjectVariant.generated_at.is_not(None)
+    ).count()
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    """Counts project generations; each takes a moment so refills overlap."""
+    calls = []
+
+    async def generate(**kwargs):
+        calls.append(kwargs["applicant_id"])
+        await asyncio.sleep(0.02)
+        return PROJECT
+
+    monkeypatch.setattr(openai_service, "generate_project_dict_async", generate)
+    return calls
+
+
+def test_concurrent_refills_generate_each_missing_variant_once(db, monkeypatch, generator):
+    monkeypatch.setattr(settings, "PROJECT_VARIANT_POOL_SIZE", 2)
+    job = _add_job(db)
+
+    async def refill_from_three_workers():
+        await asyncio.gather(*(project_service._refill_variants(job.id) for _ in range(3)))
+
+    asyncio.run(refill_from_three_workers())
+
+    assert len(generator) == 2
+    assert _ready(db, job.id) == _available(db, job.id) == 2
+
+
+def test_placeholders_are_not_assigned(db, monkeypatch):
+    monkeypatch.setattr(settings, "PROJECT_VARIANT_POOL_SIZE", 1)
+    job = _add_job(db)
+    candidate = models.Candidate(job_id=job.id, name="Candidate", email="candidate@example.com")
+    db.add(candidate)
+    db.commit()
+
+    async def claim_and_assign():
+        async with AsyncSessionLocal() as session:
+            claimed = await project_service._claim_variant_slots(session, job.id)
+            assigned = await project_service.assign_project_variant(session, job.id, candidate.id)
+        return claimed, assigned
+
+    claimed, assigned = asyncio.run(claim_and_assign())
+    assert len(claimed) == 1
+    assert assigned is None
+
+
+def test_failed_generation_releases_its_claim(db, monkeypatch):
+    monkeypatch.setattr(settings, "PROJECT_VARIANT_POOL_SIZE", 2)
+    job = _add_job(db)
+
+    async def fail(**kwargs):
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(openai_service, "generate_project_dict_async", fail)
+    asyncio.run(project_service._refill_variants(job.id))
+
+    assert _available(db, job.id) == 0
+
+
+def test_abandoned_placeholders_are_replaced(db, monkeypatch, generator):
+    monkeypatch.setattr(settings, "PROJECT_VARIANT_POOL_SIZE", 1)
+    job = _add_job(db)
+    # Claimed by a worker that died mid-generation
+    db.add(models.ProjectVariant(
+        job_id=job.id, applicant_id="dead",
+        created_at=utc_now() - timedelta(seconds=project_service._VARIANT_CLAIM_TIMEOUT + 60)
+    ))
+    db.commit()
+
+    asyncio.run(project_service._refill_variants(job.id))
+
+    assert len(generator) == 1
+    assert _ready(db, job.id) == _available(db, job.id) == 1
+
+
+def test_startup_resumes_refills_of_recent_pools_below_target(db, monkeypatch):
+    monkeypatch.setattr(settings, "PROJECT_VARIANT_POOL_SIZE", 1)
+    short = _add_job(db)
+    full = _add_job(db)
+    old = _add_job(db)
+    old_with_recent_candidate = _add_job(db)
+    _add_job(db, with_project=False)
+    long_ago = utc_now() - timedelta(days=settings.PROJECT_VARIANT_RESUME_DAYS + 1)
+    old.created_at = old_with_recent_candidate.created_at = long_ago
+    db.add(models.Candidate(job_id=old_with_recent_candidate.id, name="Candidate", email="candidate@example.com"))
+    db.add(models.ProjectVariant(job_id=full.id, applicant_id="seed", title="Variant", phases=[], generated_at=utc_now()))
+    db.commit()
+
+    scheduled = []
+    monkeypatch.setattr(project_service, "schedule_variant_refill", scheduled.append)
+    asyncio.run(project_service.resume_variant_refills())
+
+    assert sorted(scheduled) == [short.id, old_with_recent_candidate.id]
@@ -0,0 +1,93 @@
+import asyncio
+
+import orjson
+import pytest
+
+from app import models
+from app.api.v1.endpoints import jobs
+from app.core import metrics
+from app.core.config import settings
+from app.core.events import event_bus
+from app.services import evaluation_service, ranking_stream
+
+
+@pytest.fixture(autouse=True)
+def short_debounce(monkeypatch):
+    monkeypatch.setattr(settings, "RANKING_STREAM_DEBOUNCE", 0.01)
+
+
+def _add_job_with_candidate(db):
+    job = models.Job(title="Backend Developer", industry="Tech", tech_skills=["Python"], soft_skills=[], job_description="")
+    db.add(job)
+    db.flush()
+    candidate = models.Candidate(job_id=job.id, name="Candidate", email="candidate@example.com", cv_evaluation={"match_score": 40})
+    db.add(candidate)
+    db.commit()
+    return job, candidate
+
+
+def _parse(frame):
+    event, data = frame.strip().split("\n")
+    return event.removeprefix("event: "), orjson.loads(data.removeprefix("data: "))
+
+
+def _computations(kind):
+    return metrics.RANKING_STREAM_COMPUTATIONS.labels(kind=kind)._value.get()
+
+
+async def _next(stream):
+    return _parse(await asyncio.wait_for(stream.__anext__(), timeout=5))
+
+
+def test_stream_yields_a_snapshot_and_then_an_update(db):
+    job, candidate = _add_job_with_candidate(db)
+
+    async def follow():
+        stream = jobs._ranking_events(job.id, job.title)
+        try:
+            first = await _next(stream)
+            candidate.cv_evaluation = {"match_score": 90}
+            db.commit()
+            await event_bus.publish(evaluation_service.rankings_topic(job.id), {"candidate_id": str(candidate.id)})
+            second = await _next(stream)
+        finally:
+            await stream.aclose()
+        return first, second
+
+    (event, snapshot), (next_event, update) = asyncio.run(follow())
+
+    assert event == "snapshot"
+    assert snapshot["job_title"] == "Backend Developer"
+    assert [ranking["cv_score"] for ranking in snapshot["rankings"]] == [40]
+    assert next_event == "update"
+    assert [ranking["cv_score"] for ranking in update["changed"]] == [90]
+    assert update["removed"] == []
+
+
+def test_viewers_of_a_job_share_one_computation_per_change(db):
+    job, candidate = _add_job_with_candidate(db)
+    snapshots, updates = _computations("snapshot"), _computations("update")
+
+    async def follow():
+        streams = [jobs._ranking_events(job.id, job.title) for _ in range(3)]
+        try:
+            for stream in streams:
+                await _next(stream)
+            candidate.cv_evaluation = {"match_score": 75}
+            db.commit()
+            # A burst of changes is collected into one recomputation
+            for _ in range(3):
+                await event_bus.publish(evaluation_service.rankings_topic(job.id), {"candidate_id": str(candidate.id)})
+            return [await _next(stream) for stream in streams]
+        finally:
+            for stream in streams:
+                await stream.aclose()
+
+    frames = asyncio.run(follow())
+
+    assert frames[0][0] == "update"
+    assert frames == [frames[0]] * 3
+    assert _computations("snapshot") - snapshots == 1
+    assert _computations("update") - updates == 1
+    # The broadcaster stops with the job's last viewer
+    assert job.id not in ranking_stream._broadcasters
@@ -0,0 +1,138 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app import models
+from app.api.v1 import schemas
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.services import evaluation_service
+from app.services.openai_service import openai_service
+
+EVALUATION = {"hiring_recommendation": "Recommend", "overall_score": 80}
+SUBMISSION = schemas.SubmissionCreate(phase_number=1, primary_submission="https://github.com/example/solution")
+
+
+def _add_candidate(db):
+    job = models.Job(title="Backend Developer", industry="Tech", tech_skills=["Python"], soft_skills=[], job_description="")
+    db.add(job)
+    db.flush()
+    db.add(models.Project(job_id=job.id, title="Project", objective="Build it", phases=[{"phase": 1, "task": "Build an API"}]))
+    candidate = models.Candidate(job_id=job.id, name="Candidate", email="candidate@example.com")
+    db.add(candidate)
+    db.commit()
+    return candidate
+
+
+def _submissions(db, candidate):
+    db.expire_all()
+    return db.query(models.Submission).filter_by(candidate_id=candidate.id).all()
+
+
+def _submit(candidate_id, submission=SUBMISSION):
+    async def submit():
+        async with AsyncSessionLocal() as session:
+            return await evaluation_service.evaluate_and_store_submission(session, candidate_id, submission)
+    return submit()
+
+
+@pytest.fixture
+def evaluator(monkeypatch):
+    """Replaces the model call; tests set ``evaluator.result`` (a value or an exception)."""
+    class Evaluator:
+        result = EVALUATION
+        calls = 0
+
+        async def __call__(self, submission, phase_details):
+            self.calls += 1
+            if isinstance(self.result, Exception):
+                raise self.result
+            return self.result
+
+    stub = Evaluator()
+    monkeypatch.setattr(openai_service, "evaluate_submission_async", stub)
+    return stub
+
+
+def test_a_phase_is_evaluated_once(db, evaluator):
+    candidate = _add_candidate(db)
+
+    assert asyncio.run(_submit(candidate.id)) == EVALUATION
+    with pytest.raises(ValueError, match="already exists"):
+        asyncio.run(_submit(candidate.id))
+
+    assert evaluator.calls == 1
+    assert [submission.evaluation for submission in _submissions(db, candidate)] == [EVALUATION]
+
+
+def test_failed_evaluation_releases_the_slot(db, evaluator):
+    candidate = _add_candidate(db)
+
+    evaluator.result = RuntimeError("model unavailable")
+    with pytest.raises(ValueError, match="Failed to evaluate"):
+        asyncio.run(_submit(candidate.id))
+    assert _submissions(db, candidate) == []
+
+    evaluator.result = EVALUATION
+    assert asyncio.run(_submit(candidate.id)) == EVALUATION
+
+
+def test_stale_reservation_is_taken_over(db, evaluator):
+    candidate = _add_candidate(db)
+    # Left behind by a process that died during the model call
+    db.add(models.Submission(
+        candidate_id=candidate.id, phase_number=1, primary_submission="old",
+        submitted_at=datetime.now(timezone.utc) - timedelta(seconds=settings.SUBMISSION_RESERVATION_TIMEOUT + 60)
+    ))
+    db.commit()
+
+    assert asyncio.run(_submit(candidate.id)) == EVALUATION
+
+    submissions = _submissions(db, candidate)
+    assert len(submissions) == 1
+    assert submissions[0].primary_submission == SUBMISSION.primary_submission
+    assert submissions[0].evaluation == EVALUATION
+
+
+def test_fresh_reservation_is_not_taken_over(db, evaluator):
+    candidate = _add_candidate(db)
+    db.add(models.Submission(candidate_id=candidate.id, phase_number=1, primary_submission="in progress"))
+    db.commit()
+
+    with pytest.raises(ValueError, match="already exists"):
+        asyncio.run(_submit(candidate.id))
+    assert evaluator.calls == 0
+
+
+def test_failing_original_holder_keeps_the_new_owners_reservation(db, monkeypatch):
+    candidate = _add_candidate(db)
+    # Every reservation is stale at once, so the second request takes over the first
+    monkeypatch.setattr(settings, "SUBMISSION_RESERVATION_TIMEOUT", -1)
+
+    async def race():
+        first_started, second_started, first_fails = asyncio.Event(), asyncio.Event(), asyncio.Event()
+
+        async def evaluate(submission, phase_details):
+            if submission.endswith("first"):
+                first_started.set()
+                await first_fails.wait()
+                raise RuntimeError("model unavailable")
+            second_started.set()
+            await asyncio.sleep(0.05)
+            return EVALUATION
+
+        monkeypatch.setattr(openai_service, "evaluate_submission_async", evaluate)
+        first = asyncio.ensure_future(_submit(candidate.id, SUBMISSION.model_copy(update={"primary_submission": "first"})))
+        await first_started.wait()
+        second = asyncio.ensure_future(_submit(candidate.id, SUBMISSION.model_copy(update={"primary_submission": "second"})))
+        await second_started.wait()
+        first_fails.set()
+        return await asyncio.gather(first, second, return_exceptions=True)
+
+    first, second = asyncio.run(race())
+
+    assert isinstance(first, ValueError)
+    assert second == EVALUATION
+    submissions = _submissions(db, candidate)
+    assert [(s.primary_submission, s.evaluation) for s in submissions] == [("second", EVALUATION)]
@@ -0,0 +1,57 @@
+import math
+
+from app.services.token_budget import LENGTH_GROWTH, MIN_SAMPLES, TokenBudget
+
+REQUEST = {"model": "test-deployment", "messages": [], "max_tokens": 1500}
+
+
+def _budget(samples=(), method="evaluate_cv"):
+    budget = TokenBudget([method], percentile=0.99, margin=0.2, window=500)
+    for completion_tokens in samples:
+        budget.observe(method, completion_tokens, "stop", REQUEST["max_tokens"])
+    return budget
+
+
+def test_static_budget_until_enough_samples():
+    budget = _budget(range(1, MIN_SAMPLES))
+    assert budget.apply("evaluate_cv", REQUEST)["max_tokens"] == 1500
+
+
+def test_budget_is_the_percentile_plus_margin():
+    budget = _budget(range(1, 101))
+
+    # p99 of 1..100 is 99; plus 20% headroom
+    assert budget.apply("evaluate_cv", REQUEST)["max_tokens"] == math.ceil(99 * 1.2)
+    # Other parameters are passed through untouched
+    assert budget.apply("evaluate_cv", REQUEST)["messages"] is REQUEST["messages"]
+
+
+def test_budget_never_exceeds_the_static_value():
+    budget = _budget([1400] * MIN_SAMPLES)
+    assert budget.apply("evaluate_cv", REQUEST)["max_tokens"] == 1500
+
+
+def test_unlisted_methods_keep_their_static_budget():
+    budget = _budget(range(1, 101))
+    assert budget.apply("generate_project_dict", REQUEST) is REQUEST
+
+
+def test_truncated_completion_raises_the_budget_for_a_while():
+    budget = _budget(range(1, 101))
+    adapted = budget.apply("evaluate_cv", REQUEST)["max_tokens"]
+
+    budget.observe("evaluate_cv", adapted, "length", adapted)
+
+    raised = math.ceil(adapted * LENGTH_GROWTH)
+    assert budget.status()["evaluate_cv"]["raised"]
+    assert [budget.apply("evaluate_cv", REQUEST)["max_tokens"] for _ in range(MIN_SAMPLES)] == [raised] * MIN_SAMPLES
+    # Back to the percentile, which now includes the truncated sample
+    assert budget.apply("evaluate_cv", REQUEST)["max_tokens"] < raised
+    assert not budget.status()["evaluate_cv"]["raised"]
+
+
+def test_raised_budget_is_capped_by_the_static_value():
+    budget = _budget([1200] * MIN_SAMPLES)
+    budget.observe("evaluate_cv", 1440, "length", 1440)
+
+    assert budget.apply("evaluate_cv", REQUEST)["max_tokens"] == 1500